@@ -0,0 +1,135 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""Shared helpers for the dita-convert benchmarks."""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from collections.abc import Callable
+from typing import Any
+
+# Make the package from the working tree importable:
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SOURCE_DIR not in sys.path:
+    sys.path.insert(0, SOURCE_DIR)
+
+# Define the environment for benchmarks that run in a fresh interpreter:
+CHILD_ENV = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SOURCE_DIR, os.environ.get('PYTHONPATH')])))
+
+# Summarize a list of samples in seconds:
+def summarize(samples: list[float]) -> dict[str, Any]:
+    # Compute the percentiles; quantiles() requires at least two samples:
+    if len(samples) > 1:
+        percentiles = statistics.quantiles(samples, n=100, method='inclusive')
+    else:
+        percentiles = samples * 99
+
+    # Return the summary:
+    return {
+        'samples': len(samples),
+        'min':     min(samples),
+        'median':  statistics.median(samples),
+        'mean':    statistics.fmean(samples),
+        'p90':     percentiles[89],
+        'p95':     percentiles[94],
+        'p99':     percentiles[98],
+        'max':     max(samples),
+        'stdev':   statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+# Measure the wall-clock time of the supplied function:
+def measure(function: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> dict[str, Any]:
+    samples = []
+
+    for _ in range(repeat):
+        # Prepare the state without including it in the measurement:
+        if setup is not None:
+            setup()
+
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+
+    # Return the summary:
+    return summarize(samples)
+
+# Measure the wall-clock time of running a command in a fresh process:
+def measure_command(command: list[str], repeat: int) -> dict[str, Any]:
+    return measure(lambda: subprocess.run(command, env=CHILD_ENV, check=True,
+                                          stdout=subprocess.DEVNULL), repeat)
+
+# Run Python code in a fresh interpreter and collect the seconds it prints:
+def measure_child(code: str, repeat: int) -> dict[str, Any]:
+    samples = []
+
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', code], env=CHILD_ENV,
+                                check=True, capture_output=True, text=True)
+        samples.append(float(result.stdout.strip()))
+
+    # Return the summary:
+    return summarize(samples)
+
+# Compose the machine-readable report:
+def report(name: str, results: dict[str, Any], output: str | None = None) -> None:
+    # Import the package version only when the report is composed:
+    from dita.convert import __version__
+
+    # Add the information needed to compare the results across releases:
+    document = {
+        'benchmark': name,
+        'version':   __version__,
+        'python':    sys.version.split()[0],
+        'platform':  sys.platform,
+        'unit':      'seconds',
+        'results':   results,
+    }
+
+    # Write the report to the selected file or standard output:
+    if output is None or output == '-':
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(output, 'w') as f:
+            json.dump(document, f, indent=2)
+            f.write('\n')
+
+# Compose a generic DITA topic of the supplied type:
+def sample_topic(outputclass: str = 'concept', blocks: int = 10) -> str:
+    paragraphs = ''.join(f'<p>Paragraph {i}</p>' for i in range(blocks))
+    steps = ''.join(f'<li><p>Step {i}</p><p>Step info {i}</p></li>' for i in range(blocks))
+
+    if outputclass == 'procedure':
+        body = f'<p outputclass="abstract">Abstract</p>{paragraphs}' + \
+               f'<p outputclass="title"><b>Procedure</b></p><ol>{steps}</ol>'
+    else:
+        body = f'<p outputclass="abstract">Abstract</p>{paragraphs}' + \
+               f'<section><title>Section</title>{paragraphs}</section>'
+
+    return f'<topic id="sample-topic" outputclass="{outputclass}">' + \
+           f'<title>Sample topic</title><body>{body}</body></topic>'
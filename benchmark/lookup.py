@@ -0,0 +1,181 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measure the cost of the name lookups in the common templates.
+
+The benchmark runs small driver stylesheets against the templates from
+common-templates.xsl. It compares the universal-attributes template
+with the former search in a space-separated list of attribute names, and
+the search in the list of valid cmd element children with a lookup of
+the element name among templates. The results are printed as a JSON
+document with the time per attribute or per element in microseconds.
+
+Usage: python benchmark/lookup.py [-e ELEMENTS] [-n REPEAT] [-o FILE]
+"""
+
+import argparse
+
+from common import measure, report
+from lxml import etree
+from dita.convert import transform
+
+# The XSLT namespace of the driver stylesheets:
+XSL = 'http://www.w3.org/1999/XSL/Transform'
+
+# The attributes of each measured element, half of them universal:
+ATTRIBUTES = ['id', 'props', 'audience', 'xml:lang', 'outputclass', 'conref', 'keyref', 'scope']
+
+# The former implementation of the universal-attributes template:
+STRING_SCAN = f'''\
+<xsl:stylesheet version="1.0" xmlns:xsl="{XSL}">
+  <xsl:variable name="universal-attribute-group" select="' id props base platform product audience otherprops deliveryTarget importance rev status translate xml:lang dir '" />
+  <xsl:template name="universal-attributes">
+    <xsl:param name="attributes" />
+    <xsl:for-each select="$attributes">
+      <xsl:if test="contains($universal-attribute-group, concat(' ', name(), ' '))">
+        <xsl:copy-of select="." />
+      </xsl:if>
+    </xsl:for-each>
+  </xsl:template>
+</xsl:stylesheet>
+'''
+
+# Copy the universal attributes of every element:
+ATTRIBUTES_DRIVER = f'''\
+<xsl:stylesheet version="1.0" xmlns:xsl="{XSL}">
+  <xsl:template match="/">
+    <r>
+      <xsl:for-each select="/r/e">
+        <e>
+          <xsl:call-template name="universal-attributes">
+            <xsl:with-param name="attributes" select="@*" />
+          </xsl:call-template>
+        </e>
+      </xsl:for-each>
+    </r>
+  </xsl:template>
+</xsl:stylesheet>
+'''
+
+# Find the first child of every element that is not a valid cmd child by
+# searching the list of names the way the step-substep template did:
+CHILDREN_SCAN = f'''\
+<xsl:stylesheet version="1.0" xmlns:xsl="{XSL}">
+  <xsl:variable name="cmd-children" select="' abbreviated-form apiname b boolean cite cmdname codeph data data-about draft-comment equation-inline filepath fn foreign i image indexterm indextermref keyword line-through markupname mathml menucascade msgnum msgph numcharref option overline parameterentity parmname ph q required-cleanup sort-as state sub sup svg-container synph systemoutput term text textentity tm tt u uicontrol unknown userinput varname wintitle xmlatt xmlelement xmlnsname xmlpi xref '" />
+  <xsl:template match="/">
+    <r>
+      <xsl:for-each select="/r/e">
+        <e name="{{name(*[not(contains($cmd-children, concat(' ', name(), ' ')))][1])}}" />
+      </xsl:for-each>
+    </r>
+  </xsl:template>
+</xsl:stylesheet>
+'''
+
+# Find the same child by looking up the element names among templates;
+# the children are visited once and the position of the first child that
+# is not a valid cmd child is taken the way the step-substep template
+# does:
+CHILDREN_DISPATCH = f'''\
+<xsl:stylesheet version="1.0" xmlns:xsl="{XSL}">
+  <xsl:template match="/">
+    <r>
+      <xsl:for-each select="/r/e">
+        <xsl:variable name="positions">
+          <xsl:apply-templates select="*" mode="lookup" />
+        </xsl:variable>
+        <e name="{{name(*[number(substring-before($positions, ' '))])}}" />
+      </xsl:for-each>
+    </r>
+  </xsl:template>
+  <xsl:template match="*" mode="lookup">
+    <xsl:value-of select="position()" />
+    <xsl:text> </xsl:text>
+  </xsl:template>
+  <xsl:template match="{{names}}" mode="lookup" />
+</xsl:stylesheet>
+'''
+
+# Compile a driver stylesheet together with the selected templates:
+def compile_driver(driver: str, templates: etree._Element) -> etree.XSLT:
+    from copy import deepcopy
+    stylesheet = etree.fromstring(driver)
+    stylesheet.extend(deepcopy(list(templates)))
+    return etree.XSLT(stylesheet)
+
+# Return the list of valid cmd element children from the common templates:
+def cmd_children(templates: etree._Element) -> list[str]:
+    for template in templates.iterfind(f'{{{XSL}}}template[@mode="info-element"]'):
+        if template.get('match') != '*':
+            return str(template.get('match')).split('|')
+    return []
+
+# Measure the time per item in microseconds:
+def measure_items(xslt: etree.XSLT, document: etree._ElementTree, items: int, repeat: int) -> dict:
+    summary = measure(lambda: xslt(document), repeat)
+    return {'per_item_us': summary['min'] / items * 1e6, 'total': summary}
+
+# Parse supplied command-line options:
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure the cost of the name lookups in the common templates.')
+    parser.add_argument('-e', '--elements', type=int, default=20000,
+        help='number of elements in the measured document (default: 20000)')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+        help='number of samples for each measurement (default: 5)')
+    parser.add_argument('-o', '--output', metavar='FILE', default=None,
+        help='write the JSON report to the selected file instead of stdout')
+    return parser.parse_args()
+
+# The main entry point:
+def main() -> None:
+    args = parse_args()
+    results: dict = {'elements': args.elements}
+
+    # Load the common templates the same way as the transformers do:
+    templates = transform.load_stylesheet('common-templates.xsl')
+    names     = cmd_children(templates)
+
+    # Measure the lookup of the universal attributes:
+    attributes = ' '.join(f'{name}="value"' for name in ATTRIBUTES)
+    document   = etree.fromstring(f'<r>{f"<e {attributes} />" * args.elements}</r>').getroottree()
+    count      = args.elements * len(ATTRIBUTES)
+    results['universal_attributes'] = {
+        'string_scan': measure_items(compile_driver(ATTRIBUTES_DRIVER, etree.fromstring(STRING_SCAN)), document, count, args.repeat),
+        'templates':   measure_items(compile_driver(ATTRIBUTES_DRIVER, templates), document, count, args.repeat),
+    }
+
+    # Measure the lookup of the valid cmd element children; each element
+    # has eight inline children followed by a paragraph:
+    inline   = ''.join(f'<{names[i % len(names)]} />' for i in range(8))
+    document = etree.fromstring(f'<r>{f"<e>{inline}<p /></e>" * args.elements}</r>').getroottree()
+    count    = args.elements * 9
+    results['cmd_children'] = {
+        'string_scan': measure_items(etree.XSLT(etree.fromstring(CHILDREN_SCAN)), document, count, args.repeat),
+        'templates':   measure_items(compile_driver(CHILDREN_DISPATCH.replace('{names}', '|'.join(names)), templates), document, count, args.repeat),
+    }
+
+    # Print the report:
+    report('lookup', results, args.output)
+
+if __name__ == '__main__':
+    main()
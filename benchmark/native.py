@@ -0,0 +1,175 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""Compare the XSLT and native engines of the supported conversions.
+
+The benchmark converts large generic procedures to DITA tasks with the
+XSLT stylesheet and with the native engine, which rewrites the parsed
+tree in place. Two kinds of procedures are measured: steps that consist
+of the command, information, substeps, and an example, which are almost
+entirely restructured, and steps that also contain tables, code blocks,
+and notes, which are mostly copied unchanged. A large generated topic
+with an abstract, sections, examples, and a list of additional resources
+is also converted to a DITA concept and a DITA reference, both as a
+generated and as a generic topic. Each document is parsed before the
+measurement and the time includes the serialization. The results are
+printed as a JSON document with the time of each engine and the speedup
+of the native engine.
+
+Usage: python benchmark/native.py [-s STEPS] [-n REPEAT] [-o FILE]
+"""
+
+import argparse
+
+from collections.abc import Callable
+from common import measure, report
+from lxml import etree
+from dita.convert import native, transform
+
+# Compose a step that is restructured as a whole:
+def structured_step(index: int) -> str:
+    return f'''
+      <li id="step-{index}">
+        <p>Run the <cmdname>tool</cmdname> command.</p>
+        <p>Step information {index}</p>
+        <ol>
+          <li>First <b>substep</b></li>
+          <li><p>Second substep</p><codeblock>tool --run</codeblock></li>
+        </ol>
+        <example>
+          <p>Step example</p>
+        </example>
+      </li>'''
+
+# Compose a step with a large amount of content that is copied unchanged:
+def content_step(index: int) -> str:
+    rows = '<row><entry>Name</entry><entry>Value with <codeph>code</codeph></entry></row>' * 5
+    return f'''
+      <li id="step-{index}">
+        <p>Configure the <cmdname>tool</cmdname> service.</p>
+        <p>The following table lists the options:</p>
+        <table><tgroup cols="2"><tbody>{rows}</tbody></tgroup></table>
+        <codeblock>line one
+line two</codeblock>
+        <note><p>Restart the <uicontrol>service</uicontrol> afterwards.</p></note>
+      </li>'''
+
+# Compose a generic procedure with the supplied number of steps:
+def procedure(step: Callable[[int], str], steps: int) -> bytes:
+    body = ''.join(step(i) for i in range(steps))
+    return f'''<topic id="procedure" outputclass="procedure">
+  <title>Procedure</title>
+  <body>
+    <p>Introduction</p>
+    <ol>{body}
+    </ol>
+    <p>Result</p>
+  </body>
+</topic>'''.encode('utf-8')
+
+# Compose a generated topic with the supplied number of sections:
+def generated_topic(sections: int) -> bytes:
+    body  = ''.join(f'''
+    <p>Paragraph {i} with <codeph>code</codeph></p>
+    <section id="section-{i}">
+      <title>Section {i}</title>
+      <p>Section paragraph</p>
+    </section>
+    <example>
+      <codeblock>tool --run</codeblock>
+    </example>''' for i in range(sections))
+    links = ''.join(f'''
+      <li><xref href="topic-{i}.dita">Link {i}</xref></li>''' for i in range(sections))
+    return f'''<topic id="generated" outputclass="reference">
+  <title>Generated topic</title>
+  <body>
+    <p outputclass="abstract">Topic abstract</p>{body}
+    <p outputclass="title"><b>Additional resources</b></p>
+    <ul>{links}
+    </ul>
+  </body>
+</topic>'''.encode('utf-8')
+
+# Measure the conversion of a freshly parsed document with both engines:
+def measure_engines(data: bytes, repeat: int, name: str = 'to_task') -> dict:
+    state: dict = {}
+
+    # Parse the document before each measurement; the native engine
+    # consumes the supplied tree. Release the previous tree first, which
+    # otherwise affects the memory layout and the measured time of both
+    # engines:
+    def setup() -> None:
+        state.clear()
+        state['xml'] = etree.fromstring(data).getroottree()
+
+    xslt   = getattr(transform, name)
+    engine = getattr(native, name)
+
+    # Verify that both engines produce the same output:
+    setup()
+    expected = str(xslt(state['xml']))
+    setup()
+    if str(engine(state['xml'])) != expected:
+        raise AssertionError('the engines produced different output')
+
+    results = {
+        'xslt':   measure(lambda: str(xslt(state['xml'])), repeat, setup),
+        'native': measure(lambda: str(engine(state['xml'])), repeat, setup),
+    }
+    results['speedup'] = results['xslt']['median'] / results['native']['median']
+    return results
+
+# Parse supplied command-line options:
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Compare the XSLT and native engines of the supported conversions.')
+    parser.add_argument('-s', '--steps', type=int, default=2000,
+        help='number of steps in each procedure and sections in each ' +
+             'generated topic (default: 2000)')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+        help='number of samples for each measurement (default: 5)')
+    parser.add_argument('-o', '--output', metavar='FILE', default=None,
+        help='write the JSON report to the selected file instead of stdout')
+    return parser.parse_args()
+
+# The main entry point:
+def main() -> None:
+    args = parse_args()
+    results: dict = {'steps': args.steps}
+
+    # Measure both kinds of procedures:
+    results['structured'] = measure_engines(procedure(structured_step, args.steps), args.repeat)
+    results['content']    = measure_engines(procedure(content_step, args.steps), args.repeat)
+
+    # Measure the generated topic:
+    results['concept']    = measure_engines(generated_topic(args.steps), args.repeat, 'to_concept_generated')
+    results['reference']  = measure_engines(generated_topic(args.steps), args.repeat, 'to_reference_generated')
+
+    # Measure the generated topic converted as a generic topic:
+    results['plain_concept']   = measure_engines(generated_topic(args.steps), args.repeat, 'to_concept')
+    results['plain_reference'] = measure_engines(generated_topic(args.steps), args.repeat, 'to_reference')
+
+    # Print the report:
+    report('native', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measure the writing of converted documents to a file.
+
+The benchmark converts a large generic topic to a DITA concept with the
+XSLT stylesheet and with the native engine, and writes the result to a
+temporary file in three ways: as the command-line interface did before,
+which composed the whole document as a string and wrote it to a file
+opened in text mode, as UTF-8 encoded bytes written to a file opened in
+binary mode, which is how split files, cached results, and the results
+of worker processes are written, and with write_output(), which
+serializes the result directly to a file opened in binary mode. The
+paragraphs of the topic contain text outside of ASCII, which Python
+strings store with more than one byte per character. Only the writing of
+an already converted document is measured. The peak memory is measured
+in a fresh interpreter as the growth of the resident set size during the
+write, after the memory released by the conversion has been returned to
+the system; this requires the /proc file system of Linux and the GNU C
+library. The results are printed as a JSON document with the time and
+memory of each variant.
+
+Usage: python benchmark/output.py [-b BLOCKS] [-n REPEAT] [-o FILE]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from typing import Any
+from common import CHILD_ENV, measure, report
+from lxml import etree
+from dita.convert import cli
+
+# The directory of the benchmarks, which the child processes import from:
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Compose a generic topic with the supplied number of paragraphs:
+def large_topic(blocks: int) -> bytes:
+    content = ''.join(f'<p>Příliš žluťoučký kůň {i} úpěl <codeph>ďábelské</codeph> ódy.</p>' for i in range(blocks))
+    return f'<topic id="topic" outputclass="concept"><title>Topic</title><body>{content}</body></topic>'.encode('utf-8')
+
+# Convert the topic with the selected engine:
+def convert(engine: str, data: bytes) -> Any:
+    return cli.convert(None, etree.fromstring(data).getroottree(), 'concept', False, [], engine=engine)
+
+# Write the result as a string to a file opened in text mode:
+def write_text(result: Any, output_file: str) -> None:
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(str(result))
+
+# Write the result as bytes to a file opened in binary mode:
+def write_bytes(result: Any, output_file: str) -> None:
+    with open(output_file, 'wb') as f:
+        f.write(bytes(result))
+
+# Write the result directly to a file opened in binary mode:
+def write_stream(result: Any, output_file: str) -> None:
+    with open(output_file, 'wb') as f:
+        cli.write_output(f, result)
+
+# The measured variants:
+VARIANTS = {
+    'text':   write_text,
+    'bytes':  write_bytes,
+    'stream': write_stream,
+}
+
+# Return the selected memory statistic of the current process in KiB:
+def memory(field: str) -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(f'{field}:'):
+                return int(line.split()[1])
+    raise RuntimeError('the peak memory is not available')
+
+# Reset the peak resident set size to the current one; the memory that
+# the conversion released is returned to the system first, otherwise the
+# write could reuse it without raising the resident set size:
+def reset_peak_memory() -> None:
+    import ctypes
+    import gc
+
+    gc.collect()
+    ctypes.CDLL(None).malloc_trim(0)
+    with open('/proc/self/clear_refs', 'w') as f:
+        f.write('5')
+
+# Print the growth of the resident set size in KiB during the write; this
+# runs in a fresh interpreter:
+def print_memory(variant: str, engine: str, blocks: int) -> None:
+    result = convert(engine, large_topic(blocks))
+    with tempfile.TemporaryDirectory() as directory:
+        output_file = os.path.join(directory, 'topic.dita')
+        VARIANTS[variant](convert(engine, large_topic(1)), output_file)
+        reset_peak_memory()
+        start = memory('VmRSS')
+        VARIANTS[variant](result, output_file)
+        print(memory('VmHWM') - start)
+
+# Measure the peak memory of the selected variant in a fresh interpreter:
+def measure_memory(variant: str, engine: str, blocks: int) -> int:
+    code = f'import sys; sys.path.insert(0, {BENCHMARK_DIR!r}); import output; output.print_memory({variant!r}, {engine!r}, {blocks})'
+    result = subprocess.run([sys.executable, '-c', code], env=CHILD_ENV,
+                            check=True, capture_output=True, text=True)
+    return int(result.stdout.strip())
+
+# Parse supplied command-line options:
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure the writing of converted documents to a file.')
+    parser.add_argument('-b', '--blocks', type=int, default=100000,
+        help='number of paragraphs in the topic (default: 100000)')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+        help='number of samples for each measurement (default: 5)')
+    parser.add_argument('-o', '--output', metavar='FILE', default=None,
+        help='write the JSON report to the selected file instead of stdout')
+    return parser.parse_args()
+
+# The main entry point:
+def main() -> None:
+    args = parse_args()
+    results: dict = {'blocks': args.blocks}
+    data = large_topic(args.blocks)
+
+    # Measure all variants with the result of each engine:
+    with tempfile.TemporaryDirectory() as directory:
+        output_file = os.path.join(directory, 'topic.dita')
+        for engine in ('xslt', 'native'):
+            result = convert(engine, data)
+            results[engine] = {'size': len(bytes(result))}
+            for variant in VARIANTS:
+                summary = measure(lambda: VARIANTS[variant](result, output_file), args.repeat)
+                summary['peak_memory_kib'] = measure_memory(variant, engine, args.blocks)
+                results[engine][variant] = summary
+            results[engine]['speedup'] = results[engine]['text']['median'] / results[engine]['stream']['median']
+
+    # Print the report:
+    report('output', results, args.output)
+
+if __name__ == '__main__':
+    main()
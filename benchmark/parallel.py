@@ -0,0 +1,95 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measure how batch conversion scales with the number of workers.
+
+The benchmark writes a set of generated topics to a temporary directory
+and converts them sequentially, then with the -j option in a pool of
+threads (-T) and in a pool of processes for an increasing number of
+workers. The results are printed as a JSON document with the median
+wall-clock time and the speedup over the sequential conversion.
+
+Usage: python benchmark/parallel.py [-f FILES] [-b BLOCKS] [-n REPEAT] [-o FILE]
+"""
+
+import argparse
+import os
+import tempfile
+
+from common import measure, report, sample_topic
+from dita.convert import cli
+
+# Convert all files and serialize the results as the CLI would:
+def run(files: list[str], jobs: int, threads: bool) -> None:
+    if jobs == 1:
+        results = cli.convert_sequential(cli.parse_and_convert, files, None, True)
+    else:
+        results = cli.convert_parallel(files, None, True, jobs, threads)
+
+    for _, xml in results:
+        str(xml)
+
+# Parse supplied command-line options:
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure how batch conversion scales with the number of workers.')
+    parser.add_argument('-f', '--files', type=int, default=400,
+        help='number of topics to convert (default: 400)')
+    parser.add_argument('-b', '--blocks', type=int, default=50,
+        help='number of blocks in each topic (default: 50)')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+        help='number of samples for each measurement (default: 5)')
+    parser.add_argument('-o', '--output', metavar='FILE', default=None,
+        help='write the JSON report to the selected file instead of stdout')
+    return parser.parse_args()
+
+# The main entry point:
+def main() -> None:
+    args = parse_args()
+    results: dict = {'files': args.files, 'blocks': args.blocks, 'cpu_count': os.cpu_count()}
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Write the topics to convert, alternating between the content types:
+        files = []
+        for i in range(args.files):
+            files.append(os.path.join(directory, f'topic{i}.dita'))
+            with open(files[-1], 'w') as f:
+                f.write(sample_topic(('concept', 'reference', 'procedure')[i % 3], args.blocks))
+
+        # Measure the sequential conversion:
+        sequential = measure(lambda: run(files, 1, False), args.repeat)
+        results['sequential'] = sequential
+
+        # Measure the conversion with an increasing number of workers:
+        workers = [2 ** i for i in range(1, 6) if 2 ** i <= max(2, os.cpu_count() or 1)]
+        for mode, threads in (('threads', True), ('processes', False)):
+            results[mode] = {}
+            for jobs in workers:
+                summary = measure(lambda: run(files, jobs, threads), args.repeat)
+                summary['speedup'] = sequential['median'] / summary['median']
+                results[mode][str(jobs)] = summary
+
+    # Print the report:
+    report('parallel', results, args.output)
+
+if __name__ == '__main__':
+    main()
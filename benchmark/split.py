@@ -0,0 +1,204 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measure the splitting of deeply nested assemblies.
+
+The benchmark splits assemblies whose sections are nested in each other
+to an increasing depth, once with the former implementation, which
+copied each topic with all nested topics and removed them from the copy
+afterwards, once with split_file(), which moves the contents of each
+topic to a document of its own, and once with split_stream(), which
+converts each topic while the file is parsed and releases it afterwards.
+All variants convert all topics and generate the DITA map; the streaming
+variant reads the assembly from a temporary file, which is included in
+its time. An assembly with many consecutive sections is then split with
+the last two variants, which shows the memory that streaming saves, and
+with split_file() converting the topics in a pool of worker processes,
+one for each available processor. The peak memory is measured in a fresh interpreter
+as the growth of the peak resident set size during the split, which
+requires the /proc file system of Linux. The results are printed as a
+JSON document with the time and memory of each variant.
+
+Usage: python benchmark/split.py [-d DEPTH] [-w WIDTH] [-b BLOCKS] [-n REPEAT]
+                                [-o FILE]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from common import CHILD_ENV, measure, report
+from dita.convert import cli
+
+# The directory of the benchmarks, which the child processes import from:
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Compose an assembly with sections nested to the supplied depth:
+def nested_assembly(depth: int, blocks: int) -> bytes:
+    content = ''.join(f'<p>Paragraph {i} with <codeph>code</codeph></p>' for i in range(blocks))
+    opening = ''.join(f'<section id="section-{i}"><title>Section {i}</title>{content}' for i in range(depth))
+    return f'<topic id="assembly" outputclass="assembly"><title>Assembly</title><body>{content}{opening}{"</section>" * depth}</body></topic>'.encode('utf-8')
+
+# Compose an assembly with the supplied number of consecutive sections:
+def wide_assembly(width: int, blocks: int) -> bytes:
+    content  = ''.join(f'<p>Paragraph {i} with <codeph>code</codeph></p>' for i in range(blocks))
+    sections = ''.join(f'<section id="section-{i}"><title>Section {i}</title>{content}</section>' for i in range(width))
+    return f'<topic id="assembly" outputclass="assembly"><title>Assembly</title><body>{content}{sections}</body></topic>'.encode('utf-8')
+
+# The measured shapes of the assembly:
+SHAPES = {
+    'nested': nested_assembly,
+    'wide':   wide_assembly,
+}
+
+# Split the assembly the way split_file() did before it moved the topics:
+def split_with_copies(data: bytes) -> None:
+    from copy import deepcopy
+    from lxml import etree
+
+    xml = cli.convert(None, etree.fromstring(data).getroottree(), 'single_topic', False, [])
+    for element in xml.iter('topic'):
+        cli.fix_element_id(element)
+        cli.fix_element_outputclass(element)
+        topic = etree.ElementTree(deepcopy(element))
+        for nested in topic.findall('.//topic'):
+            nested.getparent().remove(nested)  # type: ignore[union-attr]
+        str(cli.convert(None, topic, None, False, []))
+    str(cli.convert(None, xml, 'single_map', False, []))
+
+# Split the assembly with the current implementation:
+def split_in_place(data: bytes) -> None:
+    files, success = cli.split_file('assembly.dita', data, False, [])
+    if not success:
+        raise AssertionError('the assembly could not be split')
+
+# Split the assembly while it is parsed, discarding the generated files:
+def split_streaming(data: bytes) -> None:
+    import tempfile
+    from dita.convert.stream import split_stream
+
+    with tempfile.TemporaryDirectory() as directory:
+        input_file = os.path.join(directory, 'assembly.dita')
+        with open(input_file, 'wb') as f:
+            f.write(data)
+        names, success = split_stream(input_file, False, lambda file_name, content: True, [])
+        if not success:
+            raise AssertionError('the assembly could not be split')
+
+# The pool of worker processes for the parallel variant, which is started
+# once so that its start-up is not measured:
+EXECUTOR = None
+
+# Split the assembly with the topics converted in parallel processes:
+def split_parallel(data: bytes) -> None:
+    global EXECUTOR
+    if EXECUTOR is None:
+        EXECUTOR = cli.split_executor(0)
+    files, success = cli.split_file('assembly.dita', data, False, [], EXECUTOR)
+    if not success:
+        raise AssertionError('the assembly could not be split')
+
+# The measured variants:
+VARIANTS = {
+    'copies':   split_with_copies,
+    'in_place': split_in_place,
+    'stream':   split_streaming,
+    'parallel': split_parallel,
+}
+
+# Return the peak resident set size of the current process in KiB; unlike
+# ru_maxrss, which Linux inherits from the parent process across fork() and
+# exec(), VmHWM is reset when a new program is executed:
+def peak_memory() -> int:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    raise RuntimeError('the peak memory is not available')
+
+# Print the growth of the peak resident set size in KiB during the split;
+# this runs in a fresh interpreter:
+def print_memory(variant: str, shape: str, size: int, blocks: int) -> None:
+    data = SHAPES[shape](size, blocks)
+    VARIANTS[variant](nested_assembly(1, 1))
+    start = peak_memory()
+    VARIANTS[variant](data)
+    print(peak_memory() - start)
+
+# Measure the peak memory of the selected variant in a fresh interpreter:
+def measure_memory(variant: str, shape: str, size: int, blocks: int) -> int:
+    code = f'import sys; sys.path.insert(0, {BENCHMARK_DIR!r}); import split; split.print_memory({variant!r}, {shape!r}, {size}, {blocks})'
+    result = subprocess.run([sys.executable, '-c', code], env=CHILD_ENV,
+                            check=True, capture_output=True, text=True)
+    return int(result.stdout.strip())
+
+# Parse supplied command-line options:
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure the splitting of deeply nested assemblies.')
+    parser.add_argument('-d', '--depth', type=int, default=200,
+        help='maximum depth of the nested sections; libxml2 limits the ' +
+             'depth of parsed documents to 256 elements (default: 200)')
+    parser.add_argument('-w', '--width', type=int, default=2000,
+        help='number of consecutive sections in the wide assembly ' +
+             '(default: 2000)')
+    parser.add_argument('-b', '--blocks', type=int, default=50,
+        help='number of paragraphs in each section (default: 50)')
+    parser.add_argument('-n', '--repeat', type=int, default=5,
+        help='number of samples for each measurement (default: 5)')
+    parser.add_argument('-o', '--output', metavar='FILE', default=None,
+        help='write the JSON report to the selected file instead of stdout')
+    return parser.parse_args()
+
+# The main entry point:
+def main() -> None:
+    args = parse_args()
+    results: dict = {'blocks': args.blocks}
+
+    # Measure an increasing depth of the nested sections:
+    for depth in sorted({max(1, args.depth // 4), max(1, args.depth // 2), args.depth}):
+        data = nested_assembly(depth, args.blocks)
+        results[str(depth)] = {}
+        for variant in ('copies', 'in_place', 'stream'):
+            summary = measure(lambda: VARIANTS[variant](data), args.repeat)
+            summary['peak_memory_kib'] = measure_memory(variant, 'nested', depth, args.blocks)
+            results[str(depth)][variant] = summary
+        results[str(depth)]['speedup'] = results[str(depth)]['copies']['median'] / results[str(depth)]['in_place']['median']
+
+    # Measure an assembly with many consecutive sections, which only the
+    # streaming variant does not keep in memory as a whole:
+    data = wide_assembly(args.width, args.blocks)
+    results['wide'] = {'width': args.width}
+    for variant in ('in_place', 'stream', 'parallel'):
+        VARIANTS[variant](data)
+        summary = measure(lambda: VARIANTS[variant](data), args.repeat)
+        summary['peak_memory_kib'] = measure_memory(variant, 'wide', args.width, args.blocks)
+        results['wide'][variant] = summary
+    results['wide']['processors'] = os.cpu_count()
+    results['wide']['parallel_speedup'] = results['wide']['in_place']['median'] / results['wide']['parallel']['median']
+
+    # Print the report:
+    report('split', results, args.output)
+
+if __name__ == '__main__':
+    main()
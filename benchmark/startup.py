@@ -0,0 +1,122 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+"""Measure the startup and compilation costs of dita-convert.
+
+The benchmark measures the cold interpreter startup of the command-line
+interface, the import time of the dita.convert package, the compilation
+time of each to_* transformer, and the latency of the first conversion
+in a fresh process for each target type. The results are printed as a
+JSON document with medians and percentiles for each measurement.
+
+Usage: python benchmark/startup.py [-n REPEAT] [-o FILE]
+"""
+
+import argparse
+import sys
+
+from common import measure, measure_child, measure_command, report, sample_topic
+
+# Define the transformers and the document type they expect:
+TRANSFORMERS = {
+    'to_concept':             'concept',
+    'to_reference':           'reference',
+    'to_task':                'procedure',
+    'to_concept_generated':   'concept',
+    'to_reference_generated': 'reference',
+    'to_task_generated':      'procedure',
+    'to_single_topic':        'concept',
+    'to_single_map':          'concept',
+}
+
+# Measure the import time of the package in a fresh interpreter:
+IMPORT_CODE = '''\
+import time
+start = time.perf_counter()
+import dita.convert
+print(time.perf_counter() - start)
+'''
+
+# Measure the first conversion in a fresh interpreter:
+FIRST_CONVERSION_CODE = '''\
+import time
+from lxml import etree
+from dita.convert import transform
+xml = etree.fromstring({document!r}).getroottree()
+start = time.perf_counter()
+str(transform.{transformer}(xml))
+print(time.perf_counter() - start)
+'''
+
+# Measure the compilation time of the selected transformer:
+def measure_compile(name: str, repeat: int) -> dict:
+    from importlib import import_module
+    from dita.convert import transform
+
+    # Import lxml up front so that its import time is not measured:
+    import_module('lxml.etree')
+
+    # Use a fresh transformer with an empty resource cache for every sample:
+    stylesheet = getattr(transform, name).stylesheet
+    transformers = []
+
+    def setup() -> None:
+        transform.read_stylesheet.cache_clear()
+        transformers.append(transform.Transformer(stylesheet))
+
+    return measure(lambda: transformers[-1].xslt, repeat, setup)
+
+# Parse supplied command-line options:
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Measure the startup and compilation costs of dita-convert.')
+    parser.add_argument('-n', '--repeat', type=int, default=20,
+        help='number of samples for each measurement (default: 20)')
+    parser.add_argument('-o', '--output', metavar='FILE', default=None,
+        help='write the JSON report to the selected file instead of stdout')
+    return parser.parse_args()
+
+# The main entry point:
+def main() -> None:
+    args = parse_args()
+    results: dict = {}
+
+    # Measure the cold startup of the command-line interface:
+    results['cli_version'] = measure_command([sys.executable, '-m', 'dita.convert', '--version'], args.repeat)
+
+    # Measure the import time of the package:
+    results['import'] = measure_child(IMPORT_CODE, args.repeat)
+
+    # Measure the compilation time of each transformer:
+    results['compile'] = {name: measure_compile(name, args.repeat) for name in TRANSFORMERS}
+
+    # Measure the first conversion latency for each transformer:
+    results['first_conversion'] = {
+        name: measure_child(FIRST_CONVERSION_CODE.format(document=sample_topic(outputclass), transformer=name), args.repeat)
+        for name, outputclass in TRANSFORMERS.items()
+    }
+
+    # Print the report:
+    report('startup', results, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -37,3 +37,9 @@ DESCRIPTION = __doc__
 
 # Expose the XSLT transforms:
 from .transform import *
+
+# Expose the batch conversion interface:
+from .batch import Result, convert_many
+
+# Expose the validation interface:
+from .validate import Problem, validate
@@ -0,0 +1,191 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import os
+
+from time import perf_counter
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from typing import Any
+
+# Define which symbols are to be exported:
+__all__ = ['Result', 'convert_many']
+
+# The result of a single conversion:
+class Result:
+    def __init__(self, index: int, source: Any) -> None:
+        # The position of the document in the supplied sequence:
+        self.index = index
+
+        # The file name of the document, or None for in-memory sources:
+        self.source = source
+
+        # The converted document serialized as UTF-8 encoded XML:
+        self.output: bytes | None = None
+
+        # The warning messages as the command-line interface prints them:
+        self.warnings: list[str] = []
+
+        # The error message if the conversion failed:
+        self.error: str | None = None
+
+        # The time spent in each phase of the conversion in seconds:
+        self.timings: dict[str, float] = {}
+
+    # Report whether the conversion succeeded:
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    # Describe the result:
+    def __repr__(self) -> str:
+        return f'<Result index={self.index} source={self.source!r} ok={self.ok}>'
+
+# Parse, convert, and serialize a single document:
+def convert_one(index: int, source: Any, target_type: str | None = None, generated: bool = False, validate: bool = False, engine: str = 'xslt') -> Result:
+    from io import BytesIO
+    from lxml import etree
+    from .cli import convert, warn
+
+    # Identify file names; in-memory documents have none:
+    name   = os.fspath(source) if isinstance(source, (str, os.PathLike)) else None
+    result = Result(index, name)
+    start  = perf_counter()
+
+    try:
+        # Parse the document unless it has already been parsed:
+        if isinstance(source, bytes):
+            source_xml = etree.parse(BytesIO(source))
+        elif isinstance(source, etree._ElementTree):
+            # The native engine rewrites the document in place; convert a
+            # copy so that the supplied document stays intact:
+            if engine == 'native':
+                from copy import deepcopy
+                source_xml = deepcopy(source)
+            else:
+                source_xml = source
+        else:
+            source_xml = etree.parse(source)
+        parsed = perf_counter()
+
+        # Convert the document:
+        xml = convert(name, source_xml, target_type, generated, result.warnings, validate, engine)
+        converted = perf_counter()
+
+        # Serialize the document:
+        result.output = bytes(xml)
+        serialized = perf_counter()
+
+        # Record the timings:
+        result.timings = {
+            'parse':     parsed - start,
+            'transform': converted - parsed,
+            'serialize': serialized - converted,
+        }
+    except Exception as message:
+        # Report the error the same way as the command-line interface:
+        result.error = str(message)
+        warn(str(message), name, result.warnings)
+
+    # Record the total time:
+    result.timings['total'] = perf_counter() - start
+
+    # Return the result:
+    return result
+
+# Convert a sequence of documents and yield the results as they complete:
+def convert_many(sources: Iterable[Any], target_type: str | None = None, generated: bool = False, jobs: int = 1, processes: bool = False, ordered: bool = False, max_pending: int | None = None, validate: bool = False, engine: str = 'xslt') -> Iterator[Result]:
+    # Convert the documents one by one in the calling thread by default:
+    if jobs == 1:
+        for index, source in enumerate(sources):
+            yield convert_one(index, source, target_type, generated, validate, engine)
+        return
+
+    from collections import deque
+    from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+    from lxml import etree
+    from .cli import warn
+
+    # Use all available processors unless told otherwise:
+    workers = jobs or os.cpu_count() or 1
+
+    # Limit the number of documents in flight to bound the memory use:
+    limit = max(1, max_pending or 2 * workers)
+
+    # Use threads by default; lxml releases the GIL while converting; the
+    # pool is created for each call and each of its workers compiles the
+    # stylesheets it uses again:
+    executor: Executor
+    if processes:
+        executor = ProcessPoolExecutor(workers)
+    else:
+        executor = ThreadPoolExecutor(workers)
+
+    # Read the sources lazily so that only a bounded number is in memory:
+    items   = enumerate(sources)
+    pending: deque[Future[Result]] = deque()
+
+    # Submit the next document; return False if there are no more:
+    def submit() -> bool:
+        for index, source in items:
+            # Parsed documents cannot be sent to worker processes; report
+            # them as failed without converting them:
+            if processes and isinstance(source, etree._ElementTree):
+                result = Result(index, None)
+                result.error = 'parsed documents cannot be converted in worker processes'
+                warn(result.error, None, result.warnings)
+                future: Future[Result] = Future()
+                future.set_result(result)
+                pending.append(future)
+                return True
+
+            pending.append(executor.submit(convert_one, index, source, target_type, generated, validate, engine))
+            return True
+        return False
+
+    try:
+        # Fill the queue up to the limit:
+        while len(pending) < limit and submit():
+            pass
+
+        while pending:
+            # Return the results in the order of the supplied documents:
+            if ordered:
+                yield pending.popleft().result()
+                submit()
+                continue
+
+            # Return the results as they complete:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                yield future.result()
+                submit()
+    finally:
+        # Do not wait for documents nobody is going to read:
+        executor.shutdown(wait=True, cancel_futures=True)
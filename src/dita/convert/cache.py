@@ -0,0 +1,250 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import json
+import os
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+# Define which symbols are to be exported:
+__all__ = ['Cache']
+
+# The default maximum size of the cache directory in bytes:
+DEFAULT_SIZE = 1024 ** 3
+
+# Compute a digest of the package version and all XSLT stylesheets:
+def fingerprint() -> str:
+    import re
+    from hashlib import sha256
+    from . import __version__, transform
+
+    # Start with the version so that code changes invalidate the cache:
+    digest  = sha256(__version__.encode('utf-8'))
+    pending = [getattr(transform, name).stylesheet for name in transform.__all__]
+    visited = set()
+
+    # Add each stylesheet and every stylesheet it includes:
+    while pending:
+        file_name = pending.pop(0)
+        if file_name in visited:
+            continue
+        visited.add(file_name)
+
+        data = transform.read_stylesheet(file_name)
+        digest.update(file_name.encode('utf-8') + b'\0' + data)
+        pending.extend(m.decode('utf-8') for m in re.findall(rb'<xsl:include\s+href="([^"]+)"', data))
+
+    # Return the digest:
+    return digest.hexdigest()
+
+# A content-addressed cache of conversion results with LRU eviction:
+class Cache:
+    def __init__(self, directory: str, max_size: int = DEFAULT_SIZE) -> None:
+        from threading import Lock
+
+        # Store the cache configuration:
+        self.directory = directory
+        self.max_size  = max_size
+
+        # Compute the part of the key shared by all entries:
+        self.salt      = fingerprint()
+
+        # Track the approximate size of the cache; computed when needed:
+        self.size: int | None = None
+        self.lock      = Lock()
+
+        # Collect the statistics:
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+
+    # Do not attempt to send the lock to worker processes; measure the size
+    # of the cache here once so that each worker process does not scan the
+    # whole cache directory again when it stores its first entry:
+    def __getstate__(self) -> dict[str, Any]:
+        with self.lock:
+            if self.size is None:
+                self.size = self.measure()
+        state = self.__dict__.copy()
+        del state['lock']
+        return state
+
+    # Create a new lock in worker processes:
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        from threading import Lock
+        self.__dict__.update(state)
+        self.lock = Lock()
+
+    # Compose the cache key for the supplied input and conversion options:
+    def key(self, data: bytes, *options: Any) -> str:
+        from hashlib import sha256
+        digest = sha256(self.salt.encode('utf-8'))
+        digest.update(json.dumps(options).encode('utf-8') + b'\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    # Return the path to the entry with the supplied key:
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    # Return the stored entry, or None if there is none:
+    def get(self, key: str) -> bytes | None:
+        path = self.path(key)
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+
+            # Mark the entry as recently used:
+            os.utime(path)
+        except OSError:
+            return None
+
+        # Return the entry:
+        return data
+
+    # Store the entry with the supplied key:
+    def put(self, key: str, data: bytes) -> None:
+        from threading import get_ident
+        path = self.path(key)
+
+        try:
+            # Write the entry atomically so that readers never see a
+            # partially written file; each thread of each process writes
+            # its own temporary file:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f'{path}.{os.getpid()}.{get_ident()}.tmp'
+            with open(temporary, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except OSError:
+            # The cache is an optimization; never fail a conversion on it:
+            return
+
+        with self.lock:
+            # Compute the size of the cache when storing the first entry:
+            if self.size is None:
+                self.size = self.measure()
+            else:
+                self.size += len(data)
+
+            # Evict the least recently used entries if the cache is full:
+            if self.size > self.max_size:
+                self.trim()
+
+    # Return the path, size, and last use of all stored entries:
+    def entries(self) -> list[tuple[str, int, float]]:
+        result: list[tuple[str, int, float]] = []
+
+        try:
+            subdirectories = list(os.scandir(self.directory))
+        except OSError:
+            return result
+
+        for subdirectory in subdirectories:
+            if not subdirectory.is_dir():
+                continue
+            for entry in os.scandir(subdirectory.path):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                result.append((entry.path, stat.st_size, stat.st_mtime))
+
+        # Return the entries:
+        return result
+
+    # Return the total size of all stored entries:
+    def measure(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    # Remove the least recently used entries until the cache fits the limit:
+    def trim(self) -> None:
+        entries = sorted(self.entries(), key=lambda entry: entry[2])
+        total   = sum(size for _, size, _ in entries)
+
+        # Leave some room so that the cache is not trimmed on every store:
+        target  = self.max_size * 9 // 10 if total > self.max_size else total
+
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+        # Update the size of the cache:
+        self.size = total
+
+    # Return the cache statistics:
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits':      self.hits,
+            'misses':    self.misses,
+            'evictions': self.evictions,
+            'size':      self.size if self.size is not None else self.measure(),
+        }
+
+# Pack converted files and messages into a cache entry; messages that
+# refer to the source file are stored without its name so that the entry
+# can be reused for identical content under a different name:
+def pack(files: list[tuple[str, bytes]], messages: list[str], prefix: str | None) -> bytes:
+    stored = []
+
+    for message in messages:
+        if prefix is not None and message.startswith(prefix):
+            stored.append([True, message[len(prefix):]])
+        else:
+            stored.append([False, message])
+
+    # Compose the header followed by the contents of the files:
+    header = {'messages': stored, 'files': [[name, len(content)] for name, content in files]}
+
+    # Return the entry:
+    return json.dumps(header).encode('utf-8') + b'\n' + b''.join(content for _, content in files)
+
+# Unpack a cache entry into converted files and messages:
+def unpack(data: bytes, prefix: str | None) -> tuple[list[tuple[str, bytes]], list[str]]:
+    header_size = data.index(b'\n')
+    header      = json.loads(data[:header_size])
+    position    = header_size + 1
+
+    # Restore the messages for the current source file:
+    messages = [(prefix or '') + text if relative else text for relative, text in header['messages']]
+
+    # Restore the contents of the files:
+    files = []
+    for name, size in header['files']:
+        files.append((name, data[position:position + size]))
+        position += size
+
+    # Return the files and messages:
+    return files, messages
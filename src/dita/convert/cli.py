@@ -21,22 +21,40 @@
 # ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-import argparse
+from __future__ import annotations
+
 import errno
 import sys
 import os
 
-from copy import deepcopy
-from lxml import etree
-from uuid import uuid4
 from . import NAME, VERSION, DESCRIPTION
 from .transform import to_concept, to_reference, to_task, \
                        to_concept_generated, to_reference_generated, \
                        to_task_generated, to_single_topic, to_single_map
 
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    from collections.abc import Callable, Iterator
+    from concurrent.futures import Executor
+    from typing import Any, BinaryIO
+    from lxml import etree
+    from .cache import Cache
+    from .manifest import Manifest
+    from .native import NativeTransformer
+    from .transform import Transformer
+
 # Define which symbols are to be exported:
 __all__ = ['convert', 'run']
 
+# Defer the import of lxml until it is actually needed:
+def __getattr__(name: str) -> Any:
+    if name == 'etree':
+        from lxml import etree
+        return etree
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 # Print a message to standard error output and terminate the script:
 def exit_with_error(error_message: str, exit_status: int = errno.EPERM) -> None:
     # Print the supplied message to standard error output:
@@ -45,22 +63,41 @@ def exit_with_error(error_message: str, exit_status: int = errno.EPERM) -> None:
     # Terminate the script with the supplied exit status:
     sys.exit(exit_status)
 
-# Print a message to standard error output:
-def warn(error_message: str, file_name: str | None = None) -> None:
-    # Print the supplied message to standard error output:
+# Print a message to standard error output or add it to the supplied list:
+def warn(error_message: str, file_name: str | None = None, messages: list[str] | None = None) -> None:
+    # Compose the message:
     if file_name and file_name != sys.stdin:
-        print(f'{NAME}: {file_name}: {error_message}', file=sys.stderr)
+        message = f'{NAME}: {file_name}: {error_message}'
     else:
-        print(f'{NAME}: {error_message}', file=sys.stderr)
+        message = f'{NAME}: {error_message}'
+
+    # Collect the message if requested, for example from a worker thread:
+    if messages is not None:
+        messages.append(message)
+        return
+
+    # Print the message to standard error output:
+    print(message, file=sys.stderr)
 
-# Ensure that the XML element has a valid ID attribute set:
-def fix_element_id(xml_element: etree._Element) -> None:
+# Ensure that the XML element has a valid ID attribute set; the generated
+# ID is derived from the source file, the position of the topic in the
+# source file, and its title, which keeps the names of the split files
+# the same when an unchanged file is split again:
+def fix_element_id(xml_element: etree._Element, source_file: Any = None, position: str = '') -> None:
     # Check if the XML element already has an ID set:
     if xml_element.attrib and xml_element.attrib.has_key('id'):
         return
 
+    # Normalize the title, which can contain inline elements:
+    title = xml_element.find('title')
+    text  = ' '.join(''.join(map(str, title.itertext())).split()) if title is not None else ''
+
+    # Standard input does not have a path:
+    path  = os.path.normpath(source_file) if isinstance(source_file, str) else ''
+
     # Generate a unique ID:
-    xml_element.set('id', str(uuid4()))
+    from uuid import NAMESPACE_URL, uuid5
+    xml_element.set('id', str(uuid5(NAMESPACE_URL, f'{path}#{position}:{text}')))
 
 # Ensure that the XML element has a valid outputclass:
 def fix_element_outputclass(xml_element: etree._Element) -> None:
@@ -83,7 +120,7 @@ def fix_element_outputclass(xml_element: etree._Element) -> None:
     xml_element.set('outputclass', 'concept')
 
 # Extract the content type from the root element outputclass:
-def get_type(source_file: str, source_xml: etree._ElementTree) -> str:
+def get_type(source_file: str | None, source_xml: etree._ElementTree, messages: list[str] | None = None) -> str:
     # Define the content type to fall back to:
     default_type = 'concept'
 
@@ -97,7 +134,7 @@ def get_type(source_file: str, source_xml: etree._ElementTree) -> str:
 
     # Verify that the outputclass attribute is defined:
     if 'outputclass' not in attributes:
-        warn(f'warning: outputclass not found, using "{default_type}"', source_file)
+        warn(f'warning: outputclass not found, using "{default_type}"', source_file, messages)
         return default_type
 
     # Get the outputclass attribute value:
@@ -116,14 +153,33 @@ def get_type(source_file: str, source_xml: etree._ElementTree) -> str:
     # Return the adjusted outputclass:
     return output_class
 
+# Report the problems that would make the conversion of the selected file
+# fail; all but the last are printed and the last one is raised:
+def check_problems(source_file: str | None, source_xml: etree._ElementTree, target_type: str | None = None, generated: bool = False, messages: list[str] | None = None) -> None:
+    from .validate import validate
+
+    # Find the problems in a single pass over the document:
+    problems = validate(source_xml, target_type, generated)
+    if not problems:
+        return
+
+    # Report all problems, failing with the last one:
+    for problem in problems[:-1]:
+        warn(f'error: {problem}', source_file, messages)
+    raise Exception(f'error: {problems[-1]}')
+
 # Convert the selected file:
-def convert(source_file: str, source_xml: etree._ElementTree, target_type: str | None = None, generated: bool = False) -> etree._XSLTResultTree:
+def convert(source_file: str | None, source_xml: etree._ElementTree, target_type: str | None = None, generated: bool = False, messages: list[str] | None = None, validate: bool = False, engine: str = 'xslt') -> etree._XSLTResultTree:
+    # Skip the transformation of files that would make it fail if requested:
+    if validate:
+        check_problems(source_file, source_xml, target_type, generated, messages)
+
     # Determine the target type from the source file if not provided:
     if target_type is None:
-        target_type = get_type(source_file, source_xml)
+        target_type = get_type(source_file, source_xml, messages)
 
     # Select the appropriate XSLT transformer:
-    transform = {
+    transform: Transformer | NativeTransformer = {
         False: {
             'concept':       to_concept,
             'reference':     to_reference,
@@ -140,22 +196,205 @@ def convert(source_file: str, source_xml: etree._ElementTree, target_type: str |
         },
     }[generated][target_type]
 
+    # Use the native engine for the content types it supports; it rewrites
+    # the supplied document in place:
+    if engine == 'native':
+        from .native import TRANSFORMERS
+        transform = TRANSFORMERS.get((generated, target_type), transform)
+    elif engine != 'xslt':
+        raise ValueError(f'unsupported engine "{engine}"')
+
     # Run the transformation:
     xml = transform(source_xml)
 
     # Print any warning messages to standard error output:
     if hasattr(transform, 'error_log'):
         for error in transform.error_log:
-            warn(str(error.message), source_file)
+            warn(str(error.message), source_file, messages)
 
     # Return the result:
     return xml
 
+# Parse and convert the selected file:
+def parse_and_convert(source_file: Any, target_type: str | None = None, generated: bool = False, validate: bool = False, engine: str = 'xslt') -> etree._XSLTResultTree:
+    # Import lxml only when there are files to process:
+    from lxml import etree
+
+    # Parse the source file:
+    source_xml = etree.parse(source_file)
+
+    # Convert the selected file:
+    return convert(source_file, source_xml, target_type, generated, validate=validate, engine=engine)
+
+# Return the prefix of messages that refer to the selected source file:
+def message_prefix(source_file: Any) -> str | None:
+    return f'{NAME}: {source_file}' if source_file and source_file != sys.stdin else None
+
+# Read the contents of the selected source file so that they can be looked
+# up in the cache; return None if the file cannot be read:
+def read_source(source_file: Any) -> bytes | None:
+    try:
+        if source_file == sys.stdin:
+            return sys.stdin.buffer.read()
+        with open(source_file, 'rb') as f:
+            return f.read()
+    except OSError:
+        # Let the parser report the error in the usual way:
+        return None
+
+# Parse and convert the selected file, returning the output together with
+# the messages that would otherwise be printed to standard error output
+# and whether the result was found in the cache:
+def convert_job(source_file: Any, source_data: bytes | None, target_type: str | None = None, generated: bool = False, cache: Cache | None = None, validate: bool = False, engine: str = 'xslt') -> tuple[bytes | None, str, bool | None]:
+    from io import BytesIO
+    from lxml import etree
+    from .cache import pack, unpack
+
+    # Collect the messages so that they can be reported in order later:
+    messages: list[str] = []
+
+    # Look up the result in the cache if requested:
+    key = None
+    if cache is not None:
+        if source_data is None:
+            source_data = read_source(source_file)
+        if source_data is not None:
+            key   = cache.key(source_data, 'convert', target_type, generated, validate)
+            entry = cache.get(key)
+            if entry is not None:
+                files, messages = unpack(entry, message_prefix(source_file))
+                return files[0][1], ''.join(f'{message}\n' for message in messages), True
+
+    try:
+        # Parse the source file or the supplied contents:
+        if source_data is None:
+            source_xml = etree.parse(source_file)
+        elif source_file is None:
+            source_xml = etree.parse(BytesIO(source_data))
+        else:
+            source_xml = etree.parse(BytesIO(source_data), base_url=source_file)
+
+        # Convert the selected file:
+        output = bytes(convert(source_file, source_xml, target_type, generated, messages, validate, engine))
+    except Exception as message:
+        # Report the error:
+        warn(str(message), source_file, messages)
+
+        # Indicate that the conversion failed:
+        output = None
+
+    # Store successful conversions in the cache:
+    if cache is not None and key is not None and output is not None:
+        cache.put(key, pack([('', output)], messages, message_prefix(source_file)))
+
+    # Return the result and the collected messages:
+    return output, ''.join(f'{message}\n' for message in messages), None if key is None else False
+
+# Convert the supplied files one by one:
+def convert_sequential(convert_file: Callable[..., Any], files: list[Any], target_type: str | None, generated: bool, validate: bool = False, engine: str = 'xslt') -> Iterator[tuple[Any, Any]]:
+    for input_file in files:
+        try:
+            # Convert the selected file:
+            xml = convert_file(input_file, target_type, generated, validate, engine)
+        except Exception as message:
+            # Report the error:
+            warn(str(message), input_file)
+
+            # Indicate that the conversion failed:
+            xml = None
+
+        # Return the result:
+        yield input_file, xml
+
+# Convert the supplied files in a pool of worker processes or threads, or
+# in the current process if only one worker is requested:
+def convert_parallel(files: list[Any], target_type: str | None, generated: bool, jobs: int, threads: bool = False, cache: Cache | None = None, validate: bool = False, engine: str = 'xslt') -> Iterator[tuple[Any, Any]]:
+    from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+    from contextlib import nullcontext
+    from itertools import repeat
+
+    # Standard input cannot be shared with workers, read it in advance:
+    names = [None if f == sys.stdin else f for f in files]
+    data  = [sys.stdin.buffer.read() if f == sys.stdin else None for f in files]
+
+    # Use all available processors unless told otherwise:
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(files)))
+
+    # Send the files to the workers in chunks to reduce the overhead:
+    chunksize = max(1, min(64, len(files) // (workers * 4)))
+
+    # Use threads if requested; lxml releases the GIL while parsing,
+    # transforming, and serializing, so the memory and IPC overhead of
+    # processes is avoided; each worker of the new pool compiles its own
+    # transformers when it first needs them:
+    executor: Executor | nullcontext[None]
+    if workers == 1:
+        executor = nullcontext()
+    elif threads:
+        executor = ThreadPoolExecutor(workers)
+    else:
+        executor = ProcessPoolExecutor(workers)
+
+    # Report the results in the order of the supplied files:
+    with executor:
+        arguments = (names, data, repeat(target_type), repeat(generated), repeat(cache), repeat(validate), repeat(engine))
+        if isinstance(executor, Executor):
+            results = executor.map(convert_job, *arguments, chunksize=chunksize)
+        else:
+            results = map(convert_job, *arguments)
+
+        for input_file, (output, messages, hit) in zip(files, results):
+            # Print the messages that the worker collected for this file:
+            sys.stderr.write(messages)
+
+            # Update the cache statistics:
+            if cache is not None and hit is not None:
+                if hit:
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+
+            # Return the result:
+            yield input_file, output
+
+# Print the cache statistics to standard error output:
+def report_cache(cache: Cache) -> None:
+    stats = cache.stats()
+    print(f'{NAME}: cache: {stats["hits"]} hits, {stats["misses"]} misses, ' +
+          f'{stats["evictions"]} evictions, {stats["size"]} bytes', file=sys.stderr)
+
+# Write the record of converted files to the target directory:
+def save_manifest(manifest: Manifest) -> None:
+    try:
+        manifest.save()
+    except OSError as message:
+        warn(str(message), manifest.path)
+
+# Write the converted document to the supplied binary file; conversion
+# results are serialized directly to the file, while documents that were
+# converted elsewhere are already serialized as UTF-8 encoded bytes:
+def write_output(f: BinaryIO, xml: Any) -> None:
+    if isinstance(xml, bytes):
+        f.write(xml)
+    else:
+        xml.write_output(f)
+
 # Convert individual topics:
 def convert_topics(args: argparse.Namespace) -> int:
     # Set the initial exit code:
     exit_code = 0
 
+    # Select how to convert the supplied files:
+    convert_file: Callable[..., Any] = parse_and_convert
+
+    # Delegate the conversion to a running server if requested:
+    if args.connect:
+        from .daemon import Client
+        try:
+            convert_file = Client(args.connect).convert
+        except OSError:
+            exit_with_error(f'error: Unable to connect to server: {args.connect}', errno.ECONNREFUSED)
+
     # Create the target directory:
     if args.directory:
         try:
@@ -165,27 +404,41 @@ def convert_topics(args: argparse.Namespace) -> int:
         except Exception:
             exit_with_error(f'error: Unable to create target directory: {args.directory}', errno.EACCES)
 
-    # Process all supplied files:
-    for input_file in args.files:
-        try:
-            # Parse the source file:
-            input_xml = etree.parse(input_file)
-
-            # Convert the selected file:
-            xml = convert(input_file, input_xml, args.type, args.generated)
-        except (etree.XMLSyntaxError, etree.XSLTApplyError, OSError, Exception) as message:
-            # Report the error:
-            warn(str(message), input_file)
+    # Open the result cache if requested:
+    cache = None
+    if args.cache:
+        from .cache import Cache
+        cache = Cache(args.cache, args.cache_size)
+
+    # Skip the files that have not changed since the last run if requested:
+    files    = args.files
+    manifest = None
+    if args.incremental:
+        from .manifest import Manifest
+        manifest = Manifest(args.directory, ['convert', args.type, args.generated])
+        files    = [f for f in files if f == sys.stdin or not manifest.is_current(f)]
+
+    # Select whether to convert the supplied files in parallel; cached
+    # conversions always go through the job interface:
+    if (args.jobs != 1 and len(files) > 1) or cache is not None:
+        results = convert_parallel(files, args.type, args.generated, args.jobs, args.threads, cache, args.validate, args.engine)
+    else:
+        results = convert_sequential(convert_file, files, args.type, args.generated, args.validate, args.engine)
 
-            # Do not proceed further with this file:
+    # Process all supplied files:
+    for input_file, xml in results:
+        # Do not proceed further with files that failed to convert:
+        if xml is None:
             exit_code = errno.EPERM
             continue
 
         # Determine whether to write to standard output:
         if (args.output == sys.stdout and not args.directory and not args.in_place) or \
            (input_file  == sys.stdin  and args.in_place):
-            # Print the converted content to standard output:
-            sys.stdout.write(str(xml))
+            # Print the converted content to standard output, bypassing the
+            # text layer:
+            sys.stdout.flush()
+            write_output(sys.stdout.buffer, xml)
 
             # Proceed to the next file:
             continue
@@ -204,23 +457,327 @@ def convert_topics(args: argparse.Namespace) -> int:
 
         try:
             # Write the converted content to the selected file:
-            with open(output_file, 'w') as f:
-                f.write(str(xml))
+            with open(output_file, 'wb') as f:
+                write_output(f, xml)
         except Exception as message:
             # Report the error:
             warn(str(message), output_file)
 
             # Update the exit code:
             exit_code = errno.EPERM
+            continue
+
+        # Record the successful conversion:
+        if manifest is not None and input_file != sys.stdin:
+            manifest.update(input_file, [os.path.basename(output_file)])
+
+    # Save the record of converted files:
+    if manifest is not None:
+        save_manifest(manifest)
+
+    if cache is not None:
+        # Keep the cache within its size limit even if worker processes
+        # stored entries that this process does not know about:
+        cache.trim()
+
+        # Report the cache statistics if requested:
+        if args.cache_stats:
+            report_cache(cache)
 
     # Return the exit code:
     return exit_code
 
+# Return the position of each topic as the numbers of the topic and its
+# ancestors among the topics nested in the same parent, for example 2.1
+# for the first topic nested in the second topic of the root topic:
+def topic_positions(topics: list[etree._Element]) -> list[str]:
+    counts: dict[etree._Element, int] = {}
+    positions: dict[etree._Element, str] = {}
+
+    # The topics are in document order, which puts parents first:
+    for topic in topics:
+        parent = next(topic.iterancestors('topic'), None)
+        if parent is None:
+            positions[topic] = ''
+            continue
+        counts[parent] = counts.get(parent, 0) + 1
+        positions[topic] = f'{positions[parent]}.{counts[parent]}'.lstrip('.')
+
+    # Return the positions in the same order:
+    return [positions[topic] for topic in topics]
+
+# Compose a document with only the topic elements and the attributes that
+# the DITA map is generated from; the stylesheet removes whitespace from
+# the document it is applied to, which must not affect the topics:
+def outline_topics(topics: list[etree._Element]) -> etree._ElementTree:
+    from lxml import etree
+
+    # Copy the topics that are nested directly in other topics:
+    root    = etree.Element('topic')
+    outline = {topics[0]: root}
+    for topic in topics[1:]:
+        parent = outline.get(topic.getparent())  # type: ignore[arg-type]
+        if parent is not None:
+            outline[topic] = etree.SubElement(parent, 'topic')
+
+    # Copy the attributes:
+    for topic, element in outline.items():
+        for name in ('id', 'outputclass'):
+            if name in topic.attrib:
+                element.set(name, topic.attrib[name])
+
+    # Return the outline:
+    return etree.ElementTree(root)
+
+# Return the target type of a split topic; the outputclass has already been
+# validated, which makes the detection of the content type unnecessary:
+def topic_type(xml: etree._ElementTree) -> str:
+    outputclass = str(xml.getroot().attrib['outputclass'])
+    return 'task' if outputclass == 'procedure' else outputclass
+
+# Detach the nested topics from their parents and move each topic to a
+# document of its own, which the stylesheets need to look up keys; the
+# contents are moved rather than copied, the nodes outside of the root
+# topic are not converted with it, and topics nested in other content keep
+# the text that follows them:
+def detach_topics(topics: list[etree._Element]) -> list[etree._ElementTree]:
+    from lxml import etree
+
+    # Remove the nested topics from their parents, which leaves each topic
+    # with its own contents only; the innermost topics are removed first
+    # because removing an element walks all of its descendants:
+    for topic in reversed(topics[1:]):
+        parent = topic.getparent()
+        if parent is not None:
+            parent.remove(topic)
+
+    # Move the contents of each topic to a new document:
+    result = []
+    for topic in topics:
+        root = etree.Element(topic.tag, nsmap=topic.nsmap)  # type: ignore[arg-type]
+        root.attrib.update(topic.attrib)
+        root.text = topic.text
+        root.tail = topic.tail
+        root.extend(list(topic))
+        result.append(etree.ElementTree(root))
+
+    # Return the topics in document order:
+    return result
+
+# Print the messages collected by a worker, or add them to the supplied
+# list of messages:
+def report_messages(collected: list[str], messages: list[str] | None) -> None:
+    if messages is not None:
+        messages.extend(collected)
+        return
+    for message in collected:
+        print(message, file=sys.stderr)
+
+# Convert a topic detached from a split file; return the converted topic,
+# or None if the conversion failed:
+def convert_split_topic(label: str, topic: etree._ElementTree, generated: bool, messages: list[str] | None) -> Any:
+    from lxml import etree
+
+    try:
+        # Convert the selected file in nested topics:
+        return convert(label, topic, topic_type(topic), generated, messages, engine='native')
+    except etree.XSLTApplyError as message:
+        # Report the error:
+        warn(f'error: {message}', label, messages)
+        return None
+
+# Parse and convert a serialized topic of a split file in a worker process
+# or thread, returning the serialized output, or None if the conversion
+# failed, together with the messages that would otherwise be printed:
+def split_job(label: str, data: bytes, generated: bool) -> tuple[bytes | None, list[str]]:
+    from lxml import etree
+
+    # Collect the messages so that they can be reported in order later:
+    messages: list[str] = []
+
+    # Convert the topic:
+    result = convert_split_topic(label, etree.ElementTree(etree.fromstring(data)), generated, messages)
+    return None if result is None else bytes(result), messages
+
+# Split the parsed file into individual topics and a DITA map in a single
+# pass, returning the converted documents by the names of the generated
+# files and whether all topics were converted successfully; the native
+# engines convert the topics and the map in place and only the documents
+# they do not support are left to the XSLT stylesheets. If a pool of
+# workers is supplied, the topics are converted there while the DITA map
+# is generated, and their messages are reported in the order of topics:
+def split_xml(input_file: Any, input_xml: etree._ElementTree, generated: bool = False, messages: list[str] | None = None, executor: Executor | None = None) -> tuple[dict[str, Any], bool]:
+    from lxml import etree
+
+    # Collect the converted documents:
+    results: dict[str, Any] = {}
+
+    try:
+        # Convert the supplied file to a topic with nested topics:
+        xml = etree.ElementTree(convert(input_file, input_xml, 'single_topic', generated, messages, engine='native').getroot())
+    except (etree.XSLTApplyError, Exception) as message:
+        # Report the error:
+        warn(str(message), input_file, messages)
+
+        # Do not proceed further with this file:
+        return results, False
+
+    # Ensure that each topic has a valid ID and outputclass:
+    topics = list(xml.iter('topic'))
+    for element, position in zip(topics, topic_positions(topics)):
+        fix_element_id(element, input_file, position)
+        fix_element_outputclass(element)
+
+    # Record the structure of the topics before they are detached:
+    outline = outline_topics(topics)
+
+    # Compose the target file names and the labels of messages:
+    documents = list(detach_topics(topics))
+    names     = [str(topic.getroot().attrib['id']) for topic in documents]
+    labels    = [f'{input_file} (id="{element_id}")' for element_id in names]
+
+    # Send the serialized topics to the workers in chunks if requested; the
+    # results are collected after the DITA map is generated:
+    if executor is not None and len(documents) > 1:
+        from itertools import repeat
+        chunksize = max(1, min(64, len(documents) // (os.cpu_count() or 1) // 4))
+        outputs   = executor.map(split_job, labels, [etree.tostring(topic) for topic in documents], repeat(generated), chunksize=chunksize)
+    else:
+        outputs   = None
+
+    # Generate the DITA map, keeping its messages until the messages of the
+    # topics have been reported:
+    map_id   = str(outline.getroot().attrib["id"])
+    collected: list[str] = []
+    try:
+        # Convert the outline of the supplied file to a DITA map:
+        ditamap = convert(input_file, outline, 'single_map', generated, collected, engine='native')
+    except etree.XSLTApplyError as message:
+        # Report the error:
+        warn(f'error: {message}', input_file, collected)
+        ditamap = None
+
+    # Assume success until a topic fails to convert:
+    success = True
+
+    # Process each topic individually:
+    for index, (file_name, label) in enumerate(zip(names, labels)):
+        if outputs is None:
+            # Convert the topic in this process:
+            result = convert_split_topic(label, documents[index], generated, messages)
+        else:
+            # Report the messages that the worker collected for the topic:
+            result, topic_messages = next(outputs)
+            report_messages(topic_messages, messages)
+
+        # Do not proceed further with a topic that failed to convert:
+        if result is None:
+            success = False
+            continue
+
+        # Record the converted topic:
+        results[file_name + '.dita'] = result
+
+    # Report the messages of the DITA map:
+    report_messages(collected, messages)
+
+    # Do not proceed further with this file if the DITA map failed:
+    if ditamap is None:
+        return results, False
+
+    # Return the converted documents:
+    results[map_id + '.ditamap'] = ditamap
+    return results, success
+
+# Split the selected file into individual topics and a DITA map, returning
+# the names and contents of the generated files and whether all topics
+# were converted successfully:
+def split_file(input_file: Any, source_data: bytes | None, generated: bool = False, messages: list[str] | None = None, executor: Executor | None = None) -> tuple[list[tuple[str, bytes]], bool]:
+    from io import BytesIO
+    from lxml import etree
+
+    try:
+        # Parse the supplied file or the supplied contents:
+        if source_data is None:
+            input_xml = etree.parse(input_file)
+        elif input_file == sys.stdin:
+            input_xml = etree.parse(BytesIO(source_data))
+        else:
+            input_xml = etree.parse(BytesIO(source_data), base_url=input_file)
+    except (etree.XMLSyntaxError, OSError, Exception) as message:
+        # Report the error:
+        warn(str(message), input_file, messages)
+
+        # Do not proceed further with this file:
+        return [], False
+
+    # Split the parsed file:
+    results, success = split_xml(input_file, input_xml, generated, messages, executor)
+
+    # Serialize the generated files:
+    return [(file_name, bytes(result)) for file_name, result in results.items()], success
+
+# Write the content to the selected file in the target directory; report
+# the error and return False if the file cannot be written:
+def write_file(directory: str, file_name: str, content: bytes) -> bool:
+    # Compose the target file path:
+    output_file = str(os.path.join(directory, file_name))
+
+    try:
+        # Write the converted content to the selected file:
+        with open(output_file, 'wb') as f:
+            f.write(content)
+    except Exception as message:
+        # Report the error:
+        warn(str(message), output_file)
+        return False
+
+    return True
+
+# Write the content to the selected file in the target directory unless
+# the manifest records the same content for the same source file, and
+# record the digest of the content:
+def write_changed(directory: str, manifest: Manifest, source_file: str, digests: dict[str, str], file_name: str, content: bytes) -> bool:
+    from .manifest import content_digest
+
+    # Keep the file that has not changed:
+    digest = digests[file_name] = content_digest(content)
+    if manifest.is_unchanged(source_file, file_name, digest):
+        return True
+
+    # Write the changed file:
+    return write_file(directory, file_name, content)
+
+# Return a pool of worker processes or threads to convert the topics of
+# split files in, or None if only one worker is requested; the workers
+# compile their transformers once and are reused for all supplied files:
+def split_executor(jobs: int, threads: bool = False) -> Executor | None:
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    # Use all available processors unless told otherwise:
+    workers = max(1, jobs or os.cpu_count() or 1)
+    if workers == 1:
+        return None
+
+    # Use threads if requested:
+    return ThreadPoolExecutor(workers) if threads else ProcessPoolExecutor(workers)
+
 # Split supplied topics:
 def split_topics(args: argparse.Namespace) -> int:
+    from functools import partial
+    from .cache import Cache, pack, unpack
+    from .stream import split_stream
+
     # Set the initial exit code:
     exit_code = 0
 
+    # Open the result cache if requested:
+    cache = Cache(args.cache, args.cache_size) if args.cache else None
+
+    # Convert the topics of each file in a pool of worker processes or
+    # threads if requested:
+    executor = split_executor(args.jobs, args.threads)
+
     # Create the target directory:
     try:
         os.makedirs(args.directory)
@@ -229,100 +786,127 @@ def split_topics(args: argparse.Namespace) -> int:
     except Exception:
         exit_with_error(f'error: Unable to create target directory: {args.directory}', errno.EACCES)
 
+    # Keep a record of converted files if requested:
+    manifest = None
+    if args.incremental:
+        from .manifest import Manifest
+        manifest = Manifest(args.directory, ['split', args.generated])
+
     # Process all supplied files:
     for input_file in args.files:
-        try:
-            # Parse the supplied file:
-            input_xml = etree.parse(input_file)
-
-            # Convert the supplied file to a topic with nested topics:
-            xml = convert(input_file, input_xml, 'single_topic', args.generated)
-        except (etree.XMLSyntaxError, etree.XSLTApplyError, OSError, Exception) as message:
-            # Report the error:
-            warn(str(message), input_file)
-
-            # Do not proceed further with this file:
-            exit_code = errno.EPERM
+        # Skip the files that have not changed since the last run:
+        if manifest is not None and input_file != sys.stdin and manifest.is_current(input_file):
             continue
 
-        # Process each topic individually:
-        for element in xml.iter():
-            # Skip elements other than topics:
-            if element.tag != 'topic':
-                continue
+        # Collect the messages so that they can be stored in the cache:
+        messages: list[str] = []
+        source_data = key = entry = None
 
-            # Ensure that the topic has a valid ID:
-            fix_element_id(element)
+        # Write only the files whose contents changed if requested:
+        digests: dict[str, str] = {}
+        if manifest is not None and input_file != sys.stdin:
+            write = partial(write_changed, args.directory, manifest, input_file, digests)
+        else:
+            write = partial(write_file, args.directory)
+
+        # Look up the result in the cache if requested:
+        if cache is not None:
+            source_data = read_source(input_file)
+            if source_data is not None:
+                # The generated IDs depend on the path to the file:
+                key   = cache.key(source_data, 'split', args.generated, None if input_file == sys.stdin else input_file)
+                entry = cache.get(key)
+
+                # Update the cache statistics:
+                if entry is not None:
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+
+        if args.stream:
+            # Split the supplied file one topic at a time, writing each
+            # topic and printing its messages as soon as it is converted:
+            names, success = split_stream(input_file, args.generated, write)
+            files: list[tuple[str, bytes]] = []
+        elif entry is not None:
+            # Reuse the stored files without parsing or transforming:
+            files, messages = unpack(entry, message_prefix(input_file))
+            success = True
+        else:
+            # Split the supplied file:
+            files, success = split_file(input_file, source_data, args.generated, messages, executor)
 
-            # Ensure that the topic has a valid outputclass:
-            fix_element_outputclass(element)
+            # Store the result in the cache if all topics were converted:
+            if cache is not None and key is not None and success:
+                cache.put(key, pack(files, messages, message_prefix(input_file)))
 
-            # Create a copy of the topic subtree:
-            topic = etree.ElementTree(deepcopy(element))
+        # Print the collected messages:
+        for message in messages:
+            print(message, file=sys.stderr)
 
-            # Remove all nested topics:
-            for e in topic.findall('.//topic'):
-                parent = e.getparent()
-                if parent is not None:
-                    parent.remove(e)
+        # Update the exit code:
+        if not success:
+            exit_code = errno.EPERM
 
-            # Compose the target file path:
-            element_id  = str(element.attrib["id"])
-            output_file = str(os.path.join(args.directory, element_id + '.dita'))
+        # Write the generated files to the target directory:
+        for file_name, content in files:
+            if not write(file_name, content):
+                # Update the exit code:
+                exit_code = errno.EPERM
+                success   = False
 
-            try:
-                # Convert the selected file in nested topics:
-                out = convert(f'{input_file} (id="{element_id}")', topic, None, args.generated)
-            except etree.XSLTApplyError as message:
-                # Report the error:
-                warn(f'error: {message}', f'{input_file} (id="{element_id}")')
+        # Record the successful conversion:
+        if manifest is not None and input_file != sys.stdin and success:
+            stale = manifest.update(input_file, names if args.stream else [file_name for file_name, _ in files], digests)
 
-                # Do not proceed further with this file:
-                exit_code = errno.EPERM
-                continue
+            # Report the files that are no longer generated:
+            for file_name in stale:
+                warn(f'warning: No longer generated from {input_file}, can be removed', os.path.join(args.directory, file_name))
 
-            try:
-                # Write the converted content to the selected file:
-                with open(output_file, 'w') as f:
-                    f.write(str(out))
-            except Exception as message:
-                # Report the error:
-                warn(str(message), output_file)
+    # Stop the workers:
+    if executor is not None:
+        executor.shutdown()
 
-                # Update the exit code:
-                exit_code = errno.EPERM
+    # Save the record of converted files:
+    if manifest is not None:
+        save_manifest(manifest)
 
-        # Generate the DITA map:
-        try:
-            # Convert the supplied file to a DITA map:
-            out = convert(input_file, xml, 'single_map', args.generated)
-        except etree.XSLTApplyError as message:
-            # Report the error:
-            warn(f'error: {message}', input_file)
+    # Report the cache statistics if requested:
+    if cache is not None and args.cache_stats:
+        report_cache(cache)
 
-            # Do not proceed further with this file:
-            exit_code = errno.EPERM
-            continue
+    # Return the exit code:
+    return exit_code
 
-        # Compose the target file path:
-        output_file = str(os.path.join(args.directory, str(xml.getroot().attrib["id"]) + '.ditamap'))
+# Run the selected action and run it again on files that change:
+def watch_topics(action: Callable[[argparse.Namespace], int], args: argparse.Namespace) -> int:
+    from argparse import Namespace
+    from .watch import watch
 
-        try:
-            # Write the converted DITA map to the selected file:
-            with open(output_file, 'w') as f:
-                f.write(str(out))
-        except Exception as message:
-            # Report the error:
-            warn(f'error: {message}', output_file)
+    # Convert all supplied files first:
+    exit_code = action(args)
 
-            # Update the exit code:
-            exit_code = errno.EPERM
+    # Convert the changed files again, keeping the transformers compiled:
+    for files in watch(args.files):
+        exit_code = action(Namespace(**{**vars(args), 'files': files}))
 
-    # Return the exit code:
+    # Return the exit code of the last run:
     return exit_code
 
+# Parse a size with an optional K, M, or G suffix:
+def parse_size(value: str) -> int:
+    # Determine the multiplier:
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    multiplier = units.get(value[-1:].upper(), 1)
+
+    # Return the size in bytes:
+    return int(value[:-1] if multiplier != 1 else value) * multiplier
+
 # Parse supplied command-line options:
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    # Import argparse only when the options are parsed:
+    import argparse
+
     # Configure the option parser:
     parser = argparse.ArgumentParser(prog=NAME,
         description=DESCRIPTION,
@@ -359,6 +943,79 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action='store_false',
         help='specify that the input file is a generic DITA topic ' +
              '(default); this option is mutually exclusive with -g')
+    act.add_argument('--serve', metavar='SOCKET',
+        default=None,
+        help='run a conversion server listening on the selected Unix ' +
+             'socket and keep the compiled stylesheets in memory; this ' +
+             'option is mutually exclusive with -s and -t')
+    parser.add_argument('-c', '--connect', metavar='SOCKET',
+        default=None,
+        help='delegate the conversion to a server listening on the ' +
+             'selected Unix socket; this option cannot be combined with -s')
+    parser.add_argument('-j', '--jobs', metavar='NUMBER',
+        default=1,
+        type=int,
+        help='convert files in the selected number of parallel ' +
+             'processes, or with -s, the topics of each split file; use ' +
+             '0 for the number of available processors (default: 1); ' +
+             'this option cannot be combined with -c')
+    parser.add_argument('-T', '--threads',
+        default=False,
+        action='store_true',
+        help='use threads instead of processes with -j to reduce the ' +
+             'memory overhead')
+    parser.add_argument('-w', '--watch',
+        default=False,
+        action='store_true',
+        help='keep running after the conversion and convert the supplied ' +
+             'files again whenever they change; this option cannot be ' +
+             'combined with -i or standard input')
+    parser.add_argument('--validate',
+        default=False,
+        action='store_true',
+        help='check the supplied files for problems that would make the ' +
+             'conversion fail, report all of them with line numbers, and ' +
+             'skip the conversion of such files; this option cannot be ' +
+             'combined with -s')
+    parser.add_argument('--engine',
+        default='xslt',
+        choices=['xslt', 'native'],
+        help='select how to convert the supplied files: native rewrites ' +
+             'supported concepts, references, tasks, and generated ' +
+             'concepts and references directly in Python and uses the ' +
+             'XSLT stylesheets for everything else (default: xslt); ' +
+             'this option cannot be combined with -s')
+    parser.add_argument('--stream',
+        default=False,
+        action='store_true',
+        help='with -s, convert and write each topic as soon as it has ' +
+             'been parsed and release it afterwards, which limits the ' +
+             'memory to the largest topic; standard input and files that ' +
+             'cannot be split this way are split in memory; this option ' +
+             'requires -s and cannot be combined with -j or --cache')
+    parser.add_argument('--incremental',
+        default=False,
+        action='store_true',
+        help='skip files that have not changed since they were last ' +
+             'converted to the directory selected with -d, which this ' +
+             'option requires; with -s, write only the generated files ' +
+             'whose contents changed and report the files that are no ' +
+             'longer generated')
+    parser.add_argument('--cache', metavar='DIRECTORY',
+        default=None,
+        help='reuse the results of previous conversions stored in the ' +
+             'selected directory and store new results there; this ' +
+             'option cannot be combined with -c')
+    parser.add_argument('--cache-size', metavar='SIZE',
+        default=1024 ** 3,
+        type=parse_size,
+        help='limit the size of the cache directory and evict the least ' +
+             'recently used results when it is exceeded; accepts the K, ' +
+             'M, and G suffixes (default: 1G)')
+    parser.add_argument('--cache-stats',
+        default=False,
+        action='store_true',
+        help='print the number of cache hits and misses to stderr')
     out.add_argument('-i', '--in-place',
         default=False,
         action='store_true',
@@ -393,6 +1050,42 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     if args.split_topic and not args.directory:
         parser.print_usage(file=sys.stderr)
         exit_with_error('the -s option requires -d to be specified', errno.ENOENT)
+    if args.jobs < 0:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the -j option requires a non-negative number', errno.ENOENT)
+    if args.jobs != 1 and args.connect:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the -j option cannot be combined with -c', errno.ENOENT)
+    if args.split_topic and args.connect:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the -s option cannot be combined with -c', errno.ENOENT)
+    if args.validate and args.split_topic:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --validate option cannot be combined with -s', errno.ENOENT)
+    if args.engine != 'xslt' and args.split_topic:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --engine option cannot be combined with -s', errno.ENOENT)
+    if args.stream and not args.split_topic:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --stream option requires -s to be specified', errno.ENOENT)
+    if args.stream and args.jobs != 1:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --stream option cannot be combined with -j', errno.ENOENT)
+    if args.stream and args.cache:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --stream option cannot be combined with --cache', errno.ENOENT)
+    if args.incremental and not args.directory:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --incremental option requires -d to be specified', errno.ENOENT)
+    if args.watch and (args.in_place or '-' in args.files):
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --watch option cannot be combined with -i or standard input', errno.ENOENT)
+    if args.cache and args.connect:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --cache option cannot be combined with -c', errno.ENOENT)
+    if args.cache_size <= 0:
+        parser.print_usage(file=sys.stderr)
+        exit_with_error('the --cache-size option requires a positive size', errno.ENOENT)
 
     # Recognize the instruction to read from standard input:
     if args.files == ['-']:
@@ -412,7 +1105,12 @@ def run(argv: list[str] | None = None) -> None:
         args = parse_args(argv)
 
         # Determine the correct action:
-        if args.split_topic:
+        if args.serve:
+            from .daemon import serve
+            exit_code = serve(args.serve)
+        elif args.watch:
+            exit_code = watch_topics(split_topics if args.split_topic else convert_topics, args)
+        elif args.split_topic:
             exit_code = split_topics(args)
         else:
             exit_code = convert_topics(args)
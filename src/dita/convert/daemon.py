@@ -0,0 +1,296 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import sys
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+# Define which symbols are to be exported:
+__all__ = ['Server', 'Client', 'serve']
+
+# Define the message frame: the header length and the payload length:
+FRAME = struct.Struct('!II')
+
+# The maximum number of connections handled at the same time; further
+# connections wait until one of the open connections is closed:
+MAX_CONNECTIONS = 32
+
+# Send a message consisting of a JSON header and an optional binary payload:
+def send_message(connection: socket.socket, header: dict[str, Any], payload: bytes = b'') -> None:
+    data = json.dumps(header).encode('utf-8')
+    connection.sendall(FRAME.pack(len(data), len(payload)) + data + payload)
+
+# Read exactly the requested number of bytes from the connection:
+def receive_exactly(connection: socket.socket, size: int) -> bytes:
+    chunks = []
+
+    while size > 0:
+        chunk = connection.recv(min(size, 1048576))
+
+        # Report a connection closed in the middle of a message:
+        if not chunk:
+            raise ConnectionError('connection closed unexpectedly')
+
+        chunks.append(chunk)
+        size -= len(chunk)
+
+    # Return the received data:
+    return b''.join(chunks)
+
+# Receive a message, or return None if the peer closed the connection:
+def receive_message(connection: socket.socket) -> tuple[dict[str, Any], bytes] | None:
+    # Read the frame; a connection closed before the frame is not an error:
+    frame = connection.recv(FRAME.size, socket.MSG_WAITALL)
+    if not frame:
+        return None
+    if len(frame) < FRAME.size:
+        frame += receive_exactly(connection, FRAME.size - len(frame))
+
+    # Read the header and the payload:
+    header_size, payload_size = FRAME.unpack(frame)
+    header  = json.loads(receive_exactly(connection, header_size))
+    payload = receive_exactly(connection, payload_size)
+
+    # Return the message:
+    return header, payload
+
+# A conversion server that keeps the compiled XSLT transformers in memory:
+class Server:
+    def __init__(self, address: str) -> None:
+        # Remove a stale socket left behind by a server that was killed:
+        if os.path.exists(address) and not self.is_running(address):
+            os.unlink(address)
+
+        # Create the socket and make it accessible to the current user only:
+        self.address = address
+        self.socket  = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask    = os.umask(0o177)
+        try:
+            self.socket.bind(address)
+        finally:
+            os.umask(old_umask)
+        self.socket.listen()
+        self.closed  = False
+
+        # Handle each connection in a worker thread; the threads are reused
+        # for later connections and each compiles its own transformers once
+        # when it starts:
+        from concurrent.futures import ThreadPoolExecutor
+        from threading import Lock
+        self.executor = ThreadPoolExecutor(MAX_CONNECTIONS, thread_name_prefix='dita-convert', initializer=self.warm_up)
+
+        # Track the open connections so that they can be closed with the
+        # server:
+        self.connections: set[socket.socket] = set()
+        self.lock    = Lock()
+
+    # Check whether a server is already listening on the supplied address:
+    @staticmethod
+    def is_running(address: str) -> bool:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(address)
+        except OSError:
+            return False
+        return True
+
+    # Compile all XSLT transformers for the current thread in advance:
+    def warm_up(self) -> None:
+        from . import transform
+        for name in transform.__all__:
+            getattr(transform, name).xslt
+
+    # Convert a document with the same semantics as cli.convert():
+    def handle_request(self, header: dict[str, Any], payload: bytes) -> tuple[dict[str, Any], bytes]:
+        from io import BytesIO
+        from lxml import etree
+        from .cli import convert
+
+        # Collect the warnings instead of printing them on the server side:
+        messages: list[str] = []
+        error: str | None = None
+
+        try:
+            # Parse the document from the supplied path or contents:
+            if header.get('path') is not None:
+                input_xml = etree.parse(header['path'])
+            else:
+                input_xml = etree.parse(BytesIO(payload))
+
+            # Convert the document:
+            xml = convert(header['name'], input_xml, header['type'], header['generated'], messages, header.get('validate', False), header.get('engine', 'xslt'))
+        except Exception as message:
+            error = str(message)
+
+            # Refer to the file by the name the client supplied, not by the
+            # absolute path the server parsed:
+            if header.get('path') is not None:
+                error = error.replace(header['path'], header['name'])
+
+        # Compose the warnings exactly as they would be printed:
+        warnings = ''.join(f'{message}\n' for message in messages)
+
+        # Return the converted document exactly as the command-line
+        # interface would write it:
+        if error is not None:
+            return {'error': error, 'warnings': warnings}, b''
+        return {'error': None, 'warnings': warnings}, bytes(xml)
+
+    # Process all requests sent over a single connection:
+    def handle_connection(self, connection: socket.socket) -> None:
+        try:
+            with connection:
+                while (message := receive_message(connection)) is not None:
+                    send_message(connection, *self.handle_request(*message))
+        except (ConnectionError, ValueError, OSError):
+            # Do not let a misbehaving client bring the worker down:
+            pass
+        finally:
+            with self.lock:
+                self.connections.discard(connection)
+
+    # Accept connections until the server is closed:
+    def serve_forever(self) -> None:
+        while not self.closed:
+            try:
+                connection, _ = self.socket.accept()
+            except OSError:
+                # The socket has been closed from another thread:
+                if self.closed:
+                    break
+                raise
+
+            # Stop on the connection used to wake up the server:
+            if self.closed:
+                connection.close()
+                break
+
+            # Handle the connection in a worker thread so that a client that
+            # keeps its connection open does not block other clients:
+            with self.lock:
+                self.connections.add(connection)
+            self.executor.submit(self.handle_connection, connection)
+
+    # Stop the server and remove the socket file:
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+
+        # Closing the socket does not interrupt a pending accept() on all
+        # systems; connect to the server to wake it up:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+                s.connect(self.address)
+        except OSError:
+            pass
+
+        # Close the socket:
+        self.socket.close()
+        try:
+            os.unlink(self.address)
+        except FileNotFoundError:
+            pass
+
+        # Interrupt the open connections and wait for the workers to stop:
+        with self.lock:
+            connections = list(self.connections)
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.executor.shutdown()
+
+# A client that delegates the conversion to a running server:
+class Client:
+    def __init__(self, address: str) -> None:
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(address)
+
+    # Convert the selected file on the server and return the result:
+    def convert(self, input_file: Any, target_type: str | None = None, generated: bool = False, validate: bool = False, engine: str = 'xslt') -> bytes:
+        # Send the contents of standard input, but only the path of files:
+        if input_file == sys.stdin:
+            header  = {'name': None, 'path': None, 'type': target_type, 'generated': generated, 'validate': validate, 'engine': engine}
+            payload = sys.stdin.buffer.read()
+        else:
+            header  = {'name': input_file, 'path': os.path.abspath(input_file), 'type': target_type, 'generated': generated, 'validate': validate, 'engine': engine}
+            payload = b''
+
+        # Send the request and wait for the response:
+        send_message(self.socket, header, payload)
+        message = receive_message(self.socket)
+        if message is None:
+            raise ConnectionError('connection closed by the server')
+        response, output = message
+
+        # Print any warning messages exactly as the server reported them:
+        sys.stderr.write(response['warnings'])
+
+        # Report an error with the same message as a local conversion:
+        if response['error'] is not None:
+            raise Exception(response['error'])
+
+        # Return the converted document:
+        return output
+
+    # Close the connection:
+    def close(self) -> None:
+        self.socket.close()
+
+# Run the conversion server until it is interrupted:
+def serve(address: str) -> int:
+    import errno
+    import signal
+    from .cli import exit_with_error
+
+    # Start the server:
+    try:
+        server = Server(address)
+    except OSError as message:
+        exit_with_error(f'error: Unable to start server: {address}: {message.strerror}', errno.EADDRINUSE)
+
+    # Start the first worker thread, which compiles all transformers in
+    # advance:
+    server.executor.submit(server.warm_up).result()
+
+    # Terminate cleanly when the server is asked to stop:
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        server.serve_forever()
+    finally:
+        server.close()
+
+    # Return the exit code:
+    return 0
@@ -0,0 +1,168 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import json
+import os
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+
+# Define which symbols are to be exported:
+__all__ = ['Manifest']
+
+# The name of the manifest file in the target directory:
+MANIFEST_FILE = '.dita-convert.json'
+
+# Compute the digest of the contents of the selected file:
+def file_digest(file_name: str) -> str:
+    from hashlib import sha256
+    with open(file_name, 'rb') as f:
+        return sha256(f.read()).hexdigest()
+
+# Compute the digest of the generated contents of an output file:
+def content_digest(content: bytes) -> str:
+    from hashlib import sha256
+    return sha256(content).hexdigest()
+
+# A record of converted source files that allows a later run to skip the
+# files that have not changed since:
+class Manifest:
+    def __init__(self, directory: str, options: list[Any]) -> None:
+        from .cache import fingerprint
+
+        # Store the manifest configuration:
+        self.directory   = directory
+        self.path        = os.path.join(directory, MANIFEST_FILE)
+        self.fingerprint = fingerprint()
+        self.options     = options
+
+        # Map absolute source paths to their recorded state:
+        self.entries: dict[str, dict[str, Any]] = {}
+
+        # Keep the state of stale files observed before their conversion:
+        self.pending: dict[str, dict[str, Any]] = {}
+        self.changed     = False
+
+        try:
+            with open(self.path, 'rb') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        # Discard the manifest if the stylesheets, the version, or the
+        # conversion options changed since it was written:
+        if isinstance(data, dict) and data.get('fingerprint') == self.fingerprint and data.get('options') == options:
+            self.entries = data.get('files', {})
+
+    # Return True if all recorded outputs of the entry still exist:
+    def has_outputs(self, entry: dict[str, Any]) -> bool:
+        return all(os.path.exists(os.path.join(self.directory, name)) for name in entry['outputs'])
+
+    # Return True if the selected source file has not changed since it was
+    # last converted; up-to-date files only cost a stat call, and files
+    # with a new mtime but the same contents are recognized by their hash:
+    def is_current(self, source_file: str) -> bool:
+        path = os.path.abspath(source_file)
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+
+        # Compare the file size and modification time:
+        entry = self.entries.get(path)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return self.has_outputs(entry)
+
+        # Record the state of the file before it is converted so that
+        # changes made during the conversion are detected on the next run:
+        try:
+            state = {'mtime': stat.st_mtime_ns, 'size': stat.st_size, 'hash': file_digest(path)}
+        except OSError:
+            return False
+
+        # Compare the contents of files that were only touched:
+        if entry and entry['size'] == state['size'] and entry['hash'] == state['hash'] and self.has_outputs(entry):
+            entry['mtime'] = state['mtime']
+            self.changed   = True
+            return True
+
+        # Remember the state for a successful conversion:
+        self.pending[path] = state
+        return False
+
+    # Return True if the output file was generated from the selected source
+    # file with the same contents and still exists, which makes writing it
+    # again unnecessary:
+    def is_unchanged(self, source_file: str, output: str, digest: str) -> bool:
+        entry = self.entries.get(os.path.abspath(source_file))
+        if not entry or entry.get('digests', {}).get(output) != digest:
+            return False
+        return os.path.exists(os.path.join(self.directory, output))
+
+    # Record a successful conversion of the selected source file and the
+    # digests of the contents of its outputs if supplied; return the outputs
+    # of the previous conversion that are no longer generated from any
+    # source file and can be removed:
+    def update(self, source_file: str, outputs: list[str], digests: dict[str, str] | None = None) -> list[str]:
+        path  = os.path.abspath(source_file)
+        state = self.pending.pop(path, None)
+
+        if state is None:
+            return []
+
+        # Compare the outputs with the previous conversion:
+        current  = set(outputs)
+        removed  = [output for output in self.entries.get(path, {}).get('outputs', []) if output not in current]
+
+        # Record the conversion:
+        self.entries[path] = {**state, 'outputs': outputs}
+        if digests is not None:
+            self.entries[path]['digests'] = {output: digests[output] for output in outputs if output in digests}
+        self.changed = True
+
+        # Keep the outputs that other source files still generate:
+        if removed:
+            others  = {output for other, entry in self.entries.items() if other != path for output in entry['outputs']}
+            removed = [output for output in removed if output not in others]
+
+        return removed
+
+    # Write the manifest to the target directory if it changed:
+    def save(self) -> None:
+        if not self.changed:
+            return
+
+        # Write the manifest atomically:
+        data = {'fingerprint': self.fingerprint, 'options': self.options, 'files': self.entries}
+        temporary = f'{self.path}.{os.getpid()}.tmp'
+        with open(temporary, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+        # Mark the manifest as saved:
+        self.changed = False
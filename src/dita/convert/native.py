@@ -0,0 +1,887 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+from threading import local
+
+from . import transform
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+    from typing import Any, BinaryIO
+    from lxml import etree
+
+# Define which symbols are to be exported:
+__all__ = [
+    'ResultTree', 'to_concept', 'to_reference', 'to_task',
+    'to_concept_generated', 'to_reference_generated', 'to_single_topic',
+    'to_single_map', 'TRANSFORMERS'
+]
+
+# The attributes copied by the universal-attributes template:
+UNIVERSAL_ATTRIBUTES = frozenset([
+    'id', 'props', 'base', 'platform', 'product', 'audience', 'otherprops',
+    'deliveryTarget', 'importance', 'rev', 'status', 'translate',
+    '{http://www.w3.org/XML/1998/namespace}lang', 'dir',
+])
+
+# The valid children of the cmd element:
+CMD_CHILDREN = frozenset('''
+    abbreviated-form apiname b boolean cite cmdname codeph data data-about
+    draft-comment equation-inline filepath fn foreign i image indexterm
+    indextermref keyword line-through markupname mathml menucascade msgnum
+    msgph numcharref option overline parameterentity parmname ph q
+    required-cleanup sort-as state sub sup svg-container synph systemoutput
+    term text textentity tm tt u uicontrol unknown userinput varname
+    wintitle xmlatt xmlelement xmlnsname xmlpi xref
+'''.split())
+
+# The elements whose whitespace-only text nodes the xsl:preserve-space
+# declarations of the stylesheets keep:
+PRESERVE_SPACE = frozenset(['codeblock', 'pre', 'screen'])
+
+# Detect the documents that the native task conversion leaves to the XSLT
+# stylesheet because of markup whose copies the stylesheet serializes
+# differently; the namespace axis of every element includes the xml
+# namespace, and the predicate is applied in the location step because
+# libxml2 evaluates it considerably faster there:
+TASK_FALLBACK = '//section or //@xml:space or /descendant::*/namespace::*[2]'
+
+# Detect the documents that the native conversions of generated topics
+# leave to the XSLT stylesheets: nested sections, which the stylesheets
+# report and remove, and the same markup as for tasks; the descendant axis
+# avoids the costlier expansion of the // abbreviation in libxml2:
+GENERATED_FALLBACK = '/descendant::section/section or //@xml:space or /descendant::*/namespace::*[2]'
+
+# Detect the Additional resources sections, which the stylesheet for
+# generated concepts merges with the related links:
+CONCEPT_FALLBACK = f"{GENERATED_FALLBACK} or /descendant::section[title='Additional resources']"
+
+# Select the titles of the Additional resources lists in generated topics:
+RELATED_LINKS_TITLES = "/descendant::p[@outputclass='title'][b='Additional resources']"
+
+# Detect the documents that the native conversions to concepts, references,
+# and a topic with nested topics leave to the XSLT stylesheets because of
+# markup whose copies the stylesheets serialize differently:
+COPY_FALLBACK = '//@xml:space or /descendant::*/namespace::*[2]'
+
+# A warning reported by a native conversion; it provides the same message
+# attribute as the entries of an XSLT error log:
+class LogEntry:
+    def __init__(self, message: str) -> None:
+        self.message = message
+
+    # Describe the entry:
+    def __repr__(self) -> str:
+        return f'<LogEntry message={self.message!r}>'
+
+# The warnings of a conversion; like the XSLT error log, it provides the
+# last entry as the last_error attribute:
+class ErrorLog(list):
+    @property
+    def last_error(self) -> Any:
+        return self[-1] if self else None
+
+# A document converted in place; it is serialized exactly as the result of
+# the corresponding XSLT stylesheet and otherwise behaves as the tree:
+class ResultTree:
+    def __init__(self, tree: etree._ElementTree) -> None:
+        # The converted document with the DOCTYPE declaration of the target
+        # content type:
+        self.tree = tree
+
+    # Delegate everything else, for example xpath(), to the tree:
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.tree, name)
+
+    # Serialize the document without the XML declaration one top-level node
+    # at a time; the nodes are separated the same way as in
+    # xsltSaveResultTo():
+    def chunks(self) -> Iterator[bytes | memoryview]:
+        from lxml import etree
+
+        # Collect the top-level nodes in document order:
+        root  = self.tree.getroot()
+        nodes = [*reversed(list(root.itersiblings(preceding=True))), root, *root.itersiblings()]
+
+        # Serialize each node; lxml ends pretty-printed output with a newline
+        # that libxslt only writes after comments followed by another node,
+        # which is left out without copying the serialized node:
+        yield self.tree.docinfo.doctype.encode('utf-8') + b'\n'  # type: ignore[attr-defined]
+        for node in nodes:
+            yield memoryview(etree.tostring(node, encoding='utf-8', pretty_print=True, with_tail=False))[:-1]
+            if node.tag is etree.Comment and node.getnext() is not None:
+                yield b'\n'
+        yield b'\n'
+
+    # Serialize the document without the XML declaration:
+    def serialize(self) -> bytes:
+        return b''.join(self.chunks())
+
+    # Write the document as UTF-8 encoded XML to the supplied binary file
+    # without composing the whole serialized document first:
+    def write_output(self, f: BinaryIO) -> None:
+        f.write(b'<?xml version="1.0" encoding="utf-8"?>\n')
+        for chunk in self.chunks():
+            f.write(chunk)
+
+    # Serialize the document as UTF-8 encoded XML:
+    def __bytes__(self) -> bytes:
+        return b'<?xml version="1.0" encoding="utf-8"?>\n' + self.serialize()
+
+    # Serialize the document as a string, which omits the encoding:
+    def __str__(self) -> str:
+        return '<?xml version="1.0"?>\n' + self.serialize().decode('utf-8')
+
+# A transformer that converts supported documents by rewriting the parsed
+# tree in place and leaves all other documents to the XSLT stylesheet; the
+# supplied document becomes part of the result and must not be reused:
+class NativeTransformer:
+    def __init__(self, convert: Callable[[etree._ElementTree, list[str]], bool], public_id: str, system_url: str, fallback: transform.Transformer) -> None:
+        # The function that converts the document in place, or returns
+        # False without modifying it if it is not supported:
+        self.convert = convert
+
+        # The public identifier and system URL from the xsl:output element:
+        self.public_id  = public_id
+        self.system_url = system_url
+
+        # The XSLT transformer for unsupported documents:
+        self.fallback = fallback
+
+        # The warnings of the last conversion in each thread:
+        self._local = local()
+
+    # Expose the warnings of the last conversion in this thread:
+    @property
+    def error_log(self) -> ErrorLog:
+        return getattr(self._local, 'error_log', None) or ErrorLog()
+
+    # Run the conversion:
+    def __call__(self, source_xml: etree._ElementTree) -> Any:
+        from lxml import etree
+
+        # Convert the document in place if possible:
+        messages: list[str] = []
+        if isinstance(source_xml, etree._ElementTree) and self.convert(source_xml, messages):
+            self._local.error_log = ErrorLog(LogEntry(message) for message in messages)
+            source_xml.docinfo.public_id  = self.public_id
+            source_xml.docinfo.system_url = self.system_url  # type: ignore[attr-defined]
+            return ResultTree(source_xml)
+
+        # Use the XSLT stylesheet otherwise:
+        try:
+            return self.fallback(source_xml)
+        finally:
+            self._local.error_log = ErrorLog(self.fallback.error_log)
+
+# The compiled XPath expressions of each thread; a compiled expression
+# evaluates one document at a time and avoids the cost of setting up a
+# new evaluator for each converted document:
+_local = local()
+
+# Evaluate the XPath expression on the document or element:
+def evaluate(tree: etree._ElementTree | etree._Element, expression: str) -> Any:
+    xpaths: dict[str, etree.XPath] | None = getattr(_local, 'xpath', None)
+    if xpaths is None:
+        xpaths = _local.xpath = {}
+
+    # Compile the expression if it has not been compiled yet:
+    xpath = xpaths.get(expression)
+    if xpath is None:
+        from lxml import etree
+        xpath = xpaths[expression] = etree.XPath(expression)
+
+    # Evaluate the expression:
+    return xpath(tree)
+
+# Remove the whitespace-only text nodes the same way as the stylesheets;
+# the tree is walked in Python because the text() node test with a
+# predicate takes quadratic time in libxml2:
+def strip_space(tree: etree._ElementTree) -> None:
+    for node in tree.getroot().iter():
+        if (text := node.text) is not None and isinstance(node.tag, str) and node.tag not in PRESERVE_SPACE and not text.strip():
+            node.text = None
+        if (text := node.tail) is not None and not text.strip() and node.getparent().tag not in PRESERVE_SPACE:  # type: ignore[union-attr]
+            node.tail = None
+
+# Keep only the attributes from the universal attribute group:
+def keep_universal_attributes(element: etree._Element) -> None:
+    for name in element.keys():
+        if name not in UNIVERSAL_ATTRIBUTES:
+            del element.attrib[name]
+
+# Remove the node from its parent, keeping the text that follows it:
+def remove_node(node: etree._Element) -> None:
+    parent = node.getparent()
+    if node.tail:
+        previous = node.getprevious()
+        if previous is not None:
+            previous.tail = (previous.tail or '') + node.tail
+        else:
+            parent.text = (parent.text or '') + node.tail  # type: ignore[union-attr]
+    parent.remove(node)  # type: ignore[union-attr]
+
+# Remove the comments and processing instructions from the element and
+# return the list of its child elements:
+def drop_comments(element: etree._Element) -> list[etree._Element]:
+    children = list(element)
+    others   = [child for child in children if not isinstance(child.tag, str)]
+    if not others:
+        return children
+    for node in others:
+        remove_node(node)
+    return [child for child in children if isinstance(child.tag, str)]
+
+# Wrap the selected sibling elements in a new element placed at the position
+# of the first of them:
+def wrap_elements(name: str, elements: list[etree._Element]) -> etree._Element | None:
+    if not elements:
+        return None
+
+    wrapper = elements[0].makeelement(name)
+    elements[0].addprevious(wrapper)
+    wrapper.extend(elements)
+    return wrapper
+
+# Compose the steps or substeps element from an ordered list:
+def convert_list(element: etree._Element, name: str, item_type: str) -> None:
+    element.tag = name
+    keep_universal_attributes(element)
+
+    # Only list items are preserved:
+    element.text = None
+    for child in list(element):
+        if child.tag == 'li':
+            child.tail = None
+            convert_step(child, item_type)
+        else:
+            element.remove(child)
+
+# Compose the stepxmp element from an example; return False if it has no
+# contents other than the title:
+def convert_stepxmp(element: etree._Element) -> bool:
+    for child in drop_comments(element):
+        if child.tag == 'title':
+            remove_node(child)
+    if not element.text and not len(element):
+        return False
+
+    element.tag = 'stepxmp'
+    keep_universal_attributes(element)
+    return True
+
+# Compose alternating info/substeps/stepxmp elements from the selected
+# children of a step or substep:
+def convert_info(element: etree._Element, item_type: str, children: list[etree._Element]) -> None:
+    info: etree._Element | None = None
+
+    for child in children:
+        # Collect ordinary content in the current info element:
+        if not (child.tag == 'example' or (child.tag == 'ol' and item_type == 'step')):
+            if info is None:
+                info = element.makeelement('info')
+                child.addprevious(info)
+            info.append(child)
+            continue
+
+        # The text that follows the substeps or example starts a new info
+        # element:
+        info = None
+        if child.tail:
+            info = element.makeelement('info')
+            info.text, child.tail = child.tail, None
+            child.addnext(info)
+
+        # Compose the substeps or stepxmp element:
+        if child.tag == 'ol':
+            convert_list(child, 'substeps', 'substep')
+        elif not convert_stepxmp(child):
+            element.remove(child)
+
+# Compose the step/substep element from a list item:
+def convert_step(element: etree._Element, item_type: str) -> None:
+    element.tag = item_type
+    keep_universal_attributes(element)
+
+    # Locate the first child that is not a valid cmd child:
+    children = drop_comments(element)
+    position = next((index for index, child in enumerate(children) if child.tag not in CMD_CHILDREN), len(children))
+    has_text = bool(element.text) or any(child.tail for child in children)
+
+    if has_text or 0 < position < len(children) or not children:
+        # Move the leading text and cmd children to the cmd element:
+        cmd = element.makeelement('cmd')
+        cmd.text, element.text = element.text, None
+        cmd.extend(children[:position])
+        if cmd.text or len(cmd):
+            element.insert(0, cmd)
+    elif position == 0:
+        # Use the contents of the first child as the command:
+        first = children[0]
+        drop_comments(first)
+        if first.text or len(first):
+            first.tag = 'cmd'
+            keep_universal_attributes(first)
+        else:
+            element.remove(first)
+        position = 1
+    else:
+        # Use all child elements and the attributes of the list item:
+        cmd = element.makeelement('cmd')
+        cmd.attrib.update(element.attrib)
+        cmd.extend(children)
+        element.append(cmd)
+
+    # Wrap the remaining contents:
+    convert_info(element, item_type, children[position:])
+
+# Compose the taskbody element from a body:
+def convert_taskbody(element: etree._Element, messages: list[str]) -> None:
+    # Only child elements are preserved:
+    children = drop_comments(element)
+    element.text = None
+    for child in children:
+        child.tail = None
+
+    # Divide the body at the steps and the example, which follows them:
+    steps   = next((child for child in children if child.tag == 'ol'), None)
+    example = next((child for child in children if child.tag == 'example'), None)
+    start   = children.index(steps) if steps is not None else len(children)
+    end     = children.index(example) if example is not None else len(children)
+
+    # Replace the body with the taskbody element:
+    element.tag = 'taskbody'
+    element.attrib.clear()
+    wrap_elements('context', children[:min(start, end)])
+
+    if steps is not None:
+        if steps.find('.//example/title') is not None:
+            messages.append('WARNING: Title found in stepxmp, skipping...')
+        convert_list(steps, 'steps', 'step')
+        wrap_elements('result', children[start + 1:end])
+
+    # The example keeps all attributes but only its child elements:
+    if example is not None:
+        example.text = None
+        for child in drop_comments(example):
+            child.tail = None
+        if not len(example) and not example.attrib:
+            element.remove(example)
+        wrap_elements('postreq', children[end + 1:])
+
+# Return False for the elements that make the stylesheet report an error
+# and for the bodies whose content the stylesheet duplicates or processes
+# out of document order:
+def supported_element(element: etree._Element) -> bool:
+    # A definition term must be followed by a description:
+    if element.tag == 'dt':
+        return next(element.itersiblings('dd'), None) is not None
+
+    # A body must not be nested and must have at most one example, which
+    # must not precede the steps:
+    examples = element.findall('example')
+    steps    = element.find('ol')
+    if len(examples) > 1 or next(element.iterancestors('body'), None) is not None:
+        return False
+    return not (examples and steps is not None and next(steps.itersiblings('example'), None) is None)
+
+# Convert a generic DITA topic to a DITA task in place; return False if
+# the document is left to the XSLT stylesheet:
+def convert_task(tree: etree._ElementTree, messages: list[str]) -> bool:
+    from lxml import etree
+
+    # Verify that the document is supported before modifying it:
+    root = tree.getroot()
+    if root.tag != 'topic' or evaluate(tree, TASK_FALLBACK) or next(root.iter(etree.Entity), None) is not None:
+        return False
+    for element in root.iter('body', 'dt'):
+        if not supported_element(element):
+            return False
+
+    # Convert the document:
+    strip_space(tree)
+    root.tag = 'task'
+    for body in list(root.iter('body')):
+        convert_taskbody(body, messages)
+
+    return True
+
+# Return True if the element is an abstract paragraph:
+def is_abstract(element: etree._Element) -> bool:
+    return element.tag == 'p' and element.get('outputclass') == 'abstract'
+
+# Compose the shortdesc element from the first abstract paragraph of the
+# body and place it in front of the body:
+def convert_shortdesc(body: etree._Element) -> None:
+    abstract = next((child for child in body if is_abstract(child)), None)
+    if abstract is None:
+        return
+
+    drop_comments(abstract)
+    if not abstract.text and not len(abstract):
+        body.remove(abstract)
+        return
+
+    abstract.tag  = 'shortdesc'
+    abstract.tail = None
+    keep_universal_attributes(abstract)
+    body.addprevious(abstract)
+
+# Compose the related-links element in place from the first list that
+# follows the Additional resources title; return None if there are no
+# elements after the title:
+def convert_related_links(elements: list[etree._Element], messages: list[str]) -> etree._Element | None:
+    from lxml import etree
+
+    if not elements:
+        return None
+
+    # Report the content that is not converted:
+    lists = [element for element in elements if element.tag == 'ul']
+    if len(lists) != len(elements):
+        messages.append('WARNING: Non-list elements found in related links, skipping...')
+    if len(lists) > 1:
+        messages.append('WARNING: Extra list elements found in related-links, skipping...')
+    if not lists:
+        messages.append('WARNING: No list elements found in related links')
+        return etree.Element('related-links')
+
+    # The list keeps only its universal attributes:
+    related = lists[0]
+    related.tag  = 'related-links'
+    related.text = None
+    keep_universal_attributes(related)
+
+    # Compose a link from each list item with a cross reference:
+    for item in list(related):
+        if item.tag != 'li':
+            related.remove(item)
+            continue
+
+        # Report the content other than a single cross reference:
+        children = list(item)
+        xrefs    = [child for child in children if child.tag == 'xref']
+        if not xrefs or item.text or sum(isinstance(child.tag, str) for child in children) > 1 or any(child.tail for child in children):
+            messages.append('WARNING: Unexpected content found in related-links, skipping...')
+        if not xrefs:
+            related.remove(item)
+            continue
+
+        # The first cross reference becomes the link; it takes the
+        # attributes of all cross references and their text:
+        link  = xrefs[0]
+        texts = []
+        for xref in xrefs:
+            if xref is not link:
+                link.attrib.update(xref.attrib)
+            texts.append(xref.text)
+            texts.extend(child.tail for child in xref)
+
+        link.tag  = 'link'
+        link.text = link.tail = None
+        if len(link):
+            link[:] = []
+        if text := ''.join(filter(None, texts)):
+            etree.SubElement(link, 'linktext').text = text
+        related.replace(item, link)
+
+    return related
+
+# Return False for the bodies of generated concepts that the native
+# conversion does not handle:
+def supported_conbody(body: etree._Element, title: etree._Element | None) -> bool:
+    # The abstract must precede the Additional resources title:
+    children = [child for child in body if isinstance(child.tag, str)]
+    index    = children.index(title) if title is not None else len(children)
+    return not any(is_abstract(child) for child in children[index:])
+
+# Compose the conbody element from the body of a generated concept and
+# return the related-links element:
+def convert_conbody(body: etree._Element, title: etree._Element | None, messages: list[str]) -> etree._Element | None:
+    # Only child elements up to the Additional resources title are
+    # preserved; the elements that follow it are related links:
+    children = drop_comments(body)
+    body.text = None
+    for child in children:
+        child.tail = None
+
+    index   = children.index(title) if title is not None else len(children)
+    related = convert_related_links(children[index + 1:], messages)
+    for child in children[index:]:
+        body.remove(child)
+
+    # Compose the shortdesc and conbody elements:
+    convert_shortdesc(body)
+    body.tag = 'conbody'
+    return related
+
+# Return True if the element contains no text other than whitespace and
+# no comments or processing instructions:
+def has_only_elements(element: etree._Element) -> bool:
+    if element.text and element.text.strip():
+        return False
+    return all(isinstance(child.tag, str) and not (child.tail and child.tail.strip()) for child in element)
+
+# Return False for the bodies of generated references that the native
+# conversion does not handle:
+def supported_refbody(body: etree._Element, title: etree._Element | None) -> bool:
+    # The body must not contain text, comments, or processing instructions:
+    if not has_only_elements(body):
+        return False
+
+    # Abstracts must precede the Additional resources title and examples
+    # and sections, which in turn must precede the title:
+    children   = list(body)
+    index      = children.index(title) if title is not None else len(children)
+    separators = [position for position, child in enumerate(children) if child.tag in ('example', 'section')]
+    if any(is_abstract(child) for child in children[min([index, *separators]):]):
+        return False
+    return not separators or separators[-1] < index
+
+# Compose the refbody element from the body by dividing the supplied child
+# elements into sections at the examples and sections; the attributes of
+# the body are only preserved if there are no separators:
+def compose_refbody(body: etree._Element, contents: list[etree._Element]) -> None:
+    separators = [position for position, child in enumerate(contents) if child.tag in ('example', 'section')]
+    runs       = [contents[start + 1:end] for start, end in zip([-1, *separators], [*separators, len(contents)])]
+
+    section: etree._Element | None
+    body.tag = 'refbody'
+    if not separators and body.attrib and not contents:
+        section = body.makeelement('section')
+        body.append(section)
+    else:
+        section = wrap_elements('section', runs[0])
+
+    if section is not None and not separators:
+        section.attrib.update(body.attrib)
+    body.attrib.clear()
+
+    for run in runs[1:]:
+        wrap_elements('section', run)
+
+# Compose the refbody element from the body of a generated reference and
+# return the related-links element:
+def convert_refbody(body: etree._Element, title: etree._Element | None, messages: list[str]) -> etree._Element | None:
+    children = list(body)
+    for child in children:
+        child.tail = None
+    body.text = None
+
+    # Report and remove the extra abstracts:
+    abstracts = [child for child in children if is_abstract(child)]
+    contents  = [child for child in children if not is_abstract(child)]
+    if len(abstracts) > 1:
+        messages.append('WARNING: Extra short description found, skipping...')
+
+    index   = children.index(title) if title is not None else len(children)
+    related = convert_related_links(children[index + 1:], messages)
+    convert_shortdesc(body)
+    for abstract in abstracts[1:]:
+        body.remove(abstract)
+
+    # Compose the refbody element:
+    compose_refbody(body, contents)
+
+    # Remove the Additional resources title and the related links, which
+    # leaves the section they were in empty:
+    for child in children[index:]:
+        child.getparent().remove(child)  # type: ignore[union-attr]
+
+    return related
+
+# Convert a generated topic to a concept or reference in place; return
+# False if the document is left to the XSLT stylesheet:
+def convert_generated(tree: etree._ElementTree, messages: list[str], name: str, fallback: str, supported_body: Callable[[etree._Element, etree._Element | None], bool], convert_body: Callable[[etree._Element, etree._Element | None, list[str]], etree._Element | None]) -> bool:
+    from lxml import etree
+
+    # Verify that the document is supported before modifying it:
+    root = tree.getroot()
+    if root.tag != 'topic' or evaluate(tree, fallback) or next(root.iter(etree.Entity), None) is not None:
+        return False
+    for element in root.iter('dt'):
+        if not supported_element(element):
+            return False
+
+    # The document must have at most one body, and the Additional resources
+    # titles must be its children:
+    bodies = list(root.iter('body'))
+    titles: list[etree._Element] = evaluate(tree, RELATED_LINKS_TITLES)
+    if len(bodies) > 1 or any(body.getparent() is not root for body in bodies):
+        return False
+    if any(title.getparent() is not bodies[0] for title in titles):
+        return False
+    if bodies and not supported_body(bodies[0], titles[0] if titles else None):
+        return False
+
+    # Convert the document:
+    strip_space(tree)
+    root.tag = name
+    if 'outputclass' in root.attrib:
+        del root.attrib['outputclass']
+
+    if bodies:
+        body = bodies[0]
+        tail, body.tail = body.tail, None
+        related = convert_body(body, titles[0] if titles else None, messages)
+
+        # Place the related links after the body, followed by the text that
+        # followed the body:
+        if related is not None:
+            body.addnext(related)
+            related.tail = tail
+        else:
+            body.tail = tail
+
+    # Sections keep all attributes but only their child elements:
+    if name == 'concept':
+        for section in root.iter('section'):
+            section.text = None
+            for child in drop_comments(section):
+                child.tail = None
+
+    return True
+
+# Convert a generated DITA topic to a DITA concept in place:
+def convert_concept_generated(tree: etree._ElementTree, messages: list[str]) -> bool:
+    return convert_generated(tree, messages, 'concept', CONCEPT_FALLBACK, supported_conbody, convert_conbody)
+
+# Convert a generated DITA topic to a DITA reference in place:
+def convert_reference_generated(tree: etree._ElementTree, messages: list[str]) -> bool:
+    return convert_generated(tree, messages, 'reference', GENERATED_FALLBACK, supported_refbody, convert_refbody)
+
+# Return False for the generic topics that the native conversions to
+# concepts and references leave to the XSLT stylesheets:
+def supported_topic(tree: etree._ElementTree) -> bool:
+    from lxml import etree
+
+    root = tree.getroot()
+    if root.tag != 'topic' or evaluate(tree, COPY_FALLBACK) or next(root.iter(etree.Entity), None) is not None:
+        return False
+    return all(supported_element(element) for element in root.iter('dt'))
+
+# Convert a generic DITA topic to a DITA concept in place; return False if
+# the document is left to the XSLT stylesheet:
+def convert_concept(tree: etree._ElementTree, messages: list[str]) -> bool:
+    if not supported_topic(tree):
+        return False
+
+    # Convert the document; the stylesheet renames every body element:
+    strip_space(tree)
+    root = tree.getroot()
+    root.tag = 'concept'
+    for body in list(root.iter('body')):
+        body.tag = 'conbody'
+
+    return True
+
+# Convert a generic DITA topic to a DITA reference in place; return False
+# if the document is left to the XSLT stylesheet:
+def convert_reference(tree: etree._ElementTree, messages: list[str]) -> bool:
+    if not supported_topic(tree):
+        return False
+
+    # The bodies must not be nested and must contain only elements, which
+    # the stylesheet otherwise processes out of document order:
+    root   = tree.getroot()
+    bodies = list(root.iter('body'))
+    for body in bodies:
+        if not has_only_elements(body) or next(body.iterancestors('body'), None) is not None:
+            return False
+
+    # Convert the document:
+    strip_space(tree)
+    root.tag = 'reference'
+    for body in bodies:
+        compose_refbody(body, list(body))
+
+    return True
+
+# Compose a topic from the section in place; the section keeps its
+# attributes and title, the elements that precede the first nested section
+# form the body, and the nested sections are returned. The nested sections
+# stay in place because moving an element walks all of its descendants:
+def convert_section(section: etree._Element) -> list[etree._Element]:
+    # Only child elements are preserved:
+    children = [child for child in section if isinstance(child.tag, str)]
+    nested   = [child for child in children if child.tag == 'section']
+    index    = children.index(nested[0]) if nested else len(children)
+    title    = next((child for child in children if child.tag == 'title'), None)
+
+    # Remove the nodes that follow the first nested section, except for
+    # the sections and the title:
+    for child in [child for child in section if not isinstance(child.tag, str)]:
+        section.remove(child)
+    for child in children[index:]:
+        if child.tag not in ('section', 'title'):
+            section.remove(child)
+
+    # The title keeps its text and child elements:
+    if title is None:
+        title = section.makeelement('title')
+    else:
+        drop_comments(title)
+    section.insert(0, title)
+
+    # Compose the body from the elements before the first nested section:
+    body = section.makeelement('body')
+    body.extend(child for child in children[:index] if child.tag != 'title')
+    title.addnext(body)
+
+    # Replace the section with the topic:
+    section.tag  = 'topic'
+    section.text = None
+    for child in (title, *body, *nested):
+        child.tail = None
+
+    return nested
+
+# Convert a DITA topic to a topic with nested topics in place; each section
+# of the body becomes a nested topic:
+def convert_single_topic(tree: etree._ElementTree, messages: list[str]) -> bool:
+    from lxml import etree
+
+    # Verify that the document is supported before modifying it; sections
+    # with more than one title have their titles merged:
+    root   = tree.getroot()
+    bodies = [child for child in root if child.tag == 'body']
+    if root.tag != 'topic' or len(bodies) > 1 or evaluate(tree, COPY_FALLBACK) or next(root.iter(etree.Entity), None) is not None:
+        return False
+    for section in root.iter('section'):
+        if len(section.findall('title')) > 1:
+            return False
+
+    # Only the elements that precede the body are preserved:
+    strip_space(tree)
+    children  = [child for child in root if isinstance(child.tag, str)]
+    index     = children.index(bodies[0]) if bodies else 0
+    sections  = [child for child in bodies[0] if child.tag == 'section'] if bodies else []
+    preceding = children[:index]
+
+    # The body is preserved only if elements precede its first section:
+    if sections:
+        contents = [child for child in bodies[0] if isinstance(child.tag, str)]
+        leading  = contents[:contents.index(sections[0])]
+        if leading:
+            bodies[0][:]   = leading
+            bodies[0].text = None
+            preceding.append(bodies[0])
+            for child in leading:
+                child.tail = None
+
+    # Replace the contents of the root element:
+    root.text = None
+    root[:]   = [*preceding, *sections]
+    for child in root:
+        child.tail = None
+
+    # Convert the sections to nested topics:
+    while sections:
+        sections = [nested for section in sections for nested in convert_section(section)]
+
+    return True
+
+# Compose a topic reference from the topic in place; the topic keeps only
+# the topics nested directly in it:
+def convert_topicref(topic: etree._Element) -> list[etree._Element]:
+    # Compose the target file name and the content type:
+    href        = f"{topic.get('id', '')}.dita"
+    outputclass = topic.get('outputclass')
+    if outputclass is not None and f'|{outputclass}|' in '|concept|reference|task|':
+        content_type = outputclass
+    else:
+        content_type = 'task' if outputclass == 'procedure' else 'concept'
+
+    # Remove all other content; each removed node is visited only once:
+    nested = []
+    for child in list(topic):
+        if child.tag == 'topic':
+            child.tail = None
+            nested.append(child)
+        else:
+            topic.remove(child)
+
+    # Replace the topic with the topic reference:
+    topic.tag  = 'topicref'
+    topic.text = None
+    topic.attrib.clear()
+    topic.set('href', href)
+    topic.set('type', content_type)
+
+    return nested
+
+# Convert a topic with nested topics to a DITA map in place; return False
+# if the document is left to the XSLT stylesheet:
+def convert_single_map(tree: etree._ElementTree, messages: list[str]) -> bool:
+    # Verify that the document is supported before modifying it; the
+    # stylesheet omits the nodes outside of the root element and namespace
+    # declarations, which would remain on the renamed elements:
+    root = tree.getroot()
+    if root.tag != 'topic' or root.getprevious() is not None or root.getnext() is not None:
+        return False
+    if any(topic.nsmap for topic in root.iter('topic')):
+        return False
+
+    # Move the contents of the root topic to a topic reference, which
+    # becomes the only child of the map:
+    topicref = root.makeelement('topicref')
+    topicref.attrib.update(root.attrib)
+    topicref.extend(child for child in root if child.tag == 'topic')
+    root[:]   = [topicref]
+    root.tag  = 'map'
+    root.text = None
+    root.attrib.clear()
+
+    # Convert the nested topics to topic references:
+    topics = [topicref]
+    while topics:
+        topics = [nested for topic in topics for nested in convert_topicref(topic)]
+
+    return True
+
+# Expose the native transformers:
+to_concept             = NativeTransformer(convert_concept, '-//OASIS//DTD DITA Concept//EN', 'concept.dtd', transform.to_concept)
+to_reference           = NativeTransformer(convert_reference, '-//OASIS//DTD DITA Reference//EN', 'reference.dtd', transform.to_reference)
+to_task                = NativeTransformer(convert_task, '-//OASIS//DTD DITA Task//EN', 'task.dtd', transform.to_task)
+to_concept_generated   = NativeTransformer(convert_concept_generated, '-//OASIS//DTD DITA Concept//EN', 'concept.dtd', transform.to_concept_generated)
+to_reference_generated = NativeTransformer(convert_reference_generated, '-//OASIS//DTD DITA Reference//EN', 'reference.dtd', transform.to_reference_generated)
+to_single_topic        = NativeTransformer(convert_single_topic, '-//OASIS//DTD DITA Topic//EN', 'topic.dtd', transform.to_single_topic)
+to_single_map          = NativeTransformer(convert_single_map, '-//OASIS//DTD DITA Map//EN', 'map.dtd', transform.to_single_map)
+
+# Map the target content types to the native transformers; the keys match
+# the generated and target_type arguments of cli.convert():
+TRANSFORMERS = {
+    (False, 'concept'):      to_concept,
+    (False, 'reference'):    to_reference,
+    (False, 'task'):         to_task,
+    (True, 'concept'):       to_concept_generated,
+    (True, 'reference'):     to_reference_generated,
+    (False, 'single_topic'): to_single_topic,
+    (True, 'single_topic'):  to_single_topic,
+    (False, 'single_map'):   to_single_map,
+    (True, 'single_map'):    to_single_map,
+}
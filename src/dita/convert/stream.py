@@ -0,0 +1,324 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+    from lxml import etree
+
+# Define which symbols are to be exported:
+__all__ = ['split_stream']
+
+# The attributes that make the native splitter leave the document to the
+# XSLT stylesheet:
+SPACE_FALLBACK = 'descendant-or-self::*/@xml:space'
+
+# A topic composed from the root element or a section while the file is
+# being parsed:
+class Topic:
+    def __init__(self, element: etree._Element, outline: etree._Element, position: str) -> None:
+        # The root element or section in the parsed document:
+        self.element = element
+
+        # The element of the outline that the DITA map is generated from:
+        self.outline = outline
+
+        # The position of the topic, which the generated ID is derived from:
+        self.position = position
+
+        # The title of the section once it has been parsed:
+        self.title: etree._Element | None = None
+
+        # Whether a nested section has started, which completes the body:
+        self.nested = False
+
+        # The elements that precede the first nested section:
+        self.body: list[etree._Element] | None = None
+
+        # Whether the topic has been converted:
+        self.done = False
+
+# Return True if the selected file can be split while it is parsed; this
+# excludes files that are not well formed and the documents that the
+# native engine leaves to the XSLT stylesheet or that contain topics
+# other than the root element. Each section is checked and released as
+# soon as it is complete, which keeps the memory bounded the same way as
+# the split itself:
+def is_supported(input_file: str) -> bool:
+    from lxml import etree
+    from .native import evaluate
+
+    try:
+        for event, element in etree.iterparse(input_file, events=('end', 'start-ns'), tag=('topic', 'body', 'section')):
+            # Namespace declarations are not supported:
+            if event == 'start-ns':
+                return False
+
+            # The root element must be the only topic and must have at
+            # most one body:
+            parent = element.getparent()
+            if (parent is None) != (element.tag == 'topic'):
+                return False
+            if element.tag == 'body':
+                continue
+            if parent is None and len(element.findall('body')) > 1:
+                return False
+
+            # Sections must have at most one title:
+            if element.tag == 'section' and len(element.findall('title')) > 1:
+                return False
+
+            # Check the contents that have not been released yet:
+            if evaluate(element, SPACE_FALLBACK) or next(element.iter(etree.Entity), None) is not None:
+                return False
+
+            # Release the section, keeping an empty element in its place
+            # so that the checks of its parent are not affected:
+            element.clear(keep_tail=True)
+    except (etree.XMLSyntaxError, OSError):
+        return False
+
+    return True
+
+# Start a topic for the root element or section and ensure that it has a
+# valid outputclass in the outline; the ID is generated from the title,
+# which is only available once the topic is converted:
+def start_topic(element: etree._Element, parent: Topic | None) -> Topic:
+    from lxml import etree
+    from .cli import fix_element_outputclass
+
+    # Copy the attributes the DITA map is generated from to the outline,
+    # where the outputclass of snippets is taken from the parent topic:
+    outline = etree.Element('topic') if parent is None else etree.SubElement(parent.outline, 'topic')
+    for name in ('id', 'outputclass'):
+        if name in element.attrib:
+            outline.set(name, element.attrib[name])
+    fix_element_outputclass(outline)
+
+    # Record the position of the topic among the topics of its parent:
+    position = '' if parent is None else f'{parent.position}.{len(parent.outline)}'.lstrip('.')
+    return Topic(element, outline, position)
+
+# Return True if the children of the selected element are the contents of
+# the topic, which is the body for the root topic and the section itself
+# for nested topics:
+def in_topic(element: etree._Element, topic: Topic, is_root: bool) -> bool:
+    if not is_root:
+        return element is topic.element
+    return element.tag == 'body' and element.getparent() is topic.element
+
+# Return the child elements of the section other than its titles; the
+# parser builds the tree ahead of the reported events, which is why the
+# elements that precede the first nested section are selected by their
+# position rather than by the parsed children:
+def contents(element: etree._Element, nested: etree._Element | None = None) -> list[etree._Element]:
+    children = element if nested is None else reversed(list(nested.itersiblings(preceding=True)))
+    return [child for child in children if isinstance(child.tag, str) and child.tag != 'title']
+
+# Compose the root topic from the elements that precede the body and the
+# elements of the body that precede its first section:
+def compose_root(topic: Topic) -> etree._ElementTree:
+    from lxml import etree
+
+    root     = etree.Element('topic', topic.element.attrib)  # type: ignore[arg-type]
+    children = [child for child in topic.element if isinstance(child.tag, str)]
+    bodies   = [child for child in children if child.tag == 'body']
+
+    # The elements before the body are preserved only if there is a body:
+    if bodies:
+        contents = [child for child in bodies[0] if isinstance(child.tag, str)]
+        index    = next((index for index, child in enumerate(contents) if child.tag == 'section'), 0)
+        root.extend(children[:children.index(bodies[0])])
+
+        # The body is preserved only if elements precede its first section:
+        if index:
+            body = etree.SubElement(root, 'body', bodies[0].attrib)  # type: ignore[arg-type]
+            body.extend(contents[:index])
+            for child in body:
+                child.tail = None
+
+    for child in root:
+        child.tail = None
+    return etree.ElementTree(root)
+
+# Compose a topic from the section; the section keeps its attributes and
+# title and the elements that precede the first nested section form the
+# body:
+def compose_section(topic: Topic) -> etree._ElementTree:
+    from lxml import etree
+    from .native import drop_comments
+
+    root = etree.Element('topic', topic.element.attrib)  # type: ignore[arg-type]
+
+    # The title keeps its text and child elements:
+    if topic.title is None:
+        etree.SubElement(root, 'title')
+    else:
+        drop_comments(topic.title)
+        root.append(topic.title)
+
+    # Compose the body from the elements before the first nested section:
+    body = etree.SubElement(root, 'body')
+    body.extend(topic.body if topic.body is not None else contents(topic.element))
+
+    for child in (*root, *body):
+        child.tail = None
+    return etree.ElementTree(root)
+
+# Convert the topic and pass the result to the supplied function; return
+# the name of the generated file and whether it was converted and written:
+def convert_topic(input_file: Any, topic: Topic, generated: bool, write: Callable[[str, bytes], bool], messages: list[str] | None) -> tuple[str, bool]:
+    from lxml import etree
+    from .cli import convert, fix_element_id, topic_type, warn
+
+    # Compose the topic, which releases its contents from the parsed file:
+    xml = compose_section(topic) if topic.outline.getparent() is not None else compose_root(topic)
+    topic.done = True
+
+    # Ensure that the topic has a valid ID and outputclass and record the
+    # ID in the outline:
+    root = xml.getroot()
+    fix_element_id(root, input_file, topic.position)
+    root.set('outputclass', str(topic.outline.attrib['outputclass']))
+    topic.outline.set('id', str(root.attrib['id']))
+
+    # Compose the target file name:
+    element_id = str(root.attrib['id'])
+    file_name  = element_id + '.dita'
+
+    try:
+        # Convert the topic:
+        out = convert(f'{input_file} (id="{element_id}")', xml, topic_type(xml), generated, messages, engine='native')
+    except etree.XSLTApplyError as message:
+        # Report the error:
+        warn(f'error: {message}', f'{input_file} (id="{element_id}")', messages)
+        return file_name, False
+
+    # Write the converted topic:
+    return file_name, write(file_name, bytes(out))
+
+# Split the selected file into individual topics and a DITA map while it is
+# parsed, passing the name and contents of each generated file to the
+# supplied function as soon as the topic is complete; return the names of
+# the written files and whether all of them were converted and written.
+# Converted topics are released from the parsed document, which limits the
+# memory to the largest topic rather than the whole file; the files that
+# cannot be split this way, including standard input, are split in memory:
+def split_stream(input_file: Any, generated: bool, write: Callable[[str, bytes], bool], messages: list[str] | None = None) -> tuple[list[str], bool]:
+    from lxml import etree
+    from .cli import convert, split_file, warn
+
+    # Split the unsupported files in memory; the file is parsed twice,
+    # which requires a file name rather than standard input:
+    if not isinstance(input_file, str) or not is_supported(input_file):
+        files, success = split_file(input_file, None, generated, messages)
+        saved = [file_name for file_name, content in files if write(file_name, content)]
+        return saved, success and len(saved) == len(files)
+
+    # The topics of the open sections, from the root to the innermost:
+    stack: list[Topic] = []
+    outline: etree._Element | None = None
+
+    # Record the written files:
+    names: list[str] = []
+    success = True
+
+    try:
+        for event, element in etree.iterparse(input_file, events=('start', 'end'), tag=('topic', 'section', 'title')):
+            parent = element.getparent()
+
+            if event == 'start':
+                # Start the root topic:
+                if parent is None:
+                    stack.append(start_topic(element, None))
+                    outline = stack[0].outline
+                    continue
+
+                # Only the sections of the root body and of other sections
+                # become topics:
+                top = stack[-1]
+                if element.tag != 'section' or not in_topic(parent, top, len(stack) == 1):
+                    continue
+
+                # The first nested section completes the body of its parent,
+                # which is converted immediately unless the title of the
+                # section has not been parsed yet:
+                if not top.nested:
+                    top.nested = True
+                    top.body   = contents(top.element, element)
+                    if len(stack) == 1 or top.title is not None:
+                        file_name, written = convert_topic(input_file, top, generated, write, messages)
+                        names += [file_name] if written else []
+                        success &= written
+
+                stack.append(start_topic(element, top))
+                continue
+
+            # Record the title of the section:
+            top = stack[-1]
+            if element is not top.element:
+                if element.tag == 'title' and parent is top.element and len(stack) > 1 and top.title is None:
+                    top.title = element
+                continue
+
+            # Convert the topic once its section is complete:
+            stack.pop()
+            if not top.done:
+                file_name, written = convert_topic(input_file, top, generated, write, messages)
+                names += [file_name] if written else []
+                success &= written
+
+            # Release the section together with the preceding elements,
+            # which are not part of any topic once its parent has been
+            # converted:
+            if parent is not None:
+                if stack[-1].done:
+                    for sibling in list(element.itersiblings(preceding=True)):
+                        parent.remove(sibling)
+                parent.remove(element)
+    except etree.XMLSyntaxError as message:
+        # Report the error:
+        warn(str(message), input_file, messages)
+        return names, False
+
+    # Compose the target file name of the DITA map:
+    map_xml   = etree.ElementTree(outline)  # type: ignore[arg-type]
+    file_name = str(map_xml.getroot().attrib['id']) + '.ditamap'
+
+    # Generate the DITA map from the outline of the topics:
+    try:
+        out = convert(input_file, map_xml, 'single_map', generated, messages, engine='native')
+    except etree.XSLTApplyError as message:
+        # Report the error:
+        warn(f'error: {message}', input_file, messages)
+        return names, False
+
+    # Write the DITA map:
+    if write(file_name, bytes(out)):
+        names.append(file_name)
+        return names, success
+    return names, False
@@ -21,8 +21,16 @@
 # ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-from lxml import etree
-from .xslt import *
+from __future__ import annotations
+
+from functools import lru_cache
+from threading import local
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any
+    from lxml import etree
 
 # Define which symbols are to be exported:
 __all__ = [
@@ -31,12 +39,80 @@ __all__ = [
     'to_single_topic', 'to_single_map'
 ]
 
+# The XSLT namespace used to locate include instructions:
+XSL_NAMESPACE = 'http://www.w3.org/1999/XSL/Transform'
+
+# Read the contents of an XSLT stylesheet from the package resources:
+@lru_cache(maxsize=None)
+def read_stylesheet(file_name: str) -> bytes:
+    # Use the package loader, which also supports zipped installs and is
+    # considerably cheaper to import than importlib.resources:
+    from pkgutil import get_data
+    data = get_data(__name__, f'xslt/{file_name}')
+
+    # Verify that the stylesheet exists:
+    if data is None:
+        raise FileNotFoundError(f'XSLT stylesheet not found: {file_name}')
+
+    # Return the contents of the stylesheet:
+    return data
+
+# Compose an XSLT stylesheet with all includes inlined:
+def load_stylesheet(file_name: str) -> etree._Element:
+    from lxml import etree
+
+    # Parse the stylesheet from memory so that no file paths are resolved:
+    stylesheet = etree.fromstring(read_stylesheet(file_name))
+
+    # Replace each include with the top-level elements of the included file:
+    for include in stylesheet.findall(f'{{{XSL_NAMESPACE}}}include'):
+        included = load_stylesheet(str(include.attrib['href']))
+        position = stylesheet.index(include)
+        stylesheet[position:position + 1] = list(included)
+
+    # Return the self-contained stylesheet:
+    return stylesheet
+
+# An XSLT transformer that compiles its stylesheet on first use:
+class Transformer:
+    def __init__(self, stylesheet: str) -> None:
+        # Store the file name of the XSLT stylesheet:
+        self.stylesheet = stylesheet
+
+        # Postpone the compilation until the transformer is needed; each
+        # thread gets its own compiled copy with a separate error log, which
+        # is released together with the thread, so every new thread pays the
+        # compilation cost again for each stylesheet it uses:
+        self._local = local()
+
+    # Return the compiled XSLT transformer for the current thread:
+    @property
+    def xslt(self) -> etree.XSLT:
+        xslt: etree.XSLT | None = getattr(self._local, 'xslt', None)
+
+        # Compile the XSLT stylesheet if it has not been compiled yet:
+        if xslt is None:
+            from lxml import etree
+            xslt = self._local.xslt = etree.XSLT(load_stylesheet(self.stylesheet))
+
+        # Return the compiled transformer:
+        return xslt
+
+    # Expose the error log of the last transformation in this thread:
+    @property
+    def error_log(self) -> Any:
+        return self.xslt.error_log  # type: ignore[attr-defined]
+
+    # Run the transformation:
+    def __call__(self, *args: Any, **kwargs: Any) -> etree._XSLTResultTree:
+        return self.xslt(*args, **kwargs)
+
 # Expose the XSLT transformers:
-to_concept             = etree.XSLT(etree.parse(concept))
-to_reference           = etree.XSLT(etree.parse(reference))
-to_task                = etree.XSLT(etree.parse(task))
-to_concept_generated   = etree.XSLT(etree.parse(concept_generated))
-to_reference_generated = etree.XSLT(etree.parse(reference_generated))
-to_task_generated      = etree.XSLT(etree.parse(task_generated))
-to_single_topic        = etree.XSLT(etree.parse(single_topic))
-to_single_map          = etree.XSLT(etree.parse(single_map))
+to_concept             = Transformer('concept.xsl')
+to_reference           = Transformer('reference.xsl')
+to_task                = Transformer('task.xsl')
+to_concept_generated   = Transformer('concept-generated.xsl')
+to_reference_generated = Transformer('reference-generated.xsl')
+to_task_generated      = Transformer('task-generated.xsl')
+to_single_topic        = Transformer('single-topic.xsl')
+to_single_map          = Transformer('single-map.xsl')
@@ -0,0 +1,231 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from lxml import etree
+
+# Define which symbols are to be exported:
+__all__ = ['Problem', 'validate']
+
+# Map the supported outputclass values to the target content types:
+CONTENT_TYPES = {
+    'assembly':  'concept',
+    'concept':   'concept',
+    'procedure': 'task',
+    'task':      'task',
+    'reference': 'reference',
+}
+
+# The titles of a generated task whose content is converted as it is:
+TASK_TITLES = frozenset({
+    'Prerequisite', 'Prerequisites', 'Verification', 'Result', 'Results',
+    'Troubleshooting', 'Troubleshooting step', 'Troubleshooting steps',
+    'Next step', 'Next steps',
+})
+
+# Return the line of the source file the selected element starts on:
+def source_line(element: etree._Element) -> int | None:
+    return element.sourceline  # type: ignore[return-value]
+
+# Return the text of the selected element and its descendants:
+def string_value(element: etree._Element) -> str:
+    return str(element.xpath('string()'))
+
+# Return the bold texts of a title paragraph of a generated document, or
+# None if the selected element is not a title paragraph:
+def title_names(element: etree._Element) -> set[str] | None:
+    if element.tag != 'p' or element.get('outputclass') != 'title':
+        return None
+    return {string_value(b) for b in element.findall('b')}
+
+# Verify that the selected element is an abstract paragraph:
+def is_abstract(element: etree._Element) -> bool:
+    return element.tag == 'p' and element.get('outputclass') == 'abstract'
+
+# Return the first Additional resources title among the selected children
+# and the elements that follow it; they only provide the related links:
+def related_links(children: list[etree._Element]) -> list[etree._Element]:
+    for index, child in enumerate(children):
+        if 'Additional resources' in (title_names(child) or ()):
+            return children[index:]
+    return []
+
+# Return the children of the selected body that the stylesheet for
+# generated tasks does not convert: the titles, the content under the
+# Additional resources and unsupported titles, everything under the
+# Procedure titles but the first list, extra abstracts before the first
+# title, and all examples but the first:
+def skipped_task_children(children: list[etree._Element]) -> list[etree._Element]:
+    abstract = next((child for child in children if is_abstract(child)), None)
+    example  = next((child for child in children if child.tag == 'example'), None)
+    skipped: list[etree._Element] = []
+    names: set[str] | None = None
+    steps = False
+
+    for child in children:
+        title = title_names(child)
+        if title is not None:
+            names = title
+            skipped.append(child)
+        elif child.tag == 'example':
+            if child is not example:
+                skipped.append(child)
+        elif child is abstract:
+            continue
+        elif names is None:
+            if is_abstract(child):
+                skipped.append(child)
+        elif names & TASK_TITLES:
+            continue
+        elif 'Procedure' in names:
+            # Sections still make the steps template report an error:
+            if child.tag in ('ol', 'ul') and not steps:
+                steps = True
+            elif child.tag != 'section':
+                skipped.append(child)
+        else:
+            skipped.append(child)
+
+    return skipped
+
+# Return the elements that the stylesheet for the selected target type
+# leaves out of the converted document; nothing they contain can make the
+# transformation terminate:
+def skipped_elements(root: etree._Element, target_type: str | None, generated: bool) -> list[etree._Element]:
+    from lxml import etree
+
+    skipped: list[etree._Element] = []
+    if not generated:
+        return skipped
+
+    for element in root.iter(etree.Element):
+        children = list(element.iterchildren(etree.Element))
+        parent   = element.getparent()
+        nested   = element.tag == 'section' and parent is not None and parent.tag == 'section'
+
+        if target_type == 'concept':
+            # Nested and Additional resources sections are removed, and the
+            # Additional resources titles end the body and the sections:
+            if nested or (element.tag == 'section' and any(string_value(title) == 'Additional resources' for title in element.findall('title'))):
+                skipped.append(element)
+            elif element.tag in ('body', 'section'):
+                skipped.extend(related_links(children))
+        elif target_type == 'reference':
+            # Nested sections and extra abstracts are removed, and the
+            # Additional resources titles end every element:
+            if nested:
+                skipped.append(element)
+            skipped.extend(related_links(children))
+            if element.tag == 'body':
+                skipped.extend([child for child in children if is_abstract(child)][1:])
+        elif target_type == 'task' and element.tag == 'body':
+            skipped.extend(skipped_task_children(children))
+
+    return skipped
+
+# A problem that would cause the conversion to fail:
+class Problem:
+    def __init__(self, line: int | None, message: str) -> None:
+        # The line of the source file the problem was found on, or None if
+        # the document was not parsed from a file:
+        self.line = line
+
+        # The description of the problem:
+        self.message = message
+
+    # Compare the problems by their contents:
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Problem):
+            return NotImplemented
+        return (self.line, self.message) == (other.line, other.message)
+
+    # Describe the problem the way the command-line interface reports it:
+    def __str__(self) -> str:
+        return f'line {self.line}: {self.message}' if self.line is not None else self.message
+
+    # Describe the problem:
+    def __repr__(self) -> str:
+        return f'<Problem line={self.line} message={self.message!r}>'
+
+# Find the problems that would make the XSLT transformation of the selected
+# document terminate; the content the selected stylesheet does not convert
+# is collected first and left out, the rest of the document is visited
+# once, and all problems are reported in the order in which they appear in
+# the document:
+def validate(source_xml: etree._ElementTree | etree._Element, target_type: str | None = None, generated: bool = False) -> list[Problem]:
+    from lxml import etree
+
+    # Get the root element:
+    root = source_xml.getroot() if isinstance(source_xml, etree._ElementTree) else source_xml
+
+    # Collect the problems:
+    problems: list[Problem] = []
+
+    # Verify that the root element is a topic:
+    if root.tag != 'topic':
+        problems.append(Problem(source_line(root), f'not a DITA topic: "{root.tag}"'))
+
+    # Determine the target type from the root element if not provided:
+    if target_type is None:
+        output_class = str(root.get('outputclass', 'concept')).lower()
+        target_type  = CONTENT_TYPES.get(output_class)
+
+        # Verify that the outputclass value is supported:
+        if target_type is None:
+            problems.append(Problem(source_line(root), f'unsupported outputclass "{output_class}"'))
+
+    # Collect the elements the selected stylesheet does not convert:
+    skipped = {node for element in skipped_elements(root, target_type, generated) for node in element.iter()}
+
+    for element in root.iter(etree.Element):
+        # Only look at the content the selected stylesheet converts:
+        if element in skipped:
+            continue
+
+        # Verify that sections only appear in content types that allow them:
+        if element.tag == 'section' and target_type == 'task':
+            problems.append(Problem(source_line(element), 'section not allowed in a DITA task'))
+
+        # Look at the children from the last to the first so that each
+        # definition term knows whether a description follows it:
+        description = False
+        examples    = 0
+        for child in reversed(element):
+            if child.tag == 'dd':
+                description = True
+            elif child.tag == 'dt' and not description and child not in skipped:
+                problems.append(Problem(source_line(child), 'incomplete definition list'))
+            elif child.tag == 'example':
+                examples += 1
+
+        # Verify that the body of a generic task has at most one example:
+        if element.tag == 'body' and examples > 1 and target_type == 'task' and not generated:
+            for example in element.findall('example')[1:]:
+                problems.append(Problem(source_line(example), 'multiple examples not allowed in a DITA task'))
+
+    # Return the problems in the order of the document:
+    return sorted(problems, key=lambda problem: problem.line or 0)
@@ -0,0 +1,189 @@
+# Copyright (C) 2026 Jaromir Hradilek
+
+# MIT License
+#
+# Permission  is hereby granted,  free of charge,  to any person  obtaining
+# a copy of  this software  and associated documentation files  (the "Soft-
+# ware"),  to deal in the Software  without restriction,  including without
+# limitation the rights to use,  copy, modify, merge,  publish, distribute,
+# sublicense, and/or sell copies of the Software,  and to permit persons to
+# whom the Software is furnished to do so,  subject to the following condi-
+# tions:
+#
+# The above copyright notice  and this permission notice  shall be included
+# in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS",  WITHOUT WARRANTY OF ANY KIND,  EXPRESS
+# OR IMPLIED,  INCLUDING BUT NOT LIMITED TO  THE WARRANTIES OF MERCHANTABI-
+# LITY,  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.  IN NO EVENT
+# SHALL THE AUTHORS OR COPYRIGHT HOLDERS  BE LIABLE FOR ANY CLAIM,  DAMAGES
+# OR OTHER LIABILITY,  WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE,
+# ARISING FROM,  OUT OF OR IN CONNECTION WITH  THE SOFTWARE  OR  THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+
+from __future__ import annotations
+
+import os
+import time
+
+# Import the type hints without the runtime cost of the typing module:
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# Define which symbols are to be exported:
+__all__ = ['watch']
+
+# The inotify events that indicate a finished write to a file:
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO    = 0x00000080
+IN_CLOEXEC     = 0o2000000
+
+# The inotify event header: watch descriptor, mask, cookie, name length:
+EVENT_FORMAT   = 'iIII'
+
+# Watch files by polling their modification time and size:
+class StatWatcher:
+    def __init__(self, files: list[str], interval: float = 0.5) -> None:
+        # Store the configuration:
+        self.files    = files
+        self.interval = interval
+
+        # Record the initial state of the watched files:
+        self.state    = {f: self.stat(f) for f in files}
+
+    # Return the modification time and size of the file, if it exists:
+    @staticmethod
+    def stat(file_name: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    # Return the files that changed since the last call, waiting at most
+    # for the selected number of seconds:
+    def poll(self, timeout: float | None) -> set[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            changed = set()
+
+            # Compare the current state of the files with the recorded one:
+            for file_name in self.files:
+                state = self.stat(file_name)
+                if state != self.state[file_name]:
+                    self.state[file_name] = state
+                    changed.add(file_name)
+
+            # Return the changed files, or nothing if the time is up:
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+            # Wait before checking the files again:
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+
+    # Release the resources:
+    def close(self) -> None:
+        pass
+
+# Watch files using the Linux inotify interface; directories are watched
+# instead of files so that editors that replace a file on save are
+# handled as well:
+class InotifyWatcher:
+    def __init__(self, files: list[str]) -> None:
+        import ctypes
+        import ctypes.util
+
+        # Load the C library:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+
+        # Create the inotify instance:
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'Unable to initialize inotify')
+
+        # Map the absolute paths to the file names as supplied:
+        self.files       = {os.path.abspath(f): f for f in files}
+        self.directories: dict[int, str] = {}
+
+        try:
+            # Watch the directories of all supplied files:
+            for directory in sorted({os.path.dirname(path) for path in self.files}):
+                descriptor = libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+                if descriptor < 0:
+                    raise OSError(ctypes.get_errno(), f'Unable to watch directory: {directory}')
+                self.directories[descriptor] = directory
+        except OSError:
+            self.close()
+            raise
+
+    # Return the files that changed since the last call, waiting at most
+    # for the selected number of seconds:
+    def poll(self, timeout: float | None) -> set[str]:
+        import select
+        import struct
+
+        # Wait until an event is available:
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+
+        # Read and decode all available events:
+        data     = os.read(self.fd, 65536)
+        size     = struct.calcsize(EVENT_FORMAT)
+        position = 0
+        changed  = set()
+
+        while position + size <= len(data):
+            descriptor, _, _, length = struct.unpack_from(EVENT_FORMAT, data, position)
+            name = data[position + size:position + size + length].rstrip(b'\0')
+            position += size + length
+
+            # Report only the files that are being watched:
+            path = os.path.join(self.directories.get(descriptor, ''), os.fsdecode(name))
+            if path in self.files:
+                changed.add(self.files[path])
+
+        # Return the changed files:
+        return changed
+
+    # Release the resources:
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+# Yield the sets of supplied files as they change; changes that follow
+# each other within the selected delay are reported together so that
+# a file is not converted while it is still being written:
+def watch(files: list[str], delay: float = 0.1, interval: float = 0.5, polling: bool = False) -> Iterator[list[str]]:
+    watcher: InotifyWatcher | StatWatcher | None = None
+
+    # Use inotify where available:
+    if not polling:
+        try:
+            watcher = InotifyWatcher(files)
+        except (OSError, AttributeError):
+            pass
+
+    # Fall back to polling:
+    if watcher is None:
+        watcher = StatWatcher(files, interval)
+
+    try:
+        while True:
+            # Wait for the first change:
+            changed = watcher.poll(None)
+
+            # Collect the changes that follow shortly after:
+            while changed:
+                more = watcher.poll(delay)
+                if not more:
+                    break
+                changed |= more
+
+            # Report the changed files in the order they were supplied:
+            if changed:
+                yield [f for f in files if f in changed]
+    finally:
+        watcher.close()
@@ -25,3 +25,6 @@ class TestDitaConvert(unittest.TestCase):
 
     def test_to_task_generated_exposed(self):
         self.assertTrue(hasattr(convert, 'to_task_generated'))
+
+    def test_convert_many_exposed(self):
+        self.assertTrue(hasattr(convert, 'convert_many'))
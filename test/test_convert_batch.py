@@ -0,0 +1,146 @@
+import unittest
+import os
+import tempfile
+from io import StringIO
+from lxml import etree
+from src.dita.convert import batch
+
+class TestDitaConvertBatch(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_topic(self, name, contents):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as f:
+            f.write(contents)
+        return path
+
+    def test_convert_path(self):
+        path = self.write_topic('topic.dita', '''\
+        <topic id="example-topic" outputclass="procedure">
+            <title>Topic title</title>
+        </topic>
+        ''')
+
+        results = list(batch.convert_many([path]))
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[0].index, 0)
+        self.assertEqual(results[0].source, path)
+        self.assertEqual(results[0].warnings, [])
+        self.assertEqual(etree.fromstring(results[0].output).tag, 'task')
+        self.assertEqual(set(results[0].timings), {'parse', 'transform', 'serialize', 'total'})
+
+    def test_convert_bytes(self):
+        results = list(batch.convert_many([b'<topic id="example-topic"><title>Topic title</title></topic>'], 'reference'))
+
+        self.assertTrue(results[0].ok)
+        self.assertIsNone(results[0].source)
+        self.assertEqual(etree.fromstring(results[0].output).tag, 'reference')
+
+    def test_convert_element_tree(self):
+        xml = etree.parse(StringIO('<topic id="example-topic"><title>Topic title</title></topic>'))
+
+        results = list(batch.convert_many([xml], 'concept'))
+
+        self.assertTrue(results[0].ok)
+        self.assertEqual(etree.fromstring(results[0].output).tag, 'concept')
+
+    def test_convert_reports_warnings(self):
+        path = self.write_topic('topic.dita', '''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+        </topic>
+        ''')
+
+        results = list(batch.convert_many([path]))
+
+        self.assertTrue(results[0].ok)
+        self.assertEqual(len(results[0].warnings), 1)
+        self.assertRegex(results[0].warnings[0], r'topic\.dita: warning: outputclass not found')
+
+    def test_convert_reports_errors(self):
+        results = list(batch.convert_many([b'<concept id="example-concept" />', b'<topic'], 'concept'))
+
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].error, 'ERROR: Not a DITA topic')
+        self.assertIsNone(results[0].output)
+        self.assertFalse(results[1].ok)
+        self.assertIn('total', results[1].timings)
+
+    def test_convert_validates_documents(self):
+        source = b'<topic id="example-topic">\n<title>Topic title</title>\n<section />\n<section />\n</topic>'
+
+        results = list(batch.convert_many([source, source], 'task', validate=True))
+
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].error, 'error: line 4: section not allowed in a DITA task')
+        self.assertEqual(results[0].warnings, ['dita-convert: error: line 3: section not allowed in a DITA task', 'dita-convert: error: line 4: section not allowed in a DITA task'])
+        self.assertEqual(results[1].error, results[0].error)
+
+    def test_convert_native_engine(self):
+        sources = [b'<topic id="example-topic"><title>Topic title</title><body><ol><li>Step</li></ol></body></topic>', b'<topic id="example-topic" />']
+
+        results = list(batch.convert_many(sources, 'task', ordered=True, jobs=2, engine='native'))
+        expected = list(batch.convert_many(sources, 'task', ordered=True, jobs=2))
+
+        self.assertEqual([r.output for r in results], [r.output for r in expected])
+        self.assertEqual([r.error for r in results], [r.error for r in expected])
+
+    def test_convert_native_engine_keeps_element_tree(self):
+        source = '<topic id="example-topic"><title>Topic title</title><body><ol><li>Step</li></ol></body></topic>'
+        xml    = etree.parse(StringIO(source))
+
+        results = list(batch.convert_many([xml], 'task', engine='native'))
+
+        self.assertTrue(results[0].ok)
+        self.assertEqual(etree.fromstring(results[0].output).tag, 'task')
+        self.assertEqual(etree.tostring(xml), source.encode())
+
+    def test_convert_element_tree_in_processes(self):
+        xml = etree.parse(StringIO('<topic id="example-topic"><title>Topic title</title></topic>'))
+
+        results = list(batch.convert_many([xml, b'<topic id="example-topic"><title>Topic title</title></topic>'], 'concept', jobs=2, processes=True, ordered=True))
+
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].error, 'parsed documents cannot be converted in worker processes')
+        self.assertTrue(results[1].ok)
+
+    def test_convert_unknown_engine(self):
+        results = list(batch.convert_many([b'<topic id="example-topic" />'], 'task', engine='python'))
+
+        self.assertFalse(results[0].ok)
+        self.assertEqual(results[0].error, 'unsupported engine "python"')
+
+    def test_convert_ordered(self):
+        sources = [f'<topic id="topic{i}"><title>Topic {i}</title></topic>'.encode() for i in range(10)]
+
+        results = list(batch.convert_many(sources, 'concept', jobs=3, ordered=True))
+
+        self.assertEqual([r.index for r in results], list(range(10)))
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_convert_unordered(self):
+        sources = [f'<topic id="topic{i}"><title>Topic {i}</title></topic>'.encode() for i in range(10)]
+
+        results = list(batch.convert_many(sources, 'concept', jobs=3))
+
+        self.assertEqual(sorted(r.index for r in results), list(range(10)))
+
+    def test_convert_bounds_pending_documents(self):
+        consumed = []
+
+        def sources():
+            for i in range(20):
+                consumed.append(i)
+                yield f'<topic id="topic{i}"><title>Topic {i}</title></topic>'.encode()
+
+        results = batch.convert_many(sources(), 'concept', jobs=2, max_pending=3)
+        next(results)
+
+        self.assertLessEqual(len(consumed), 4)
+        self.assertEqual(len(list(results)), 19)
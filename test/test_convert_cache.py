@@ -0,0 +1,117 @@
+import unittest
+import os
+import pickle
+import tempfile
+import threading
+from unittest.mock import patch
+from src.dita.convert import cache
+
+class TestDitaConvertCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key_depends_on_input(self):
+        c = cache.Cache(self.directory.name)
+
+        self.assertEqual(c.key(b'<topic/>', 'convert', None, False), c.key(b'<topic/>', 'convert', None, False))
+        self.assertNotEqual(c.key(b'<topic/>', 'convert', None, False), c.key(b'<topic />', 'convert', None, False))
+
+    def test_key_depends_on_options(self):
+        c = cache.Cache(self.directory.name)
+
+        self.assertNotEqual(c.key(b'<topic/>', 'convert', None, False), c.key(b'<topic/>', 'convert', 'task', False))
+        self.assertNotEqual(c.key(b'<topic/>', 'convert', None, False), c.key(b'<topic/>', 'convert', None, True))
+
+    def test_key_depends_on_fingerprint(self):
+        c = cache.Cache(self.directory.name)
+        key = c.key(b'<topic/>', 'convert', None, False)
+        c.salt = 'different'
+
+        self.assertNotEqual(c.key(b'<topic/>', 'convert', None, False), key)
+
+    def test_get_missing(self):
+        c = cache.Cache(self.directory.name)
+
+        self.assertIsNone(c.get(c.key(b'<topic/>')))
+
+    def test_put_and_get(self):
+        c = cache.Cache(self.directory.name)
+        key = c.key(b'<topic/>')
+        c.put(key, b'result')
+
+        self.assertEqual(c.get(key), b'result')
+        self.assertEqual(c.stats()['size'], len(b'result'))
+        self.assertEqual(os.listdir(os.path.join(self.directory.name, key[:2])), [key])
+
+    def test_put_from_threads(self):
+        c = cache.Cache(self.directory.name)
+        key = c.key(b'<topic/>')
+        temporary = []
+        replace   = os.replace
+
+        def record(source, target):
+            temporary.append(source)
+            replace(source, target)
+
+        # Keep both threads alive so that their identifiers differ:
+        barrier = threading.Barrier(2)
+        def run(data):
+            barrier.wait()
+            c.put(key, data)
+            barrier.wait()
+
+        with patch('src.dita.convert.cache.os.replace', side_effect=record):
+            threads = [threading.Thread(target=run, args=(data,)) for data in (b'first', b'second')]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # Each thread writes its own temporary file:
+        self.assertEqual(len(set(temporary)), 2)
+        self.assertIn(c.get(key), (b'first', b'second'))
+        self.assertEqual(os.listdir(os.path.join(self.directory.name, key[:2])), [key])
+
+    def test_evicts_least_recently_used(self):
+        c = cache.Cache(self.directory.name, 100)
+        keys = [c.key(str(i).encode()) for i in range(3)]
+
+        c.put(keys[0], b'x' * 40)
+        c.put(keys[1], b'x' * 40)
+        os.utime(c.path(keys[0]), (1, 1))
+        os.utime(c.path(keys[1]), (2, 2))
+        c.get(keys[0])
+        c.put(keys[2], b'x' * 40)
+
+        self.assertIsNotNone(c.get(keys[0]))
+        self.assertIsNone(c.get(keys[1]))
+        self.assertIsNotNone(c.get(keys[2]))
+        self.assertEqual(c.stats()['evictions'], 1)
+        self.assertLessEqual(c.stats()['size'], 100)
+
+    def test_pickled_cache_keeps_size(self):
+        cache.Cache(self.directory.name).put('00' + 'x' * 62, b'x' * 40)
+        c = pickle.loads(pickle.dumps(cache.Cache(self.directory.name)))
+
+        # The worker copy does not scan the cache directory again:
+        with patch.object(cache.Cache, 'entries', side_effect=AssertionError) as entries:
+            c.put(c.key(b'<topic/>'), b'x' * 10)
+
+        entries.assert_not_called()
+        self.assertEqual(c.size, 50)
+
+    def test_pack_and_unpack(self):
+        entry = cache.pack([('a.dita', 'Příliš'.encode('utf-8')), ('a.ditamap', b'<map/>')],
+                           ['dita-convert: old.dita: warning: example', 'dita-convert: other'],
+                           'dita-convert: old.dita')
+        files, messages = cache.unpack(entry, 'dita-convert: new.dita')
+
+        self.assertEqual(files, [('a.dita', 'Příliš'.encode('utf-8')), ('a.ditamap', b'<map/>')])
+        self.assertEqual(messages, ['dita-convert: new.dita: warning: example', 'dita-convert: other'])
+
+    def test_fingerprint_is_stable(self):
+        self.assertEqual(cache.fingerprint(), cache.fingerprint())
+        self.assertEqual(len(cache.fingerprint()), 64)
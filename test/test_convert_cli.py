@@ -2,13 +2,25 @@ import unittest
 import contextlib
 import errno
 import os
+import re
 import sys
-from io import StringIO
+import tempfile
+from io import BytesIO, StringIO, TextIOWrapper
 from lxml import etree
 from unittest.mock import mock_open, patch, ANY
-from src.dita.convert import cli
+from src.dita.convert import cli, native
 from src.dita.convert import NAME, VERSION
 
+# Standard output that records the converted documents written directly to
+# its binary buffer:
+class BinaryOutput(TextIOWrapper):
+    def __init__(self):
+        super().__init__(BytesIO(), encoding='utf-8')
+
+    def getvalue(self):
+        self.flush()
+        return self.buffer.getvalue().decode('utf-8')
+
 class TestDitaCli(unittest.TestCase):
     def test_invalid_option(self):
         with self.assertRaises(SystemExit) as cm,\
@@ -21,7 +33,7 @@ class TestDitaCli(unittest.TestCase):
 
     def test_opt_help_short(self):
         with self.assertRaises(SystemExit) as cm,\
-             contextlib.redirect_stdout(StringIO()) as out:
+             contextlib.redirect_stdout(BinaryOutput()) as out:
             cli.run(['-h'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -29,7 +41,7 @@ class TestDitaCli(unittest.TestCase):
 
     def test_opt_help_long(self):
         with self.assertRaises(SystemExit) as cm,\
-             contextlib.redirect_stdout(StringIO()) as out:
+             contextlib.redirect_stdout(BinaryOutput()) as out:
             cli.run(['--help'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -37,7 +49,7 @@ class TestDitaCli(unittest.TestCase):
 
     def test_opt_version_short(self):
         with self.assertRaises(SystemExit) as cm,\
-             contextlib.redirect_stdout(StringIO()) as out:
+             contextlib.redirect_stdout(BinaryOutput()) as out:
             cli.run(['-v'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -45,7 +57,7 @@ class TestDitaCli(unittest.TestCase):
 
     def test_opt_version_long(self):
         with self.assertRaises(SystemExit) as cm,\
-             contextlib.redirect_stdout(StringIO()) as out:
+             contextlib.redirect_stdout(BinaryOutput()) as out:
             cli.run(['--version'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -53,7 +65,7 @@ class TestDitaCli(unittest.TestCase):
 
     def test_opt_type_invalid(self):
         with patch('src.dita.convert.cli.convert') as convert:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
                  contextlib.redirect_stderr(StringIO()) as err:
@@ -65,10 +77,10 @@ class TestDitaCli(unittest.TestCase):
     def test_opt_type_short(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                 cli.run(['-t', 'concept', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -77,10 +89,10 @@ class TestDitaCli(unittest.TestCase):
     def test_opt_type_long(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                 cli.run(['--type', 'concept', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -89,10 +101,10 @@ class TestDitaCli(unittest.TestCase):
     def test_opt_type_concept(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                 cli.run(['-t', 'concept', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -101,10 +113,10 @@ class TestDitaCli(unittest.TestCase):
     def test_opt_type_task(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<task />'
+            convert.return_value = b'<task />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                 cli.run(['-t', 'task', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -113,10 +125,10 @@ class TestDitaCli(unittest.TestCase):
     def test_opt_type_reference(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<reference />'
+            convert.return_value = b'<reference />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                 cli.run(['-t', 'reference', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -136,7 +148,7 @@ class TestDitaCli(unittest.TestCase):
             split_topics.return_value = 0
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                 cli.run(['-s', '-d', 'out', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
@@ -148,42 +160,517 @@ class TestDitaCli(unittest.TestCase):
             split_topics.return_value = 0
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                 cli.run(['--split-topic', '--directory', 'out', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '')
         split_topics.assert_called_once_with(ANY)
 
+    def test_opt_serve(self):
+        with patch('src.dita.convert.daemon.serve') as serve:
+            serve.return_value = 0
+
+            with self.assertRaises(SystemExit) as cm:
+                cli.run(['--serve', 'dita-convert.sock'])
+
+        self.assertEqual(cm.exception.code, 0)
+        serve.assert_called_once_with('dita-convert.sock')
+
+    def test_opt_connect_short(self):
+        with patch('src.dita.convert.daemon.Client') as client:
+            client.return_value.convert.return_value = b'<concept />'
+
+            with self.assertRaises(SystemExit) as cm,\
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
+                cli.run(['-c', 'dita-convert.sock', '-t', 'concept', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(out.getvalue().rstrip(), '<concept />')
+        client.assert_called_once_with('dita-convert.sock')
+        client.return_value.convert.assert_called_once_with('topic.dita', 'concept', False, False, 'xslt')
+
+    def test_opt_connect_long(self):
+        with patch('src.dita.convert.daemon.Client') as client:
+            client.return_value.convert.return_value = b'<concept />'
+
+            with self.assertRaises(SystemExit) as cm,\
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
+                cli.run(['--connect', 'dita-convert.sock', '-t', 'concept', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(out.getvalue().rstrip(), '<concept />')
+
+    def test_opt_connect_unavailable(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['-c', 'nonexistent.sock', '-t', 'concept', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ECONNREFUSED)
+        self.assertRegex(err.getvalue(), r'error: Unable to connect to server')
+
+    def test_opt_connect_split_topic(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['-c', 'dita-convert.sock', '-s', '-d', 'out', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'-s option cannot be combined with -c')
+
+    def test_opt_jobs_invalid(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['-j', '-1', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'-j option requires a non-negative number')
+
+    def test_opt_jobs_connect(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['-j', '2', '-c', 'dita-convert.sock', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'-j option cannot be combined with -c')
+
+    def test_opt_jobs_preserves_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            for i in range(4):
+                files.append(os.path.join(directory, f'topic{i}.dita'))
+                with open(files[-1], 'w') as f:
+                    f.write(f'<topic id="topic{i}"><title>Topic {i}</title></topic>')
+            files.insert(2, os.path.join(directory, 'missing.dita'))
+
+            with self.assertRaises(SystemExit) as cm,\
+                 contextlib.redirect_stdout(BinaryOutput()) as out,\
+                 contextlib.redirect_stderr(StringIO()) as err:
+                cli.run(['--jobs', '2', '-t', 'concept', *files])
+
+        self.assertEqual(cm.exception.code, errno.EPERM)
+        self.assertEqual(re.findall(r'<concept id="([^"]+)"', out.getvalue()), ['topic0', 'topic1', 'topic2', 'topic3'])
+        self.assertRegex(err.getvalue(), r'^[^\n]*missing\.dita: ')
+
+    def test_opt_cache_connect(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--cache', 'cache', '-c', 'dita-convert.sock', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--cache option cannot be combined with -c')
+
+    def test_opt_cache_size_invalid(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--cache', 'cache', '--cache-size', '0', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--cache-size option requires a positive size')
+
+    def test_opt_cache_size_suffix(self):
+        self.assertEqual(cli.parse_args(['--cache-size', '512']).cache_size, 512)
+        self.assertEqual(cli.parse_args(['--cache-size', '2k']).cache_size, 2048)
+        self.assertEqual(cli.parse_args(['--cache-size', '3M']).cache_size, 3 * 1024 ** 2)
+
+    def test_opt_cache_reuses_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            for i in range(2):
+                files.append(os.path.join(directory, f'topic{i}.dita'))
+                with open(files[-1], 'w') as f:
+                    f.write('<topic id="topic"><title>Topic</title></topic>')
+
+            outputs = []
+            for name in files:
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stdout(BinaryOutput()) as out,\
+                     contextlib.redirect_stderr(StringIO()) as err:
+                    cli.run(['--cache', os.path.join(directory, 'cache'), '--cache-stats', name])
+
+                self.assertEqual(cm.exception.code, 0)
+                self.assertRegex(err.getvalue(), rf'{os.path.basename(name)}: warning: outputclass not found')
+                outputs.append((out.getvalue(), err.getvalue().splitlines()[-1]))
+
+        self.assertEqual(outputs[0][0], outputs[1][0])
+        self.assertRegex(outputs[0][1], r'cache: 0 hits, 1 misses')
+        self.assertRegex(outputs[1][1], r'cache: 1 hits, 0 misses')
+
+    def test_opt_cache_does_not_store_errors(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<concept id="topic"><title>Topic</title></concept>')
+
+            for i in range(2):
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stdout(BinaryOutput()),\
+                     contextlib.redirect_stderr(StringIO()) as err:
+                    cli.run(['--cache', os.path.join(directory, 'cache'), '--cache-stats', name])
+
+                self.assertEqual(cm.exception.code, errno.EPERM)
+                self.assertRegex(err.getvalue(), r'cache: 0 hits, 1 misses')
+
+    def test_opt_cache_split_topic(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<topic id="topic" outputclass="assembly"><title>Topic</title></topic>')
+
+            outputs = []
+            for target in ('out1', 'out2'):
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()) as err:
+                    cli.run(['-s', '-d', os.path.join(directory, target), '--cache', os.path.join(directory, 'cache'), '--cache-stats', name])
+
+                self.assertEqual(cm.exception.code, 0)
+                outputs.append({f: open(os.path.join(directory, target, f)).read() for f in os.listdir(os.path.join(directory, target))})
+
+        self.assertEqual(sorted(outputs[0]), ['topic.dita', 'topic.ditamap'])
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertRegex(err.getvalue(), r'cache: 1 hits, 0 misses')
+
+    def test_opt_split_topic_nested(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<topic id="topic" outputclass="assembly"><title>Topic</title><body><p>Topic body</p>' +
+                        '<section id="first"><title>First</title><p>First body</p>' +
+                        '<section id="second" outputclass="procedure"><title>Second</title><ol><li>Step</li></ol></section>' +
+                        '</section></body></topic>')
+
+            with self.assertRaises(SystemExit) as cm,\
+                 contextlib.redirect_stderr(StringIO()):
+                cli.run(['-s', '-d', os.path.join(directory, 'out'), name])
+
+            self.assertEqual(cm.exception.code, 0)
+            outputs = {f: etree.parse(os.path.join(directory, 'out', f)) for f in os.listdir(os.path.join(directory, 'out'))}
+
+        self.assertEqual(sorted(outputs), ['first.dita', 'second.dita', 'topic.dita', 'topic.ditamap'])
+        self.assertEqual(outputs['topic.dita'].xpath('//p/text()'), ['Topic body'])
+        self.assertEqual(outputs['first.dita'].xpath('//p/text()'), ['First body'])
+        self.assertTrue(outputs['second.dita'].xpath('boolean(/task/taskbody/steps/step/cmd[text()="Step"])'))
+        self.assertTrue(outputs['topic.ditamap'].xpath('boolean(/map/topicref[@href="topic.dita"]/topicref[@href="first.dita"]/topicref[@href="second.dita" and @type="task"])'))
+
+    def test_opt_stream(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<topic id="topic" outputclass="assembly"><title>Topic</title><body><p>Topic body</p>' +
+                        '<section id="first"><title>First</title><p>First body</p>' +
+                        '<section id="second" outputclass="procedure"><title>Second</title><ol><li>Step</li></ol></section>' +
+                        '</section></body></topic>')
+
+            outputs = []
+            for options in ([], ['--stream']):
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()):
+                    cli.run(['-s', *options, '-d', os.path.join(directory, str(len(options))), name])
+
+                self.assertEqual(cm.exception.code, 0)
+                outputs.append({f: open(os.path.join(directory, str(len(options)), f)).read() for f in os.listdir(os.path.join(directory, str(len(options))))})
+
+        self.assertEqual(sorted(outputs[1]), ['first.dita', 'second.dita', 'topic.dita', 'topic.ditamap'])
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_opt_stream_requires_split_topic(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--stream', '-d', 'out', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--stream option requires -s')
+
+    def test_opt_stream_jobs(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['-s', '--stream', '-j', '2', '-d', 'out', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--stream option cannot be combined with -j')
+
+    def test_opt_jobs_split_topic(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<topic id="topic" outputclass="assembly"><title>Topic</title><body>' +
+                        ''.join(f'<section id="s{i}" outputclass="procedure"><title>Section {i}</title><ol><li><p>Step</p><example><title>Example</title></example></li></ol></section>' for i in range(4)) +
+                        '</body></topic>')
+
+            outputs, errors = [], []
+            for options in (['-j', '1'], ['-j', '2'], ['-j', '2', '-T']):
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()) as err:
+                    cli.run(['-s', *options, '-d', os.path.join(directory, str(len(outputs))), name])
+
+                self.assertEqual(cm.exception.code, 0)
+                outputs.append({f: open(os.path.join(directory, str(len(outputs)), f)).read() for f in os.listdir(os.path.join(directory, str(len(outputs))))})
+                errors.append(err.getvalue())
+
+        self.assertEqual(len(outputs[0]), 6)
+        self.assertEqual(re.findall(r'\(id="(s\d)"\): WARNING', errors[0]), ['s0', 's1', 's2', 's3'])
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0], outputs[2])
+        self.assertEqual(errors[0], errors[1])
+        self.assertEqual(errors[0], errors[2])
+
+    def test_split_xml_executor(self):
+        from concurrent.futures import ThreadPoolExecutor
+        source = ('<topic id="topic" outputclass="assembly"><title>Topic</title><body>' +
+                  '<section id="first" outputclass="procedure"><title>First</title><ol><li><p>Step</p><example><title>Example</title></example></li></ol></section>' +
+                  '<section id="second" outputclass="reference"><title>Second</title><p>Body</p></section>' +
+                  '</body></topic>')
+
+        messages = [[], []]
+        results = [cli.split_xml('topic.dita', etree.parse(StringIO(source)), False, messages[0])]
+        with ThreadPoolExecutor(2) as executor:
+            results.append(cli.split_xml('topic.dita', etree.parse(StringIO(source)), False, messages[1], executor))
+
+        self.assertEqual(list(results[1][0]), ['topic.dita', 'first.dita', 'second.dita', 'topic.ditamap'])
+        self.assertEqual({k: bytes(v) for k, v in results[0][0].items()}, {k: bytes(v) for k, v in results[1][0].items()})
+        self.assertEqual(messages[0], messages[1])
+        self.assertTrue(messages[1])
+
+    def test_opt_stream_cache(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['-s', '--stream', '--cache', 'cache', '-d', 'out', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--stream option cannot be combined with --cache')
+
+    def test_split_xml(self):
+        xml = etree.parse(StringIO('<topic id="topic" outputclass="assembly"><title>Topic</title><body><p>Topic body</p>' +
+                                   '<section id="first" outputclass="reference"><title>First</title><p>First body</p></section>' +
+                                   '<section id="second" outputclass="procedure"><title>Second</title><ol><li>Step</li></ol></section>' +
+                                   '</body></topic>'))
+
+        results, success = cli.split_xml('topic.dita', xml)
+
+        self.assertTrue(success)
+        self.assertEqual(list(results), ['topic.dita', 'first.dita', 'second.dita', 'topic.ditamap'])
+        self.assertEqual([result.getroot().tag for result in results.values()], ['concept', 'reference', 'task', 'map'])
+        self.assertTrue(all(isinstance(result, native.ResultTree) for result in results.values()))
+
+    def test_opt_validate_split_topic(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--validate', '-s', '-d', 'out', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--validate option cannot be combined with -s')
+
+    def test_opt_validate_reports_problems(self):
+        with tempfile.TemporaryDirectory() as directory:
+            names = [os.path.join(directory, f'topic{i}.dita') for i in range(2)]
+            with open(names[0], 'w') as f:
+                f.write('<topic id="topic" outputclass="procedure">\n<title>Topic</title>\n<body>\n<section />\n<dl><dlentry><dt>Term</dt></dlentry></dl>\n</body>\n</topic>')
+            with open(names[1], 'w') as f:
+                f.write('<topic id="topic" outputclass="procedure"><title>Topic</title></topic>')
+
+            with self.assertRaises(SystemExit) as cm,\
+                 contextlib.redirect_stderr(StringIO()) as err:
+                cli.run(['--validate', '-d', os.path.join(directory, 'out'), *names])
+
+            self.assertEqual(cm.exception.code, errno.EPERM)
+            self.assertEqual(err.getvalue().splitlines(), [
+                f'dita-convert: {names[0]}: error: line 4: section not allowed in a DITA task',
+                f'dita-convert: {names[0]}: error: line 5: incomplete definition list',
+            ])
+            self.assertEqual(os.listdir(os.path.join(directory, 'out')), ['topic1.dita'])
+
+    def test_opt_engine_native(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<topic id="topic" outputclass="procedure"><title>Topic</title><body><ol><li><p>Step</p><example><title>Example</title><p>Output</p></example></li></ol></body></topic>')
+
+            outputs = []
+            for engine in ('xslt', 'native'):
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()) as err:
+                    cli.run(['--engine', engine, '-t', 'task', '-d', os.path.join(directory, engine), name])
+
+                self.assertEqual(cm.exception.code, 0)
+                self.assertRegex(err.getvalue(), r'WARNING: Title found in stepxmp, skipping')
+                outputs.append(open(os.path.join(directory, engine, 'topic.dita')).read())
+
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_opt_engine_native_generated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<topic id="topic"><title>Topic</title><body><p outputclass="abstract">Abstract</p><p>Introduction</p><p outputclass="title"><b>Additional resources</b></p><ul><li><xref href="topic.dita" /></li></ul></body></topic>')
+
+            outputs = []
+            for engine in ('xslt', 'native'):
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()):
+                    cli.run(['--engine', engine, '-g', '-t', 'reference', '-d', os.path.join(directory, engine), name])
+
+                self.assertEqual(cm.exception.code, 0)
+                outputs.append(open(os.path.join(directory, engine, 'topic.dita')).read())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertIn('<shortdesc>Abstract</shortdesc>', outputs[1])
+
+    def test_opt_engine_invalid(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--engine', 'python', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'error:.*invalid choice')
+
+    def test_opt_engine_split_topic(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--engine', 'native', '-s', '-d', 'out', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--engine option cannot be combined with -s')
+
+    def test_opt_incremental_requires_directory(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--incremental', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--incremental option requires -d')
+
+    def test_opt_incremental_skips_unchanged_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            for i in range(2):
+                files.append(os.path.join(directory, f'topic{i}.dita'))
+                with open(files[-1], 'w') as f:
+                    f.write(f'<topic id="topic{i}"><title>Topic {i}</title></topic>')
+
+            errors = []
+            for i in range(3):
+                if i == 2:
+                    with open(files[1], 'w') as f:
+                        f.write('<topic id="topic1"><title>Changed</title></topic>')
+
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()) as err:
+                    cli.run(['--incremental', '-d', os.path.join(directory, 'out'), *files])
+
+                self.assertEqual(cm.exception.code, 0)
+                errors.append(re.findall(r'(topic\d)\.dita: warning', err.getvalue()))
+
+            with open(os.path.join(directory, 'out', 'topic1.dita')) as f:
+                self.assertIn('Changed', f.read())
+
+        self.assertEqual(errors, [['topic0', 'topic1'], [], ['topic1']])
+
+    def test_opt_incremental_split_topic_writes_changed_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            out  = os.path.join(directory, 'out')
+            sections = ['<section id="first"><title>First</title><p>First body</p></section>',
+                        '<section id="second"><title>Second</title><p>Second body</p></section>']
+
+            errors = []
+            for options, body in (([], sections), (['--stream'], [sections[0].replace('First body', 'Changed')]), ([], sections)):
+                with open(name, 'w') as f:
+                    f.write(f'<topic id="topic"><title>Topic</title><body>{"".join(body)}</body></topic>')
+
+                # Mark the existing files so that rewritten files can be
+                # recognized by their modification time:
+                for file_name in os.listdir(out) if os.path.isdir(out) else []:
+                    os.utime(os.path.join(out, file_name), ns=(0, 0))
+
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()) as err:
+                    cli.run(['-s', *options, '--incremental', '-d', out, name])
+
+                self.assertEqual(cm.exception.code, 0)
+                errors.append(err.getvalue())
+
+            mtimes = {f: os.stat(os.path.join(out, f)).st_mtime_ns for f in os.listdir(out) if f.endswith(('.dita', '.ditamap'))}
+
+        self.assertRegex(errors[1], r'second\.dita: warning: No longer generated from .*topic\.dita, can be removed')
+        self.assertEqual(errors[2], '')
+        self.assertEqual(sorted(f for f, mtime in mtimes.items() if mtime != 0), ['first.dita', 'second.dita', 'topic.ditamap'])
+
+    def test_opt_watch_in_place(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--watch', '-i', 'topic.dita'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--watch option cannot be combined with -i')
+
+    def test_opt_watch_stdin(self):
+        with self.assertRaises(SystemExit) as cm,\
+             contextlib.redirect_stderr(StringIO()) as err:
+            cli.run(['--watch'])
+
+        self.assertEqual(cm.exception.code, errno.ENOENT)
+        self.assertRegex(err.getvalue(), r'--watch option cannot be combined with -i or standard input')
+
+    def test_opt_watch_converts_changed_files(self):
+        with patch('src.dita.convert.cli.convert_topics') as convert_topics,\
+             patch('src.dita.convert.watch.watch') as watch:
+            convert_topics.side_effect = [0, errno.EPERM, 0]
+            watch.return_value = iter([['second.dita'], ['first.dita']])
+
+            with self.assertRaises(SystemExit) as cm:
+                cli.run(['--watch', '-t', 'task', 'first.dita', 'second.dita'])
+
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual([c.args[0].files for c in convert_topics.call_args_list],
+                         [['first.dita', 'second.dita'], ['second.dita'], ['first.dita']])
+        self.assertEqual({c.args[0].type for c in convert_topics.call_args_list}, {'task'})
+        watch.assert_called_once_with(['first.dita', 'second.dita'])
+
+    def test_opt_threads_preserves_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            files = []
+            for i in range(4):
+                files.append(os.path.join(directory, f'topic{i}.dita'))
+                with open(files[-1], 'w') as f:
+                    f.write(f'<topic id="topic{i}"><title>Topic {i}</title></topic>')
+
+            with self.assertRaises(SystemExit) as cm,\
+                 contextlib.redirect_stdout(BinaryOutput()) as out,\
+                 contextlib.redirect_stderr(StringIO()) as err:
+                cli.run(['-j', '2', '--threads', *files])
+
+        self.assertEqual(cm.exception.code, 0)
+        self.assertEqual(re.findall(r'<concept id="([^"]+)"', out.getvalue()), ['topic0', 'topic1', 'topic2', 'topic3'])
+        self.assertEqual(re.findall(r'(topic\d)\.dita: warning', err.getvalue()), ['topic0', 'topic1', 'topic2', 'topic3'])
+
     def test_opt_in_place_short(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse,\
              patch('src.dita.convert.cli.open') as file_open:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                     cli.run(['-t', 'concept', '-i', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '')
-        file_open.assert_called_once_with('topic.dita', 'w')
-        file_open().__enter__().write.assert_called_once_with('<concept />')
+        file_open.assert_called_once_with('topic.dita', 'wb')
+        file_open().__enter__().write.assert_called_once_with(b'<concept />')
 
     def test_opt_in_place_long(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse,\
              patch('src.dita.convert.cli.open') as file_open:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                     cli.run(['-t', 'concept', '--in-place', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '')
-        file_open.assert_called_once_with('topic.dita', 'w')
-        file_open().__enter__().write.assert_called_once_with('<concept />')
+        file_open.assert_called_once_with('topic.dita', 'wb')
+        file_open().__enter__().write.assert_called_once_with(b'<concept />')
 
     def test_opt_in_place_exclusivity(self):
         with self.assertRaises(SystemExit) as cm,\
@@ -197,77 +684,103 @@ class TestDitaCli(unittest.TestCase):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse,\
              patch('src.dita.convert.cli.open') as file_open:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                     cli.run(['-t', 'concept', '-o', 'out.dita', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '')
-        file_open.assert_called_once_with('out.dita', 'w')
-        file_open().__enter__().write.assert_called_once_with('<concept />')
+        file_open.assert_called_once_with('out.dita', 'wb')
+        file_open().__enter__().write.assert_called_once_with(b'<concept />')
 
     def test_opt_output_long(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse,\
              patch('src.dita.convert.cli.open') as file_open:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                     cli.run(['-t', 'concept', '--output', 'out.dita', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '')
-        file_open.assert_called_once_with('out.dita', 'w')
-        file_open().__enter__().write.assert_called_once_with('<concept />')
+        file_open.assert_called_once_with('out.dita', 'wb')
+        file_open().__enter__().write.assert_called_once_with(b'<concept />')
 
     def test_opt_output_stdout(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                     cli.run(['-t', 'concept', '-o', '-', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '<concept />')
 
+    def test_opt_output_encoding(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name   = os.path.join(directory, 'topic.dita')
+            output = os.path.join(directory, 'out.dita')
+            with open(name, 'wb') as f:
+                f.write('<topic id="topic" outputclass="concept"><title>Příliš žluťoučký kůň</title></topic>'.encode('utf-8'))
+
+            for engine in ('xslt', 'native'):
+                expected = bytes(cli.convert(name, etree.parse(name), 'concept', engine=engine))
+
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stdout(BinaryOutput()) as out:
+                    cli.run(['-t', 'concept', '--engine', engine, '-o', output, name])
+
+                self.assertEqual(cm.exception.code, 0)
+                with open(output, 'rb') as f:
+                    self.assertEqual(f.read(), expected)
+
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stdout(BinaryOutput()) as out:
+                    cli.run(['-t', 'concept', '--engine', engine, name])
+
+                self.assertEqual(cm.exception.code, 0)
+                self.assertEqual(out.buffer.getvalue(), expected)
+                self.assertIn('encoding="utf-8"', out.getvalue())
+
     def test_opt_directory_short(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.open') as file_open,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse,\
              patch('src.dita.convert.cli.os.makedirs') as make_dir:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                contextlib.redirect_stdout(StringIO()) as out:
+                contextlib.redirect_stdout(BinaryOutput()) as out:
                     cli.run(['-t', 'concept', '-d', 'out', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '')
         make_dir.assert_called_once_with('out')
-        file_open.assert_called_once_with(os.path.join('out', 'topic.dita'), 'w')
-        file_open().__enter__().write.assert_called_once_with('<concept />')
+        file_open.assert_called_once_with(os.path.join('out', 'topic.dita'), 'wb')
+        file_open().__enter__().write.assert_called_once_with(b'<concept />')
 
     def test_opt_directory_long(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.open') as file_open,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse,\
              patch('src.dita.convert.cli.os.makedirs') as make_dir:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                contextlib.redirect_stdout(StringIO()) as out:
+                contextlib.redirect_stdout(BinaryOutput()) as out:
                     cli.run(['-t', 'concept', '--directory', 'out', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '')
         make_dir.assert_called_once_with('out')
-        file_open.assert_called_once_with(os.path.join('out', 'topic.dita'), 'w')
-        file_open().__enter__().write.assert_called_once_with('<concept />')
+        file_open.assert_called_once_with(os.path.join('out', 'topic.dita'), 'wb')
+        file_open().__enter__().write.assert_called_once_with(b'<concept />')
 
     def test_opt_directory_exclusivity(self):
         with self.assertRaises(SystemExit) as cm,\
@@ -280,54 +793,54 @@ class TestDitaCli(unittest.TestCase):
     def test_opt_generated_short(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                      cli.run(['-t', 'concept', '-g', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '<concept />')
-        convert.assert_called_once_with('topic.dita', ANY, 'concept', True)
+        convert.assert_called_once_with('topic.dita', ANY, 'concept', True, validate=False, engine='xslt')
 
     def test_opt_generated_long(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                      cli.run(['-t', 'concept', '--generated', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '<concept />')
-        convert.assert_called_once_with('topic.dita', ANY, 'concept', True)
+        convert.assert_called_once_with('topic.dita', ANY, 'concept', True, validate=False, engine='xslt')
 
     def test_opt_no_generated_short(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                      cli.run(['-t', 'concept', '-G', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '<concept />')
-        convert.assert_called_once_with('topic.dita', ANY, 'concept', False)
+        convert.assert_called_once_with('topic.dita', ANY, 'concept', False, validate=False, engine='xslt')
 
     def test_opt_no_generated_long(self):
         with patch('src.dita.convert.cli.convert') as convert,\
              patch('src.dita.convert.cli.etree.parse') as etree_parse:
-            convert.return_value = '<concept />'
+            convert.return_value = b'<concept />'
 
             with self.assertRaises(SystemExit) as cm,\
-                 contextlib.redirect_stdout(StringIO()) as out:
+                 contextlib.redirect_stdout(BinaryOutput()) as out:
                      cli.run(['-t', 'concept', '--no-generated', 'topic.dita'])
 
         self.assertEqual(cm.exception.code, 0)
         self.assertEqual(out.getvalue().rstrip(), '<concept />')
-        convert.assert_called_once_with('topic.dita', ANY, 'concept', False)
+        convert.assert_called_once_with('topic.dita', ANY, 'concept', False, validate=False, engine='xslt')
 
     def test_opt_generated_exclusivity(self):
         with self.assertRaises(SystemExit) as cm,\
@@ -361,6 +874,15 @@ class TestDitaCli(unittest.TestCase):
         args = cli.parse_args(['-t', 'concept', '-o', '-'])
         self.assertEqual(args.output, sys.stdout)
 
+    def test_warn_collects_messages(self):
+        messages = []
+
+        with contextlib.redirect_stderr(StringIO()) as err:
+            cli.warn('warning: test message', 'topic.dita', messages)
+
+        self.assertEqual(err.getvalue(), '')
+        self.assertEqual(messages, [f'{NAME}: topic.dita: warning: test message'])
+
     def test_fix_element_id_no_attributes(self):
         xml = etree.parse(StringIO('<topic />'))
         element = xml.getroot()
@@ -388,6 +910,46 @@ class TestDitaCli(unittest.TestCase):
         self.assertTrue(element.attrib.has_key('id'))
         self.assertEqual(element.attrib['id'], 'test-id')
 
+    def test_fix_element_id_deterministic(self):
+        def generate(source, file_name='topic.dita', position='1'):
+            element = etree.fromstring(source)
+            cli.fix_element_id(element, file_name, position)
+            return element.attrib['id']
+
+        self.assertEqual(generate('<topic><title>Topic</title></topic>'), generate('<topic><title>Topic</title></topic>'))
+        self.assertEqual(generate('<topic><title>Topic</title></topic>'), generate('<topic><title> <!-- c -->Topic\n</title></topic>'))
+        self.assertEqual(generate('<topic />', './topic.dita'), generate('<topic />', 'topic.dita'))
+        self.assertNotEqual(generate('<topic><title>Topic</title></topic>'), generate('<topic><title>Other</title></topic>'))
+        self.assertNotEqual(generate('<topic />'), generate('<topic />', 'other.dita'))
+        self.assertNotEqual(generate('<topic />'), generate('<topic />', position='2'))
+
+    def test_topic_positions(self):
+        xml = etree.fromstring('<topic><topic><topic/><topic/></topic><body><topic/></body><topic/></topic>')
+
+        self.assertEqual(cli.topic_positions(list(xml.iter('topic'))), ['', '1', '1.1', '1.2', '2', '3'])
+
+    def test_opt_split_topic_reproducible(self):
+        with tempfile.TemporaryDirectory() as directory:
+            name = os.path.join(directory, 'topic.dita')
+            with open(name, 'w') as f:
+                f.write('<topic outputclass="assembly"><title>Topic</title><body>' +
+                        '<section><title>First</title><p>First body</p></section>' +
+                        '<section><title>Second</title><p>Second body</p></section>' +
+                        '</body></topic>')
+
+            outputs = []
+            for options in ([], [], ['--stream']):
+                with self.assertRaises(SystemExit) as cm,\
+                     contextlib.redirect_stderr(StringIO()):
+                    cli.run(['-s', *options, '-d', os.path.join(directory, str(len(outputs))), name])
+
+                self.assertEqual(cm.exception.code, 0)
+                outputs.append({f: open(os.path.join(directory, str(len(outputs)), f)).read() for f in os.listdir(os.path.join(directory, str(len(outputs))))})
+
+        self.assertEqual(len(outputs[0]), 4)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[0], outputs[2])
+
     def test_fix_element_outputclass_no_attributes(self):
         xml = etree.parse(StringIO('<topic />'))
         element = xml.getroot()
@@ -0,0 +1,146 @@
+import unittest
+import contextlib
+import os
+import tempfile
+import threading
+from io import StringIO
+from lxml import etree
+from src.dita.convert import cli, daemon
+
+class TestDitaConvertDaemon(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.address   = os.path.join(self.directory.name, 'dita-convert.sock')
+        self.server    = daemon.Server(self.address)
+        self.thread    = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.close()
+        self.thread.join()
+        self.directory.cleanup()
+
+    def write_topic(self, contents):
+        path = os.path.join(self.directory.name, 'topic.dita')
+        with open(path, 'w') as f:
+            f.write(contents)
+        return path
+
+    def test_socket_is_private(self):
+        self.assertEqual(os.stat(self.address).st_mode & 0o777, 0o600)
+
+    def test_convert_matches_local_conversion(self):
+        path = self.write_topic('''\
+        <topic id="example-topic" outputclass="procedure">
+            <title>Topic title</title>
+            <body>
+                <ol>
+                    <li>First step</li>
+                </ol>
+            </body>
+        </topic>
+        ''')
+
+        client = daemon.Client(self.address)
+
+        with contextlib.redirect_stderr(StringIO()) as err:
+            remote = client.convert(path, None, False)
+            local  = bytes(cli.convert(path, etree.parse(path), None, False))
+
+        client.close()
+
+        self.assertEqual(remote, local)
+        self.assertEqual(err.getvalue(), '')
+
+    def test_concurrent_clients(self):
+        path = self.write_topic('''\
+        <topic id="example-topic" outputclass="concept">
+            <title>Topic title</title>
+        </topic>
+        ''')
+
+        # The first client keeps its connection open:
+        first  = daemon.Client(self.address)
+        first.convert(path, None, False)
+
+        # The second client is served while the first one is connected:
+        second = daemon.Client(self.address)
+        second.socket.settimeout(10)
+        output = second.convert(path, None, False)
+
+        second.close()
+        first.close()
+
+        self.assertRegex(output.decode('utf-8'), r'<concept id="example-topic"')
+
+    def test_close_interrupts_open_connections(self):
+        path = self.write_topic('<topic id="example-topic" outputclass="concept"><title>Topic title</title></topic>')
+
+        client = daemon.Client(self.address)
+        client.socket.settimeout(10)
+        client.convert(path, None, False)
+
+        self.server.close()
+        self.thread.join()
+
+        self.assertEqual(client.socket.recv(1), b'')
+        client.close()
+
+    def test_convert_reports_warnings(self):
+        path = self.write_topic('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+        </topic>
+        ''')
+
+        client = daemon.Client(self.address)
+
+        with contextlib.redirect_stderr(StringIO()) as err:
+            client.convert(path, None, False)
+
+        client.close()
+
+        self.assertRegex(err.getvalue(), r'topic\.dita: warning: outputclass not found')
+
+    def test_convert_reports_errors(self):
+        path = self.write_topic('''\
+        <concept id="example-concept">
+            <title>Concept title</title>
+        </concept>
+        ''')
+
+        client = daemon.Client(self.address)
+
+        with self.assertRaises(Exception) as cm:
+            client.convert(path, 'concept', False)
+
+        client.close()
+
+        self.assertEqual(str(cm.exception), 'ERROR: Not a DITA topic')
+
+    def test_convert_reports_supplied_file_name(self):
+        path = os.path.relpath(os.path.join(self.directory.name, 'missing.dita'))
+
+        client = daemon.Client(self.address)
+
+        with self.assertRaises(Exception) as remote:
+            client.convert(path, None, False)
+        with self.assertRaises(Exception) as local:
+            cli.parse_and_convert(path, None, False)
+
+        client.close()
+
+        self.assertEqual(str(remote.exception), str(local.exception))
+
+    def test_stale_socket_is_replaced(self):
+        self.server.close()
+        self.thread.join()
+
+        with open(self.address, 'w'):
+            pass
+
+        self.server = daemon.Server(self.address)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.assertTrue(daemon.Server.is_running(self.address))
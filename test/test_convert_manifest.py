@@ -0,0 +1,109 @@
+import unittest
+import os
+import tempfile
+from src.dita.convert import manifest
+
+class TestDitaConvertManifest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source    = os.path.join(self.directory.name, 'topic.dita')
+        self.target    = os.path.join(self.directory.name, 'out')
+
+        os.makedirs(self.target)
+        with open(self.source, 'w') as f:
+            f.write('<topic id="topic"><title>Topic</title></topic>')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, options=['convert', None, False]):
+        m = manifest.Manifest(self.target, options)
+        self.assertFalse(m.is_current(self.source))
+        with open(os.path.join(self.target, 'topic.dita'), 'w') as f:
+            f.write('<concept/>')
+        m.update(self.source, ['topic.dita'])
+        m.save()
+
+    def test_new_file_is_not_current(self):
+        m = manifest.Manifest(self.target, ['convert', None, False])
+
+        self.assertFalse(m.is_current(self.source))
+        self.assertFalse(m.is_current(os.path.join(self.directory.name, 'missing.dita')))
+
+    def test_recorded_file_is_current(self):
+        self.record()
+
+        self.assertTrue(manifest.Manifest(self.target, ['convert', None, False]).is_current(self.source))
+
+    def test_touched_file_is_current(self):
+        self.record()
+        os.utime(self.source, (1, 1))
+        m = manifest.Manifest(self.target, ['convert', None, False])
+
+        self.assertTrue(m.is_current(self.source))
+        self.assertTrue(m.changed)
+
+    def test_modified_file_is_not_current(self):
+        self.record()
+        with open(self.source, 'w') as f:
+            f.write('<topic id="topic"><title>Changed</title></topic>')
+
+        self.assertFalse(manifest.Manifest(self.target, ['convert', None, False]).is_current(self.source))
+
+    def test_missing_output_is_not_current(self):
+        self.record()
+        os.unlink(os.path.join(self.target, 'topic.dita'))
+
+        self.assertFalse(manifest.Manifest(self.target, ['convert', None, False]).is_current(self.source))
+
+    def test_changed_options_invalidate_manifest(self):
+        self.record()
+
+        self.assertFalse(manifest.Manifest(self.target, ['convert', 'task', False]).is_current(self.source))
+
+    def test_changed_fingerprint_invalidates_manifest(self):
+        self.record()
+        m = manifest.Manifest(self.target, ['convert', None, False])
+        m.fingerprint = 'different'
+        m.changed = True
+        m.save()
+
+        self.assertFalse(manifest.Manifest(self.target, ['convert', None, False]).is_current(self.source))
+
+    def test_unchanged_output(self):
+        m = manifest.Manifest(self.target, ['split', False])
+        self.assertFalse(m.is_current(self.source))
+        with open(os.path.join(self.target, 'topic.dita'), 'w') as f:
+            f.write('<concept/>')
+        m.update(self.source, ['topic.dita'], {'topic.dita': manifest.content_digest(b'<concept/>')})
+        m.save()
+        m = manifest.Manifest(self.target, ['split', False])
+
+        self.assertTrue(m.is_unchanged(self.source, 'topic.dita', manifest.content_digest(b'<concept/>')))
+        self.assertFalse(m.is_unchanged(self.source, 'topic.dita', manifest.content_digest(b'<task/>')))
+        self.assertFalse(m.is_unchanged(self.source, 'other.dita', manifest.content_digest(b'<concept/>')))
+
+        os.unlink(os.path.join(self.target, 'topic.dita'))
+        self.assertFalse(m.is_unchanged(self.source, 'topic.dita', manifest.content_digest(b'<concept/>')))
+
+    def test_update_returns_stale_outputs(self):
+        other = os.path.join(self.directory.name, 'other.dita')
+        with open(other, 'w') as f:
+            f.write('<topic id="other"><title>Other</title></topic>')
+
+        m = manifest.Manifest(self.target, ['split', False])
+        for source, outputs in ((self.source, ['topic.dita', 'first.dita', 'shared.dita']), (other, ['other.dita', 'shared.dita'])):
+            self.assertFalse(m.is_current(source))
+            self.assertEqual(m.update(source, outputs), [])
+
+        with open(self.source, 'w') as f:
+            f.write('<topic id="topic"><title>Changed</title></topic>')
+
+        self.assertFalse(m.is_current(self.source))
+        self.assertEqual(m.update(self.source, ['topic.dita']), ['first.dita'])
+
+    def test_invalid_manifest_is_ignored(self):
+        with open(os.path.join(self.target, manifest.MANIFEST_FILE), 'w') as f:
+            f.write('invalid')
+
+        self.assertFalse(manifest.Manifest(self.target, ['convert', None, False]).is_current(self.source))
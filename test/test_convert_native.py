@@ -0,0 +1,369 @@
+import unittest
+import sys
+import threading
+from io import BytesIO, StringIO
+from unittest.mock import patch
+from lxml import etree
+from src.dita.convert import native, transform
+from test import test_convert_to_concept, test_convert_to_reference, test_convert_to_task, \
+                 test_convert_to_concept_generated, test_convert_to_reference_generated, \
+                 test_convert_to_single_topic, test_convert_to_single_map
+
+class TestDitaConvertNativeConcept(test_convert_to_concept.TestDitaConvertToConcept):
+    def setUp(self):
+        patcher = patch.object(transform, 'to_concept', native.to_concept)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+class TestDitaConvertNativeReference(test_convert_to_reference.TestDitaConvertToReference):
+    def setUp(self):
+        patcher = patch.object(transform, 'to_reference', native.to_reference)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_large_reference_is_native(self):
+        blocks = '<p>Option</p><codeblock>Code</codeblock><section><p>Section</p></section>' * 2000
+        reference = transform.to_reference(etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}</body></topic>')))
+
+        self.assertIsInstance(reference, native.ResultTree)
+        self.assertEqual(reference.xpath('count(/reference/refbody/section)'), 4000)
+
+class TestDitaConvertNativeTask(test_convert_to_task.TestDitaConvertToTask):
+    def setUp(self):
+        patcher = patch.object(transform, 'to_task', native.to_task)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_large_step_is_native(self):
+        blocks = '<p>Information</p><ol><li>Substep</li></ol><codeblock>Code</codeblock><example><p>Example</p></example>' * 1600
+        task = transform.to_task(etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body><ol><li>Step{blocks}</li></ol></body></topic>')))
+
+        self.assertIsInstance(task, native.ResultTree)
+        self.assertEqual(task.xpath('count(//steps/step/info)'), 3200)
+        self.assertEqual(task.xpath('count(//steps/step/substeps)'), 1600)
+        self.assertEqual(task.xpath('count(//steps/step/stepxmp)'), 1600)
+
+    def test_large_body_is_native(self):
+        blocks = '<p>Paragraph</p>' * 4000
+        task = transform.to_task(etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}<ol><li>Step</li></ol>{blocks}<example><p>Example</p></example>{blocks}</body></topic>')))
+
+        self.assertIsInstance(task, native.ResultTree)
+        self.assertEqual(task.xpath('count(/task/taskbody/context/p)'), 4000)
+        self.assertEqual(task.xpath('count(/task/taskbody/result/p)'), 4000)
+        self.assertEqual(task.xpath('count(/task/taskbody/postreq/p)'), 4000)
+
+class TestDitaConvertNativeConceptGenerated(test_convert_to_concept_generated.TestDitaConvertToConcept):
+    def setUp(self):
+        patcher = patch.object(transform, 'to_concept_generated', native.to_concept_generated)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_large_concept_is_native(self):
+        blocks = '<p>Paragraph</p><section><title>Section</title><p>Section</p></section>' * 4000
+        links = '<p outputclass="title"><b>Additional resources</b></p><ul>' + '<li><xref href="http://example.com" /></li>' * 2000 + '</ul>'
+        concept = transform.to_concept_generated(etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}{links}</body></topic>')))
+
+        self.assertIsInstance(concept, native.ResultTree)
+        self.assertEqual(concept.xpath('count(/concept/conbody/section)'), 4000)
+        self.assertEqual(concept.xpath('count(/concept/related-links/link)'), 2000)
+
+class TestDitaConvertNativeReferenceGenerated(test_convert_to_reference_generated.TestDitaConvertToReference):
+    def setUp(self):
+        patcher = patch.object(transform, 'to_reference_generated', native.to_reference_generated)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_large_reference_is_native(self):
+        blocks = '<p>Paragraph</p><section><title>Section</title><p>Section</p></section>' * 4000
+        links = '<p outputclass="title"><b>Additional resources</b></p><ul>' + '<li><xref href="http://example.com" /></li>' * 2000 + '</ul>'
+        reference = transform.to_reference_generated(etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}{links}</body></topic>')))
+
+        self.assertIsInstance(reference, native.ResultTree)
+        self.assertEqual(reference.xpath('count(/reference/refbody/section[title])'), 4000)
+        self.assertEqual(reference.xpath('count(/reference/related-links/link)'), 2000)
+
+class TestDitaConvertNativeSingleTopic(test_convert_to_single_topic.TestDitaConvertToSingleTopic):
+    def setUp(self):
+        patcher = patch.object(transform, 'to_single_topic', native.to_single_topic)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+class TestDitaConvertNativeSingleMap(test_convert_to_single_map.TestDitaConvertToSingleMap):
+    def setUp(self):
+        patcher = patch.object(transform, 'to_single_map', native.to_single_map)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+class TestDitaConvertNative(unittest.TestCase):
+    def parse(self, source):
+        return etree.parse(StringIO(source))
+
+    def test_output_matches_xslt(self):
+        source = '''\
+        <!-- A leading comment -->
+        <topic id="example-topic" outputclass="procedure" xml:lang="en-us">
+            <title>Topic title</title>
+            <body outputclass="body">
+                <p>Topic introduction</p>
+                <ol id="steps">
+                    <li outputclass="step">First <b>step</b><!-- comment -->
+                        <p>Step information</p>
+                    </li>
+                    <li>
+                        <p props="x" outputclass="cmd">Second step</p>
+                        <ol>
+                            <li><uicontrol>Substep</uicontrol></li>
+                        </ol>
+                        <example><title>Example title</title><codeblock>
+  preformatted  </codeblock></example>
+                    </li>
+                </ol>
+                <p>Task result</p>
+                <example outputclass="example"><title>Example</title>text<p>Task example</p></example>
+                <p>Task postreq</p>
+            </body>
+        </topic>
+        <?pi trailing?>
+        '''
+
+        xslt   = transform.to_task(self.parse(source))
+        result = native.to_task(self.parse(source))
+
+        self.assertIsInstance(result, native.ResultTree)
+        self.assertEqual(str(result), str(xslt))
+        self.assertEqual(bytes(result), bytes(xslt))
+
+        output = BytesIO()
+        result.write_output(output)
+        self.assertEqual(output.getvalue(), bytes(xslt))
+        self.assertEqual([error.message for error in native.to_task.error_log],
+                         ['WARNING: Title found in stepxmp, skipping...'])
+
+    def test_converts_in_place(self):
+        xml = self.parse('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body>
+                <ol>
+                    <li>Step</li>
+                </ol>
+            </body>
+        </topic>
+        ''')
+
+        task = native.to_task(xml)
+
+        self.assertIs(task.getroot(), xml.getroot())
+        self.assertEqual(xml.getroot().tag, 'task')
+        self.assertTrue(task.xpath('boolean(/task/taskbody/steps/step/cmd[text()="Step"])'))
+        self.assertEqual(native.to_task.error_log, [])
+
+    def test_error_log_is_per_thread(self):
+        source = '<topic id="example-topic"><title>Topic title</title><body><ol><li><p>Step</p><example><title>Title</title></example></li></ol></body></topic>'
+        logs   = []
+
+        def run():
+            native.to_task(self.parse(source))
+            logs.append(native.to_task.error_log)
+            native.evaluate(self.parse(source), 'count(//li)')
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        native.to_task(self.parse('<topic id="example-topic"><title>Topic title</title></topic>'))
+
+        self.assertEqual([error.message for error in logs[0]], ['WARNING: Title found in stepxmp, skipping...'])
+        self.assertEqual(native.to_task.error_log, [])
+
+        # The warnings of the finished thread are released with it:
+        self.assertEqual(sys.getrefcount(logs[0]), 2)
+
+    def test_unsupported_document_uses_xslt(self):
+        xml = self.parse('''\
+        <topic id="example-topic" xmlns:x="http://example.com/">
+            <title>Topic title</title>
+            <body>
+                <ol>
+                    <li x:attr="value">Step</li>
+                </ol>
+            </body>
+        </topic>
+        ''')
+
+        task = native.to_task(xml)
+
+        self.assertNotIsInstance(task, native.ResultTree)
+        self.assertEqual(xml.getroot().tag, 'topic')
+        self.assertTrue(task.xpath('boolean(/task/taskbody/steps/step/cmd)'))
+
+    def test_unsupported_document_reports_errors(self):
+        xml = self.parse('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body>
+                <section />
+            </body>
+        </topic>
+        ''')
+
+        with self.assertRaises(etree.XSLTApplyError) as cm:
+            native.to_task(xml)
+
+        self.assertEqual(str(cm.exception), 'ERROR: Section not allowed in a DITA task')
+
+    def test_element_uses_xslt(self):
+        xml = etree.fromstring('<topic id="example-topic"><title>Topic title</title></topic>')
+
+        task = native.to_task(xml)
+
+        self.assertNotIsInstance(task, native.ResultTree)
+        self.assertTrue(task.xpath('boolean(/task)'))
+
+    def test_generated_output_matches_xslt(self):
+        source = '''\
+        <topic id="example-topic" outputclass="concept">
+            <title>Topic title</title>
+            <body outputclass="body">
+                <p outputclass="abstract" id="abstract" props="x">Topic <b>abstract</b></p>
+                <p>Topic introduction</p>
+                <section id="section"><title>Section title</title><!-- comment --><p>Section</p></section>
+                <example><p>Example</p></example>
+                <p>Text after the example</p>
+                <p outputclass="title"><b>Additional resources</b></p>
+                <ul id="additional-resources">
+                    <li><xref href="http://example.com" format="html" scope="external">Example <b>link</b></xref></li>
+                    <li>Text <xref href="topic.dita" /></li>
+                    <li>Unsupported content</li>
+                </ul>
+            </body>
+        </topic>
+        '''
+
+        for name in ('to_concept_generated', 'to_reference_generated'):
+            with self.subTest(name=name):
+                xslt   = getattr(transform, name)
+                result = getattr(native, name)
+
+                expected = xslt(self.parse(source))
+                output   = result(self.parse(source))
+
+                self.assertIsInstance(output, native.ResultTree)
+                self.assertEqual(str(output), str(expected))
+                self.assertEqual([error.message for error in result.error_log],
+                                 [error.message for error in xslt.error_log])
+                self.assertEqual(result.error_log.last_error.message,
+                                 'WARNING: Unexpected content found in related-links, skipping...')
+
+    def test_generated_unsupported_document_uses_xslt(self):
+        xml = self.parse('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body>
+                <section><section /></section>
+            </body>
+        </topic>
+        ''')
+
+        concept = native.to_concept_generated(xml)
+
+        self.assertNotIsInstance(concept, native.ResultTree)
+        self.assertEqual(xml.getroot().tag, 'topic')
+        self.assertEqual(native.to_concept_generated.error_log.last_error.message,
+                         'WARNING: Nested sections not allowed in DITA, skipping...')
+
+    def test_plain_output_matches_xslt(self):
+        source = '''\
+        <!-- A leading comment -->
+        <topic id="example-topic" outputclass="reference">
+            <title>Topic title</title>
+            <body outputclass="body">
+                <p>Topic <b>introduction</b><!-- comment --></p>
+                <section id="section"><title>Section title</title><p>Section</p></section>
+                <codeblock>
+  preformatted  </codeblock>
+                <example><p>Example</p></example>
+                <dl><dlentry><dt>Term</dt><dd>Description</dd></dlentry></dl>
+            </body>
+        </topic>
+        <?pi trailing?>
+        '''
+
+        for name in ('to_concept', 'to_reference'):
+            with self.subTest(name=name):
+                xslt   = getattr(transform, name)(self.parse(source))
+                result = getattr(native, name)(self.parse(source))
+
+                self.assertIsInstance(result, native.ResultTree)
+                self.assertEqual(str(result), str(xslt))
+                self.assertEqual(bytes(result), bytes(xslt))
+
+    def test_single_map_output_matches_xslt(self):
+        source = '''\
+        <topic id="example-topic" outputclass="assembly">
+            <title>Topic title</title>
+            <body>
+                <topic id="ignored-topic" />
+            </body>
+            <topic id="first-topic" outputclass="procedure" props="x">
+                <topic outputclass="reference" />
+            </topic>
+            Text
+            <topic id="second-topic" outputclass="concept|task" />
+        </topic>
+        '''
+
+        xslt   = transform.to_single_map(self.parse(source))
+        result = native.to_single_map(self.parse(source))
+
+        self.assertIsInstance(result, native.ResultTree)
+        self.assertEqual(str(result), str(xslt))
+        self.assertEqual(bytes(result), bytes(xslt))
+
+    def test_single_topic_output_matches_xslt(self):
+        source = '''\
+        <!-- A leading comment -->
+        <topic id="example-topic" outputclass="assembly">
+            <title>Topic title</title>
+            <shortdesc>Topic summary</shortdesc>
+            <body outputclass="body">
+                <p>Topic introduction</p>
+                <section id="section" props="x">
+                    <p>Section <b>introduction</b></p>
+                    <title outputclass="title">Section <!-- comment -->title</title>
+                    <codeblock>
+  preformatted  </codeblock>
+                    <section>
+                        <p>Nested section</p>
+                    </section>
+                    <p>Dropped content</p>
+                </section>
+                <p>Dropped content</p>
+            </body>
+            <related-links />
+        </topic>
+        '''
+
+        xslt   = transform.to_single_topic(self.parse(source))
+        result = native.to_single_topic(self.parse(source))
+
+        self.assertIsInstance(result, native.ResultTree)
+        self.assertEqual(str(result), str(xslt))
+        self.assertEqual(bytes(result), bytes(xslt))
+
+    def test_single_topic_deep_nesting(self):
+        source = '<section><title>Section</title><p>Content</p>' * 100 + '</section>' * 100
+
+        topic = native.to_single_topic(self.parse(f'<topic id="example-topic"><title>Topic title</title><body>{source}</body></topic>'))
+
+        self.assertIsInstance(topic, native.ResultTree)
+        self.assertEqual(len(list(topic.iter('topic'))), 101)
+        self.assertEqual(topic.xpath('count(//topic/body/p)'), 100)
+
+    def test_transformers(self):
+        self.assertIs(native.TRANSFORMERS[(False, 'concept')], native.to_concept)
+        self.assertIs(native.TRANSFORMERS[(False, 'reference')], native.to_reference)
+        self.assertIs(native.TRANSFORMERS[(False, 'task')], native.to_task)
+        self.assertIs(native.TRANSFORMERS[(True, 'concept')], native.to_concept_generated)
+        self.assertIs(native.TRANSFORMERS[(True, 'reference')], native.to_reference_generated)
+        self.assertIs(native.TRANSFORMERS[(False, 'single_topic')], native.to_single_topic)
+        self.assertIs(native.TRANSFORMERS[(True, 'single_map')], native.to_single_map)
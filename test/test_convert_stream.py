@@ -0,0 +1,127 @@
+import unittest
+import os
+import tempfile
+from src.dita.convert import cli, stream
+
+class TestDitaConvertStream(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.source    = os.path.join(self.directory.name, 'topic.dita')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def split(self, source, generated=False):
+        with open(self.source, 'w') as f:
+            f.write(source)
+
+        files = {}
+        def write(file_name, content):
+            files[file_name] = content
+            return True
+
+        names, success = stream.split_stream(self.source, generated, write, [])
+
+        self.assertEqual(names, list(files))
+        return files, success
+
+    def assertSplitsLikeFile(self, source, generated=False):
+        files, success = self.split(source, generated)
+        expected, expected_success = cli.split_file(self.source, None, generated, [])
+
+        self.assertEqual(success, expected_success)
+        self.assertEqual(files, dict(expected))
+        return files
+
+    def test_nested_sections(self):
+        files = self.assertSplitsLikeFile('''\
+<topic id="topic" outputclass="assembly">
+  <title>Topic</title>
+  <shortdesc>Summary</shortdesc>
+  <body props="body">
+    <p>Topic body</p>
+    <section id="first">
+      <title>First <b>section</b><!-- comment --></title>
+      <p>First body</p>
+      <section id="second" outputclass="procedure">
+        <title>Second</title>
+        <ol><li>Step</li></ol>
+      </section>
+      <p>Dropped</p>
+    </section>
+    <p>Dropped</p>
+    <section id="third" outputclass="reference">
+      <title>Third</title>
+      <p>Third body</p>
+    </section>
+  </body>
+  <related-links/>
+</topic>
+''')
+
+        self.assertEqual(list(files), ['topic.dita', 'first.dita', 'second.dita', 'third.dita', 'topic.ditamap'])
+
+    def test_late_title(self):
+        files = self.assertSplitsLikeFile('''\
+<topic id="topic">
+  <title>Topic</title>
+  <body>
+    <section id="first">
+      <p>First body</p>
+      <section id="second"><title>Second</title></section>
+      <p>Dropped</p>
+      <title>First</title>
+    </section>
+  </body>
+</topic>
+''')
+
+        self.assertEqual(list(files), ['topic.dita', 'second.dita', 'first.dita', 'topic.ditamap'])
+
+    def test_missing_ids(self):
+        files = self.assertSplitsLikeFile('<topic><title>Topic</title><body><section outputclass="snippet"><title>First</title><section/></section></body></topic>')
+
+        self.assertEqual(len(files), 4)
+
+    def test_no_sections(self):
+        self.assertSplitsLikeFile('<topic id="topic"><title>Topic</title><body><p>Topic body</p></body></topic>')
+        self.assertSplitsLikeFile('<topic id="topic"><title>Topic</title></topic>')
+
+    def test_generated(self):
+        self.assertSplitsLikeFile('<topic id="topic"><title>Topic</title><body><section id="first" outputclass="reference"><title>First</title><p outputclass="abstract">Abstract</p></section></body></topic>', True)
+
+    def test_unsupported_documents(self):
+        for source in ('<topic id="topic" xmlns:x="x"><title>Topic</title><body><section id="first"><title>First</title></section></body></topic>',
+                       '<topic id="topic"><title>Topic</title><body><section id="first"><title>First</title><title>Second</title></section></body></topic>',
+                       '<topic id="topic"><title>Topic</title><body><section id="first"><title>First</title><p xml:space="preserve">Text</p></section></body></topic>',
+                       '<topic id="topic"><title>Topic</title><body><section id="first"><title>First</title></section><topic id="second"><title>Second</title></topic></body></topic>',
+                       '<topic id="topic"><title>Topic</title><body/><body/></topic>'):
+            with open(self.source, 'w') as f:
+                f.write(source)
+
+            self.assertFalse(stream.is_supported(self.source))
+            self.assertSplitsLikeFile(source)
+
+    def test_supported_document(self):
+        with open(self.source, 'w') as f:
+            f.write('<topic id="topic"><title>Topic</title><body><section id="first"><title>First</title><section><title>Second</title></section></section></body></topic>')
+
+        self.assertTrue(stream.is_supported(self.source))
+
+    def test_invalid_file(self):
+        files, success = self.split('<topic id="topic"><title>Topic</title><body><section id="first"><title>First</title></section>')
+
+        self.assertFalse(success)
+        self.assertEqual(files, {})
+
+    def test_write_error(self):
+        with open(self.source, 'w') as f:
+            f.write('<topic id="topic"><title>Topic</title><body><section id="first"><title>First</title></section></body></topic>')
+
+        names, success = stream.split_stream(self.source, False, lambda file_name, content: file_name != 'first.dita', [])
+
+        self.assertFalse(success)
+        self.assertEqual(names, ['topic.dita', 'topic.ditamap'])
+
+if __name__ == '__main__':
+    unittest.main()
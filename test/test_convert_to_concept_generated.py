@@ -432,3 +432,16 @@ class TestDitaConvertToConcept(unittest.TestCase):
 
         self.assertTrue(concept.xpath('boolean(//related-links[@id="additional-resources"])'))
         self.assertTrue(concept.xpath('boolean(//related-links/link[@id="external-link"])'))
+
+    def test_large_concept(self):
+        blocks = '<p>Paragraph</p><section><title>Section</title><p>Section</p></section>' * 4000
+        links = '<p outputclass="title"><b>Additional resources</b></p><ul>' + '<li><xref href="http://example.com" /></li>' * 2000 + '</ul>'
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}{links}</body></topic>'))
+
+        concept = transform.to_concept_generated(xml)
+
+        self.assertEqual(concept.xpath('count(/concept/conbody/*)'), 8000)
+        self.assertEqual(concept.xpath('count(/concept/conbody/p[text()="Paragraph"])'), 4000)
+        self.assertEqual(concept.xpath('count(/concept/conbody/section[title="Section"][p="Section"])'), 4000)
+        self.assertFalse(concept.xpath('boolean(/concept/conbody//p[@outputclass="title"])'))
+        self.assertEqual(concept.xpath('count(/concept/related-links/link[@href="http://example.com"])'), 2000)
@@ -76,3 +76,50 @@ class TestDitaConvertToReference(unittest.TestCase):
         self.assertTrue(reference.xpath('boolean(/reference/refbody/example[2]/p[text()="Second example"])'))
         self.assertTrue(reference.xpath('boolean(/reference/refbody/section[3]/p[text()="First section"])'))
         self.assertTrue(reference.xpath('boolean(/reference/refbody/section[4]/p[text()="Fourth paragraph"])'))
+
+    def test_reference_structure_attributes(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body outputclass="example-body">
+                <p>First paragraph</p>
+                <section>
+                    <p>First section</p>
+                </section>
+                <section>
+                    <p>Second section</p>
+                </section>
+            </body>
+        </topic>
+        '''))
+
+        reference = transform.to_reference(xml)
+
+        self.assertEqual(reference.xpath('count(/reference/refbody/*)'), 3)
+        self.assertFalse(reference.xpath('boolean(/reference/refbody/section/@outputclass)'))
+        self.assertTrue(reference.xpath('boolean(/reference/refbody/section[1]/p[text()="First paragraph"])'))
+        self.assertTrue(reference.xpath('boolean(/reference/refbody/section[2]/p[text()="First section"])'))
+        self.assertTrue(reference.xpath('boolean(/reference/refbody/section[3]/p[text()="Second section"])'))
+
+    def test_large_reference(self):
+        paragraphs = '<p>Paragraph</p>' * 2500
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body><section><p>First section</p></section>{paragraphs}<example><p>Example</p></example>{paragraphs}<section><p>Second section</p></section></body></topic>'))
+
+        reference = transform.to_reference(xml)
+
+        self.assertEqual(reference.xpath('count(/reference/refbody/*)'), 5)
+        self.assertTrue(reference.xpath('boolean(/reference/refbody/*[1][self::section]/p[text()="First section"])'))
+        self.assertEqual(reference.xpath('count(/reference/refbody/*[2][self::section]/p)'), 2500)
+        self.assertTrue(reference.xpath('boolean(/reference/refbody/*[3][self::example]/p[text()="Example"])'))
+        self.assertEqual(reference.xpath('count(/reference/refbody/*[4][self::section]/p)'), 2500)
+        self.assertTrue(reference.xpath('boolean(/reference/refbody/*[5][self::section]/p[text()="Second section"])'))
+
+    def test_reference_with_many_sections(self):
+        blocks = '<p>Option</p><codeblock>Code</codeblock><section><p>Section</p></section>' * 2000
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}</body></topic>'))
+
+        reference = transform.to_reference(xml)
+
+        self.assertEqual(reference.xpath('count(/reference/refbody/section)'), 4000)
+        self.assertEqual(reference.xpath('count(/reference/refbody/section[p[text()="Option"]][codeblock[text()="Code"]])'), 2000)
+        self.assertEqual(reference.xpath('count(/reference/refbody/section[p[text()="Section"]])'), 2000)
@@ -476,3 +476,16 @@ class TestDitaConvertToReference(unittest.TestCase):
 
         self.assertTrue(reference.xpath('boolean(//related-links[@id="additional-resources"])'))
         self.assertTrue(reference.xpath('boolean(//related-links/link[@id="external-link"])'))
+
+    def test_large_reference(self):
+        blocks = '<p>Paragraph</p><section><title>Section</title><p>Section</p></section>' * 4000
+        links = '<p outputclass="title"><b>Additional resources</b></p><ul>' + '<li><xref href="http://example.com" /></li>' * 2000 + '</ul>'
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}{links}</body></topic>'))
+
+        reference = transform.to_reference_generated(xml)
+
+        self.assertEqual(reference.xpath('count(/reference/refbody/*[*])'), 8000)
+        self.assertEqual(reference.xpath('count(/reference/refbody/section[not(title)][p="Paragraph"])'), 4000)
+        self.assertEqual(reference.xpath('count(/reference/refbody/section[title="Section"][p="Section"])'), 4000)
+        self.assertFalse(reference.xpath('boolean(/reference/refbody//p[@outputclass="title"])'))
+        self.assertEqual(reference.xpath('count(/reference/related-links/link[@href="http://example.com"])'), 2000)
@@ -331,6 +331,144 @@ class TestDitaConvertToTask(unittest.TestCase):
         self.assertTrue(task.xpath('boolean(//steps/step/stepxmp[2][text()="Additional example"])'))
         self.assertTrue(task.xpath('boolean(//steps/step/info[3]/p[text()="Step summary"])'))
 
+    def test_stepxmp_before_substeps(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body>
+                <ol>
+                    <li>
+                        <p>Step introduction</p>
+                        <p>Step explanation</p>
+                        <example>First step example</example>
+                        <ol>
+                            <li>Substep</li>
+                        </ol>
+                        <p>Step summary</p>
+                        <example>Second step example</example>
+                    </li>
+                </ol>
+            </body>
+        </topic>
+        '''))
+
+        task = transform.to_task(xml)
+
+        self.assertEqual(task.xpath('name(//steps/step/*[2])'), 'info')
+        self.assertEqual(task.xpath('count(//steps/step/info[1]/*)'), 1)
+        self.assertTrue(task.xpath('boolean(//steps/step/*[3][self::stepxmp][text()="First step example"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[4][self::substeps]/substep/cmd[text()="Substep"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[5][self::info]/p[text()="Step summary"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[6][self::stepxmp][text()="Second step example"])'))
+        self.assertEqual(task.xpath('count(//steps/step/*)'), 6)
+        self.assertEqual(task.xpath('count(//p[text()="Step summary"])'), 1)
+
+    def test_text_between_substeps(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body>
+                <ol>
+                    <li><p>Step introduction</p><ol><li>First substep</li></ol>Text between substeps<ol><li>Second substep</li></ol>Text after substeps</li>
+                </ol>
+            </body>
+        </topic>
+        '''))
+
+        task = transform.to_task(xml)
+
+        self.assertTrue(task.xpath('boolean(//steps/step/*[2][self::substeps]/substep/cmd[text()="First substep"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[3][self::info][text()="Text between substeps"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[4][self::substeps]/substep/cmd[text()="Second substep"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[5][self::info][text()="Text after substeps"])'))
+        self.assertEqual(task.xpath('count(//steps/step/*)'), 5)
+
+    def test_text_after_example_and_substeps(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body>
+                <ol>
+                    <li>Step<example><p>Example</p></example><ol><li>Substep</li></ol>Text after substeps</li>
+                </ol>
+            </body>
+        </topic>
+        '''))
+
+        task = transform.to_task(xml)
+
+        self.assertTrue(task.xpath('boolean(//steps/step/*[2][self::stepxmp]/p[text()="Example"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[3][self::substeps]/substep/cmd[text()="Substep"])'))
+        self.assertTrue(task.xpath('boolean(//steps/step/*[4][self::info][text()="Text after substeps"])'))
+        self.assertEqual(task.xpath('count(//steps/step/*)'), 4)
+
+    def test_list_after_example_in_substep(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-topic">
+            <title>Topic title</title>
+            <body>
+                <ol>
+                    <li>Step<ol><li>Substep<example><p>Example</p></example><ol><li>List item</li></ol></li></ol></li>
+                </ol>
+            </body>
+        </topic>
+        '''))
+
+        task = transform.to_task(xml)
+
+        self.assertTrue(task.xpath('boolean(//substeps/substep/*[1][self::cmd][text()="Substep"])'))
+        self.assertTrue(task.xpath('boolean(//substeps/substep/*[2][self::stepxmp]/p[text()="Example"])'))
+        self.assertTrue(task.xpath('boolean(//substeps/substep/*[3][self::info]/ol/li[text()="List item"])'))
+        self.assertEqual(task.xpath('count(//substeps/substep/*)'), 3)
+
+    def test_large_step(self):
+        paragraphs = '<p>Information</p>' * 2000
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body><ol><li>Step{paragraphs}<example><p>Example</p></example>{paragraphs}</li></ol></body></topic>'))
+
+        task = transform.to_task(xml)
+
+        self.assertEqual(task.xpath('count(//steps/step/*)'), 4)
+        self.assertEqual(task.xpath('count(//steps/step/*[2][self::info]/p)'), 2000)
+        self.assertTrue(task.xpath('boolean(//steps/step/*[3][self::stepxmp]/p[text()="Example"])'))
+        self.assertEqual(task.xpath('count(//steps/step/*[4][self::info]/p)'), 2000)
+
+    def test_step_with_many_substeps(self):
+        blocks = '<p>Information</p><ol><li>Substep</li></ol><codeblock>Code</codeblock><example><p>Example</p></example>' * 1600
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body><ol><li>Step{blocks}</li></ol></body></topic>'))
+
+        task = transform.to_task(xml)
+
+        self.assertEqual(task.xpath('count(//steps/step/*)'), 6401)
+        self.assertEqual(task.xpath('count(//steps/step/info[p])'), 1600)
+        self.assertEqual(task.xpath('count(//steps/step/substeps)'), 1600)
+        self.assertEqual(task.xpath('count(//steps/step/info[codeblock])'), 1600)
+        self.assertEqual(task.xpath('count(//steps/step/*[position() mod 4 = 1][self::stepxmp])'), 1600)
+
+    def test_step_with_many_cmd_children(self):
+        inline = '<b>Command</b> ' * 5000
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body><ol><li>{inline}</li><li>{inline}<p>Information</p></li></ol></body></topic>'))
+
+        task = transform.to_task(xml)
+
+        self.assertEqual(task.xpath('count(//steps/step[1]/*)'), 1)
+        self.assertEqual(task.xpath('count(//steps/step[1]/cmd/b[text()="Command"])'), 5000)
+        self.assertEqual(task.xpath('count(//steps/step[2]/*)'), 2)
+        self.assertEqual(task.xpath('count(//steps/step[2]/cmd/b[text()="Command"])'), 5000)
+        self.assertTrue(task.xpath('boolean(//steps/step[2]/info/p[text()="Information"])'))
+
+    def test_large_body(self):
+        blocks = '<p>Paragraph</p>' * 4000
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{blocks}<ol><li>Step</li></ol>{blocks}<example><p>Example</p></example>{blocks}</body></topic>'))
+
+        task = transform.to_task(xml)
+
+        self.assertEqual(task.xpath('count(/task/taskbody/*)'), 5)
+        self.assertEqual(task.xpath('count(/task/taskbody/context/p)'), 4000)
+        self.assertTrue(task.xpath('boolean(/task/taskbody/steps/step/cmd[text()="Step"])'))
+        self.assertEqual(task.xpath('count(/task/taskbody/result/p)'), 4000)
+        self.assertTrue(task.xpath('boolean(/task/taskbody/example/p[text()="Example"])'))
+        self.assertEqual(task.xpath('count(/task/taskbody/postreq/p)'), 4000)
+
     def test_task_substeps(self):
         xml = etree.parse(StringIO('''\
         <topic id="example-topic">
@@ -988,3 +988,30 @@ class TestDitaConvertToTaskGenerated(unittest.TestCase):
         self.assertTrue(task.xpath('boolean(//steps/step/substeps/substep/stepxmp[@id="substep-example"])'))
         self.assertTrue(task.xpath('boolean(//related-links[@id="additional-resources"])'))
         self.assertTrue(task.xpath('boolean(//related-links/link[@id="external-link"])'))
+
+    def test_large_body(self):
+        blocks = '<p>Paragraph</p>' * 4000
+        title  = '<p outputclass="title"><b>{}</b></p>'
+        body   = blocks + title.format('Prerequisites') + blocks + title.format('Procedure') + '<ol><li>Step</li></ol>' + title.format('Verification') + blocks + title.format('Next steps') + blocks
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{body}</body></topic>'))
+
+        task = transform.to_task_generated(xml)
+
+        self.assertEqual(task.xpath('count(/task/taskbody/*)'), 5)
+        self.assertEqual(task.xpath('count(/task/taskbody/prereq/p)'), 4000)
+        self.assertEqual(task.xpath('count(/task/taskbody/context/p)'), 4000)
+        self.assertTrue(task.xpath('boolean(/task/taskbody/steps/step/cmd[text()="Step"])'))
+        self.assertEqual(task.xpath('count(/task/taskbody/result/p)'), 4000)
+        self.assertEqual(task.xpath('count(/task/taskbody/postreq/p)'), 4000)
+
+    def test_many_repeated_titles(self):
+        title  = '<p outputclass="title"><b>{}</b></p>'
+        body   = '<p>Context</p>' + (title.format('Prerequisites') + '<p>Prerequisite</p>') * 4000 + title.format('Next steps') + '<p>Next step</p>'
+        xml = etree.parse(StringIO(f'<topic id="example-topic"><title>Topic title</title><body>{body}</body></topic>'))
+
+        task = transform.to_task_generated(xml)
+
+        self.assertEqual(task.xpath('count(/task/taskbody/*)'), 3)
+        self.assertEqual(task.xpath('count(/task/taskbody/prereq/p[text()="Prerequisite"])'), 4000)
+        self.assertTrue(task.xpath('boolean(/task/taskbody/context/p[text()="Context"])'))
+        self.assertTrue(task.xpath('boolean(/task/taskbody/postreq/p[text()="Next step"])'))
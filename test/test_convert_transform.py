@@ -1,4 +1,6 @@
 import unittest
+import sys
+import threading
 from io import StringIO
 from lxml import etree
 from src.dita.convert import transform
@@ -75,3 +77,72 @@ class TestDitaConvertTransform(unittest.TestCase):
         '''))
 
         self.assertIsInstance(transform.to_single_map(xml), etree._XSLTResultTree)
+
+    def test_transformer_compiles_on_first_use(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-concept">
+            <title>Topic title</title>
+        </topic>
+        '''))
+
+        transformer = transform.Transformer('concept.xsl')
+        self.assertFalse(hasattr(transformer._local, 'xslt'))
+
+        transformer(xml)
+        self.assertIsInstance(transformer.xslt, etree.XSLT)
+        self.assertIs(transformer._local.xslt, transformer.xslt)
+
+    def test_transformer_compiles_per_thread(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-concept">
+            <title>Topic title</title>
+        </topic>
+        '''))
+
+        transformer = transform.Transformer('concept.xsl')
+        instances   = []
+
+        def run():
+            transformer(xml)
+            instances.append(transformer.xslt)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        run()
+
+        self.assertEqual(len(instances), 2)
+        self.assertIsNot(instances[0], instances[1])
+
+    def test_transformer_releases_finished_threads(self):
+        transformer = transform.Transformer('concept.xsl')
+        instances   = []
+
+        def run():
+            instances.append(transformer.xslt)
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+        # Only the list and the argument refer to the compiled copy:
+        self.assertEqual(sys.getrefcount(instances[0]), 2)
+
+    def test_transformer_exposes_error_log(self):
+        xml = etree.parse(StringIO('''\
+        <topic id="example-concept">
+            <title>Topic title</title>
+        </topic>
+        '''))
+
+        transform.to_concept(xml)
+
+        self.assertEqual(len(transform.to_concept.error_log), 0)
+
+    def test_load_stylesheet_inlines_includes(self):
+        stylesheet = transform.load_stylesheet('task.xsl')
+        namespace  = {'xsl': transform.XSL_NAMESPACE}
+
+        self.assertEqual(stylesheet.xpath('count(xsl:include)', namespaces=namespace), 0)
+        self.assertTrue(stylesheet.xpath('boolean(xsl:template[@name="step-substep"])', namespaces=namespace))
+        self.assertTrue(stylesheet.xpath('boolean(xsl:template[@match="/"])', namespaces=namespace))
@@ -0,0 +1,191 @@
+import unittest
+from io import StringIO
+from lxml import etree
+from src.dita.convert import transform
+from src.dita.convert.validate import Problem, validate
+
+class TestDitaConvertValidate(unittest.TestCase):
+    def parse(self, contents):
+        return etree.parse(StringIO(contents))
+
+    def test_valid_topic(self):
+        xml = self.parse('<topic id="topic"><title>Topic</title><body><dl><dlentry><dt>Term</dt><dd>Description</dd></dlentry></dl></body></topic>')
+
+        self.assertEqual(validate(xml), [])
+        self.assertEqual(validate(xml, 'task'), [])
+        self.assertEqual(validate(xml.getroot(), 'reference', True), [])
+
+    def test_document_is_topic(self):
+        xml = self.parse('<concept id="topic">\n<title>Topic</title>\n</concept>')
+
+        self.assertEqual(validate(xml), [Problem(1, 'not a DITA topic: "concept"')])
+
+    def test_unsupported_outputclass(self):
+        xml = self.parse('<topic id="topic" outputclass="glossary"><title>Topic</title></topic>')
+
+        self.assertEqual(validate(xml), [Problem(1, 'unsupported outputclass "glossary"')])
+        self.assertEqual(validate(xml, 'concept'), [])
+
+    def test_incomplete_dl(self):
+        xml = self.parse('''\
+<topic id="topic">
+  <title>Topic</title>
+  <body>
+    <dl>
+      <dlentry>
+        <dt>Term</dt>
+        <dt>Term</dt>
+        <dd>Description</dd>
+        <dt>Term</dt>
+      </dlentry>
+    </dl>
+  </body>
+</topic>''')
+
+        self.assertEqual(validate(xml), [Problem(9, 'incomplete definition list')])
+
+    def test_section_in_task(self):
+        xml = self.parse('''\
+<topic id="topic" outputclass="procedure">
+  <title>Topic</title>
+  <body>
+    <section>
+      <p>Section</p>
+    </section>
+  </body>
+</topic>''')
+
+        self.assertEqual(validate(xml), [Problem(4, 'section not allowed in a DITA task')])
+        self.assertEqual(validate(xml, 'task', True), [Problem(4, 'section not allowed in a DITA task')])
+        self.assertEqual(validate(xml, 'concept'), [])
+
+    def test_multiple_examples_in_task(self):
+        xml = self.parse('''\
+<topic id="topic">
+  <title>Topic</title>
+  <body>
+    <example><p>First</p></example>
+    <example><p>Second</p></example>
+    <example><p>Third</p></example>
+  </body>
+</topic>''')
+
+        self.assertEqual(validate(xml, 'task'), [
+            Problem(5, 'multiple examples not allowed in a DITA task'),
+            Problem(6, 'multiple examples not allowed in a DITA task'),
+        ])
+        self.assertEqual(validate(xml, 'task', True), [])
+        self.assertEqual(validate(xml, 'reference'), [])
+
+    def test_additional_resources_in_generated_concept(self):
+        xml = self.parse('''\
+<topic id="topic" outputclass="concept">
+  <title>Topic</title>
+  <body>
+    <p>Paragraph</p>
+    <section>
+      <title>Section</title>
+      <p outputclass="title"><b>Additional resources</b></p>
+      <dl><dlentry><dt>Term</dt></dlentry></dl>
+    </section>
+    <section>
+      <title>Additional resources</title>
+      <dl><dlentry><dt>Term</dt></dlentry></dl>
+    </section>
+    <section>
+      <section><dl><dlentry><dt>Term</dt></dlentry></dl></section>
+    </section>
+    <p outputclass="title"><b>Additional resources</b></p>
+    <dl><dlentry><dt>Term</dt></dlentry></dl>
+  </body>
+</topic>''')
+
+        self.assertEqual(validate(xml, 'concept', True), [])
+        self.assertEqual(len(validate(xml, 'concept')), 4)
+        transform.to_concept_generated(xml)
+
+    def test_additional_resources_in_generated_reference(self):
+        xml = self.parse('''\
+<topic id="topic" outputclass="reference">
+  <title>Topic</title>
+  <body>
+    <p outputclass="abstract">Abstract</p>
+    <p outputclass="abstract"><dl><dlentry><dt>Term</dt></dlentry></dl></p>
+    <section>
+      <section><dl><dlentry><dt>Term</dt></dlentry></dl></section>
+    </section>
+    <div>
+      <p outputclass="title"><b>Additional resources</b></p>
+      <dl><dlentry><dt>Term</dt></dlentry></dl>
+    </div>
+    <p outputclass="title"><b>Additional resources</b></p>
+    <dl><dlentry><dt>Term</dt></dlentry></dl>
+  </body>
+</topic>''')
+
+        self.assertEqual(validate(xml, 'reference', True), [])
+        self.assertEqual(len(validate(xml, 'reference')), 4)
+        transform.to_reference_generated(xml)
+
+    def test_unsupported_titles_in_generated_task(self):
+        xml = self.parse('''\
+<topic id="topic" outputclass="procedure">
+  <title>Topic</title>
+  <body>
+    <p outputclass="abstract">Abstract</p>
+    <p outputclass="abstract"><dl><dlentry><dt>Term</dt></dlentry></dl></p>
+    <p outputclass="title"><b>Procedure</b></p>
+    <ol><li>Step</li></ol>
+    <ul><li><section><p>Section</p></section></li></ul>
+    <p outputclass="title"><b>Unsupported title</b></p>
+    <dl><dlentry><dt>Term</dt></dlentry></dl>
+    <section><p>Section</p></section>
+    <p outputclass="title"><b>Additional resources</b></p>
+    <ul><li><xref href="https://example.com" /></li></ul>
+    <dl><dlentry><dt>Term</dt></dlentry></dl>
+    <example><p>First example</p></example>
+    <example><section><p>Section</p></section></example>
+  </body>
+</topic>''')
+
+        self.assertEqual(validate(xml, 'task', True), [])
+        transform.to_task_generated(xml)
+
+    def test_processed_content_in_generated_task(self):
+        xml = self.parse('''\
+<topic id="topic" outputclass="procedure">
+  <title>Topic</title>
+  <body>
+    <p outputclass="title"><b>Prerequisites</b></p>
+    <dl><dlentry><dt>Term</dt></dlentry></dl>
+    <p outputclass="title"><b>Procedure</b></p>
+    <section><p>Section</p></section>
+    <p outputclass="title"><b>Additional resources</b></p>
+    <example><section><p>Section</p></section></example>
+  </body>
+</topic>''')
+
+        self.assertEqual(validate(xml, 'task', True), [
+            Problem(5, 'incomplete definition list'),
+            Problem(7, 'section not allowed in a DITA task'),
+            Problem(9, 'section not allowed in a DITA task'),
+        ])
+
+    def test_all_problems_in_document_order(self):
+        xml = self.parse('''\
+<task id="topic" outputclass="task">
+  <title>Topic</title>
+  <body>
+    <dl><dlentry><dt>Term</dt></dlentry></dl>
+    <section><title>Section</title></section>
+  </body>
+</task>''')
+
+        self.assertEqual([str(problem) for problem in validate(xml)], [
+            'line 1: not a DITA topic: "task"',
+            'line 4: incomplete definition list',
+            'line 5: section not allowed in a DITA task',
+        ])
+
+    def test_problem_without_line(self):
+        self.assertEqual(str(validate(etree.Element('concept'))[0]), 'not a DITA topic: "concept"')
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+import time
+from src.dita.convert import watch
+
+class TestDitaConvertWatch(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.files     = []
+
+        for i in range(2):
+            self.files.append(os.path.join(self.directory.name, f'topic{i}.dita'))
+            with open(self.files[-1], 'w') as f:
+                f.write(f'<topic id="topic{i}" />')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, file_name, contents):
+        with open(file_name, 'w') as f:
+            f.write(contents)
+
+    def test_stat_watcher_detects_changes(self):
+        watcher = watch.StatWatcher(self.files, 0.01)
+
+        self.assertEqual(watcher.poll(0.05), set())
+
+        self.write(self.files[1], '<topic id="changed" />')
+
+        self.assertEqual(watcher.poll(1), {self.files[1]})
+        self.assertEqual(watcher.poll(0.05), set())
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'requires inotify')
+    def test_inotify_watcher_detects_changes(self):
+        watcher = watch.InotifyWatcher(self.files)
+
+        try:
+            self.assertEqual(watcher.poll(0.05), set())
+
+            self.write(self.files[0], '<topic id="changed" />')
+            self.write(os.path.join(self.directory.name, 'other.dita'), '<topic id="other" />')
+
+            self.assertEqual(watcher.poll(1), {self.files[0]})
+        finally:
+            watcher.close()
+
+    @unittest.skipUnless(sys.platform.startswith('linux'), 'requires inotify')
+    def test_inotify_watcher_detects_replaced_files(self):
+        watcher = watch.InotifyWatcher(self.files)
+        temporary = os.path.join(self.directory.name, 'topic1.dita.tmp')
+
+        try:
+            self.write(temporary, '<topic id="changed" />')
+            os.replace(temporary, self.files[1])
+
+            self.assertEqual(watcher.poll(1), {self.files[1]})
+        finally:
+            watcher.close()
+
+    def test_watch_groups_changes(self):
+        def change_files():
+            time.sleep(0.1)
+            self.write(self.files[1], '<topic id="changed" />')
+            time.sleep(0.01)
+            self.write(self.files[0], '<topic id="changed" />')
+
+        thread = threading.Thread(target=change_files)
+        thread.start()
+
+        changes = watch.watch(self.files, delay=0.2, interval=0.01, polling=True)
+        self.assertEqual(next(changes), self.files)
+        changes.close()
+
+        thread.join()
@@ -29,9 +29,14 @@
 -->
 
 <xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
-  <!-- Report an error if the converted file is not a DITA topic: -->
-  <xsl:template match="/*[not(self::topic)]">
-    <xsl:message terminate="yes">ERROR: Not a DITA topic</xsl:message>
+  <!-- Report an error if the converted file is not a DITA topic; the check
+       is performed on the document node because a predicate on a /*
+       pattern is evaluated for every element in the document: -->
+  <xsl:template match="/">
+    <xsl:if test="not(topic)">
+      <xsl:message terminate="yes">ERROR: Not a DITA topic</xsl:message>
+    </xsl:if>
+    <xsl:apply-templates />
   </xsl:template>
 
   <!-- Report an error if the converted file contains an incomplete definition list: -->
@@ -28,224 +28,221 @@
 -->
 
 <xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
-  <!-- Define the list of valid cmd element children: -->
-  <xsl:variable name="cmd-children" select="' abbreviated-form apiname b boolean cite cmdname codeph data data-about draft-comment equation-inline filepath fn foreign i image indexterm indextermref keyword line-through markupname mathml menucascade msgnum msgph numcharref option overline parameterentity parmname ph q required-cleanup sort-as state sub sup svg-container synph systemoutput term text textentity tm tt u uicontrol unknown userinput varname wintitle xmlatt xmlelement xmlnsname xmlpi xref '" />
-
-  <!-- Define the list of supported attributes from the universal attribute group: -->
-  <xsl:variable name="universal-attribute-group" select="' id props base platform product audience otherprops deliveryTarget importance rev status translate xml:lang dir '" />
-
-  <!-- Compose the step/substep element: -->
+  <!-- Compose the step/substep element; the children are visited once in
+       the info-element mode, which records the positions of the children
+       that are not valid cmd element children, and the first of them
+       starts the info element: -->
   <xsl:template name="step-substep">
     <xsl:param name="type" />
     <xsl:element name="{$type}">
-      <xsl:variable name="info-element" select="*[not(contains($cmd-children, concat(' ', name(), ' ')))][1]" />
       <xsl:call-template name="universal-attributes">
         <xsl:with-param name="attributes" select="@*" />
       </xsl:call-template>
-      <xsl:choose>
-        <xsl:when test="text()">
-          <xsl:choose>
-            <xsl:when test="$info-element">
-              <xsl:call-template name="compose-element">
-                <xsl:with-param name="name" select="'cmd'" />
-                <xsl:with-param name="contents" select="$info-element/preceding-sibling::*|$info-element/preceding-sibling::text()" />
-              </xsl:call-template>
+      <xsl:variable name="positions">
+        <xsl:apply-templates select="*" mode="info-element" />
+      </xsl:variable>
+      <xsl:variable name="first" select="number(substring-before($positions, ' '))" />
+      <xsl:call-template name="step-contents">
+        <xsl:with-param name="type" select="$type" />
+        <xsl:with-param name="info-element" select="*[$first]" />
+      </xsl:call-template>
+    </xsl:element>
+  </xsl:template>
+
+  <!-- Helper: Skip the valid cmd element children; each child is looked
+       up by its name among the templates instead of being searched for in
+       a list of names: -->
+  <xsl:template match="abbreviated-form|apiname|b|boolean|cite|cmdname|codeph|data|data-about|draft-comment|equation-inline|filepath|fn|foreign|i|image|indexterm|indextermref|keyword|line-through|markupname|mathml|menucascade|msgnum|msgph|numcharref|option|overline|parameterentity|parmname|ph|q|required-cleanup|sort-as|state|sub|sup|svg-container|synph|systemoutput|term|text|textentity|tm|tt|u|uicontrol|unknown|userinput|varname|wintitle|xmlatt|xmlelement|xmlnsname|xmlpi|xref" mode="info-element" />
+
+  <!-- Helper: Record the position of a child that is not a valid cmd
+       element child: -->
+  <xsl:template match="*" mode="info-element">
+    <xsl:value-of select="position()" />
+    <xsl:text> </xsl:text>
+  </xsl:template>
+
+  <!-- Helper: Compose the cmd and info elements of the step/substep element: -->
+  <xsl:template name="step-contents">
+    <xsl:param name="type" />
+    <xsl:param name="info-element" select="/.." />
+    <xsl:choose>
+      <xsl:when test="text()">
+        <xsl:choose>
+          <xsl:when test="$info-element">
+            <xsl:call-template name="compose-element">
+              <xsl:with-param name="name" select="'cmd'" />
+              <xsl:with-param name="contents" select="$info-element/preceding-sibling::*|$info-element/preceding-sibling::text()" />
+            </xsl:call-template>
+            <xsl:call-template name="info">
+              <xsl:with-param name="parent" select="$type" />
+              <xsl:with-param name="contents" select="$info-element|$info-element/following-sibling::*|$info-element/following-sibling::text()" />
+            </xsl:call-template>
+          </xsl:when>
+          <xsl:otherwise>
+            <xsl:call-template name="compose-element">
+              <xsl:with-param name="name" select="'cmd'" />
+              <xsl:with-param name="contents" select="text()|*" />
+            </xsl:call-template>
+          </xsl:otherwise>
+        </xsl:choose>
+      </xsl:when>
+      <xsl:when test="$info-element">
+        <xsl:choose>
+          <xsl:when test="$info-element/preceding-sibling::*">
+            <xsl:call-template name="compose-element">
+              <xsl:with-param name="name" select="'cmd'" />
+              <xsl:with-param name="contents" select="$info-element/preceding-sibling::*|$info-element/preceding-sibling::*" />
+            </xsl:call-template>
+            <xsl:call-template name="info">
+              <xsl:with-param name="parent" select="$type" />
+              <xsl:with-param name="contents" select="$info-element|$info-element/following-sibling::*|$info-element/following-sibling::*" />
+            </xsl:call-template>
+          </xsl:when>
+          <xsl:otherwise>
+            <xsl:call-template name="compose-element">
+              <xsl:with-param name="name" select="'cmd'" />
+              <xsl:with-param name="contents" select="*[1]/text()|*[1]/*" />
+              <xsl:with-param name="attributes" select="*[1]/@*" />
+            </xsl:call-template>
+            <xsl:if test="*[2]">
               <xsl:call-template name="info">
                 <xsl:with-param name="parent" select="$type" />
-                <xsl:with-param name="contents" select="$info-element|$info-element/following-sibling::*|$info-element/following-sibling::text()" />
-              </xsl:call-template>
-            </xsl:when>
-            <xsl:otherwise>
-              <xsl:call-template name="compose-element">
-                <xsl:with-param name="name" select="'cmd'" />
-                <xsl:with-param name="contents" select="text()|*" />
+                <xsl:with-param name="contents" select="*[position() > 1]" />
               </xsl:call-template>
-            </xsl:otherwise>
-          </xsl:choose>
-        </xsl:when>
-        <xsl:when test="$info-element">
+            </xsl:if>
+          </xsl:otherwise>
+        </xsl:choose>
+      </xsl:when>
+      <xsl:otherwise>
+        <xsl:call-template name="compose-element">
+          <xsl:with-param name="name" select="'cmd'" />
+          <xsl:with-param name="contents" select="*" />
+          <xsl:with-param name="attributes" select="@*" />
+        </xsl:call-template>
+      </xsl:otherwise>
+    </xsl:choose>
+  </xsl:template>
+
+  <!-- Compose alternating info/substeps/stepxmp elements; the contents
+       are split at their middle substeps or example, and both halves are
+       composed the same way, so that the recursion is only as deep as the
+       logarithm of the number of substeps and examples; the EXSLT
+       namespace is declared on the template so that it stays in scope
+       when the stylesheet is included: -->
+  <xsl:template name="info" xmlns:set="http://exslt.org/sets">
+    <xsl:param name="parent" />
+    <xsl:param name="contents" />
+    <xsl:variable name="separators" select="$contents[self::example or (self::ol and $parent = 'step')]" />
+    <xsl:choose>
+      <xsl:when test="not($separators)">
+        <xsl:call-template name="compose-element">
+          <xsl:with-param name="name" select="'info'" />
+          <xsl:with-param name="contents" select="$contents" />
+        </xsl:call-template>
+      </xsl:when>
+      <xsl:otherwise>
+        <xsl:variable name="middle" select="floor(count($separators) div 2) + 1" />
+        <xsl:variable name="separator" select="$separators[$middle]" />
+        <xsl:call-template name="info">
+          <xsl:with-param name="parent" select="$parent" />
+          <xsl:with-param name="contents" select="set:leading($contents, $separator)" />
+        </xsl:call-template>
+        <xsl:for-each select="$separator">
           <xsl:choose>
-            <xsl:when test="$info-element/preceding-sibling::*">
-              <xsl:call-template name="compose-element">
-                <xsl:with-param name="name" select="'cmd'" />
-                <xsl:with-param name="contents" select="$info-element/preceding-sibling::*|$info-element/preceding-sibling::*" />
-              </xsl:call-template>
-              <xsl:call-template name="info">
-                <xsl:with-param name="parent" select="$type" />
-                <xsl:with-param name="contents" select="$info-element|$info-element/following-sibling::*|$info-element/following-sibling::*" />
-              </xsl:call-template>
+            <xsl:when test="self::ol">
+              <xsl:element name="substeps">
+                <xsl:call-template name="universal-attributes">
+                  <xsl:with-param name="attributes" select="@*" />
+                </xsl:call-template>
+                <xsl:for-each select="li">
+                  <xsl:call-template name="step-substep">
+                    <xsl:with-param name="type" select="'substep'" />
+                  </xsl:call-template>
+                </xsl:for-each>
+              </xsl:element>
             </xsl:when>
             <xsl:otherwise>
               <xsl:call-template name="compose-element">
-                <xsl:with-param name="name" select="'cmd'" />
-                <xsl:with-param name="contents" select="*[1]/text()|*[1]/*" />
-                <xsl:with-param name="attributes" select="*[1]/@*" />
+                <xsl:with-param name="name" select="'stepxmp'" />
+                <xsl:with-param name="contents" select="text()|*[not(self::title)]" />
+                <xsl:with-param name="attributes" select="@*" />
               </xsl:call-template>
-              <xsl:if test="*[2]">
-                <xsl:call-template name="info">
-                  <xsl:with-param name="parent" select="$type" />
-                  <xsl:with-param name="contents" select="*[position() > 1]" />
-                </xsl:call-template>
-              </xsl:if>
             </xsl:otherwise>
           </xsl:choose>
-        </xsl:when>
-        <xsl:otherwise>
-          <xsl:call-template name="compose-element">
-            <xsl:with-param name="name" select="'cmd'" />
-            <xsl:with-param name="contents" select="*" />
-            <xsl:with-param name="attributes" select="@*" />
-          </xsl:call-template>
-        </xsl:otherwise>
-      </xsl:choose>
-    </xsl:element>
+        </xsl:for-each>
+        <xsl:call-template name="info">
+          <xsl:with-param name="parent" select="$parent" />
+          <xsl:with-param name="contents" select="set:trailing($contents, $separator)" />
+        </xsl:call-template>
+      </xsl:otherwise>
+    </xsl:choose>
   </xsl:template>
 
-  <!-- Compose the info element: -->
-  <xsl:template name="info">
-    <xsl:param name="parent" />
+  <!-- Compose alternating example/section elements; the leading and the
+       trailing content are selected as a whole, and the content between
+       the first and the last example or section is composed by the
+       section-runs template; the EXSLT namespace is declared on the
+       template so that it stays in scope when the stylesheet is
+       included: -->
+  <xsl:template name="example-section" xmlns:set="http://exslt.org/sets">
     <xsl:param name="contents" />
+    <xsl:variable name="separators" select="$contents[self::example or self::section]" />
     <xsl:choose>
-      <xsl:when test="$parent = 'step'">
-        <xsl:call-template name="info-substeps">
+      <xsl:when test="not($separators)">
+        <xsl:call-template name="compose-element">
+          <xsl:with-param name="name" select="'section'" />
           <xsl:with-param name="contents" select="$contents" />
         </xsl:call-template>
       </xsl:when>
       <xsl:otherwise>
-        <xsl:call-template name="info-stepxmp">
-          <xsl:with-param name="contents" select="$contents" />
+        <xsl:variable name="first" select="$separators[1]" />
+        <xsl:variable name="last" select="$separators[last()]" />
+        <xsl:call-template name="compose-element">
+          <xsl:with-param name="name" select="'section'" />
+          <xsl:with-param name="contents" select="set:leading($contents[count(. | ../@*) != count(../@*)], $first)" />
+        </xsl:call-template>
+        <xsl:apply-templates select="$first" />
+        <xsl:if test="$separators[2]">
+          <xsl:call-template name="section-runs">
+            <xsl:with-param name="contents" select="set:leading($first/following-sibling::*, $last)" />
+          </xsl:call-template>
+          <xsl:apply-templates select="$last" />
+        </xsl:if>
+        <xsl:call-template name="compose-element">
+          <xsl:with-param name="name" select="'section'" />
+          <xsl:with-param name="contents" select="$last/following-sibling::*|$last/following-sibling::text()" />
         </xsl:call-template>
       </xsl:otherwise>
     </xsl:choose>
   </xsl:template>
 
-  <!-- Compose alternating info/substeps elements: -->
-  <xsl:template name="info-substeps">
+  <!-- Helper: Compose alternating example/section elements from the
+       elements between two examples or sections; the elements are split
+       at their middle example or section, and both halves are composed
+       the same way, so that the recursion is only as deep as the
+       logarithm of the number of examples and sections: -->
+  <xsl:template name="section-runs" xmlns:set="http://exslt.org/sets">
     <xsl:param name="contents" />
-    <xsl:variable name="substeps-count" select="count($contents[self::ol])" />
-    <xsl:variable name="first-info" select="$contents[following-sibling::ol[$substeps-count]]" />
-    <xsl:if test="$substeps-count = 0">
-      <xsl:call-template name="info-stepxmp">
-        <xsl:with-param name="contents" select="$contents" />
-      </xsl:call-template>
-    </xsl:if>
-    <xsl:if test="$first-info">
-      <xsl:call-template name="info-stepxmp">
-        <xsl:with-param name="contents" select="$first-info" />
-      </xsl:call-template>
-    </xsl:if>
-    <xsl:for-each select="$contents[self::ol]">
-      <xsl:variable name="current-position" select="position()" />
-      <xsl:element name="substeps">
-        <xsl:call-template name="universal-attributes">
-          <xsl:with-param name="attributes" select="@*" />
+    <xsl:variable name="separators" select="$contents[self::example or self::section]" />
+    <xsl:choose>
+      <xsl:when test="not($separators)">
+        <xsl:call-template name="compose-element">
+          <xsl:with-param name="name" select="'section'" />
+          <xsl:with-param name="contents" select="$contents" />
         </xsl:call-template>
-        <xsl:for-each select="li">
-          <xsl:call-template name="step-substep">
-            <xsl:with-param name="type" select="'substep'" />
-          </xsl:call-template>
-        </xsl:for-each>
-      </xsl:element>
-      <xsl:choose>
-        <xsl:when test="following-sibling::ol">
-          <xsl:call-template name="info-stepxmp">
-            <xsl:with-param name="contents" select="following-sibling::*[following-sibling::ol[$substeps-count - $current-position]]" />
-          </xsl:call-template>
-        </xsl:when>
-        <xsl:otherwise>
-          <xsl:variable name="last-info" select="following-sibling::*|following-sibling::text()" />
-          <xsl:if test="$last-info">
-            <xsl:call-template name="info-stepxmp">
-              <xsl:with-param name="contents" select="$last-info" />
-            </xsl:call-template>
-          </xsl:if>
-        </xsl:otherwise>
-      </xsl:choose>
-    </xsl:for-each>
-  </xsl:template>
-
-  <!-- Compose alternating info/stepxmp elements: -->
-  <xsl:template name="info-stepxmp">
-    <xsl:param name="contents" />
-    <xsl:variable name="xmp-count" select="count($contents[self::example])" />
-    <xsl:variable name="first-info" select="$contents[following-sibling::example[$xmp-count]]" />
-    <xsl:if test="$xmp-count = 0">
-      <xsl:call-template name="compose-element">
-        <xsl:with-param name="name" select="'info'" />
-        <xsl:with-param name="contents" select="$contents" />
-      </xsl:call-template>
-    </xsl:if>
-    <xsl:if test="$first-info">
-      <xsl:call-template name="compose-element">
-        <xsl:with-param name="name" select="'info'" />
-        <xsl:with-param name="contents" select="$first-info" />
-      </xsl:call-template>
-    </xsl:if>
-    <xsl:for-each select="$contents[self::example]">
-      <xsl:variable name="current-position" select="position()" />
-      <xsl:call-template name="compose-element">
-        <xsl:with-param name="name" select="'stepxmp'" />
-        <xsl:with-param name="contents" select="text()|*[not(self::title)]" />
-        <xsl:with-param name="attributes" select="@*" />
-      </xsl:call-template>
-      <xsl:choose>
-        <xsl:when test="following-sibling::example">
-          <xsl:call-template name="compose-element">
-            <xsl:with-param name="name" select="'info'" />
-            <xsl:with-param name="contents" select="following-sibling::*[following-sibling::example[$xmp-count - $current-position]]" />
-          </xsl:call-template>
-        </xsl:when>
-        <xsl:otherwise>
-          <xsl:variable name="last-info" select="following-sibling::*[not(self::ol)]|following-sibling::text()" />
-          <xsl:if test="$last-info">
-            <xsl:call-template name="compose-element">
-              <xsl:with-param name="name" select="'info'" />
-              <xsl:with-param name="contents" select="$last-info" />
-            </xsl:call-template>
-          </xsl:if>
-        </xsl:otherwise>
-      </xsl:choose>
-    </xsl:for-each>
-  </xsl:template>
-
-  <!-- Compose alternating example/section elements: -->
-  <xsl:template name="example-section">
-    <xsl:param name="contents" />
-    <xsl:param name="count" select="count($contents[self::example or self::section])" />
-    <xsl:param name="first" select="$contents[following-sibling::*[self::example or self::section][$count]]" />
-    <xsl:if test="$count = 0">
-      <xsl:call-template name="compose-element">
-        <xsl:with-param name="name" select="'section'" />
-        <xsl:with-param name="contents" select="$contents" />
-      </xsl:call-template>
-    </xsl:if>
-    <xsl:if test="$first">
-      <xsl:call-template name="compose-element">
-        <xsl:with-param name="name" select="'section'" />
-        <xsl:with-param name="contents" select="$first" />
-      </xsl:call-template>
-    </xsl:if>
-    <xsl:for-each select="$contents[self::example or self::section]">
-      <xsl:variable name="current-position" select="position()" />
-      <xsl:apply-templates select="." />
-      <xsl:choose>
-        <xsl:when test="following-sibling::*[self::example or self::section]">
-          <xsl:call-template name="compose-element">
-            <xsl:with-param name="name" select="'section'" />
-            <xsl:with-param name="contents" select="following-sibling::*[following-sibling::*[self::example or self::section][$count - $current-position]]" />
-          </xsl:call-template>
-        </xsl:when>
-        <xsl:otherwise>
-          <xsl:variable name="last" select="following-sibling::*|following-sibling::text()" />
-          <xsl:if test="$last">
-            <xsl:call-template name="compose-element">
-              <xsl:with-param name="name" select="'section'" />
-              <xsl:with-param name="contents" select="$last" />
-            </xsl:call-template>
-          </xsl:if>
-        </xsl:otherwise>
-      </xsl:choose>
-    </xsl:for-each>
+      </xsl:when>
+      <xsl:otherwise>
+        <xsl:variable name="middle" select="floor(count($separators) div 2) + 1" />
+        <xsl:variable name="separator" select="$separators[$middle]" />
+        <xsl:call-template name="section-runs">
+          <xsl:with-param name="contents" select="set:leading($contents, $separator)" />
+        </xsl:call-template>
+        <xsl:apply-templates select="$separator" />
+        <xsl:call-template name="section-runs">
+          <xsl:with-param name="contents" select="set:trailing($contents, $separator)" />
+        </xsl:call-template>
+      </xsl:otherwise>
+    </xsl:choose>
   </xsl:template>
 
   <!-- Compose the shortdesc element: -->
@@ -300,16 +297,24 @@
     </xsl:if>
   </xsl:template>
 
-  <!-- Helper: Copy the universal attribute group: -->
+  <!-- Helper: Copy the universal attribute group; each attribute is looked
+       up by its name among the templates below instead of being searched
+       for in a list of names: -->
   <xsl:template name="universal-attributes">
     <xsl:param name="attributes" />
-    <xsl:for-each select="$attributes">
-      <xsl:if test="contains($universal-attribute-group, concat(' ', name(), ' '))">
-        <xsl:copy-of select="." />
-      </xsl:if>
-    </xsl:for-each>
+    <xsl:apply-templates select="$attributes" mode="universal-attributes" />
   </xsl:template>
 
+  <!-- Copy the supported attributes from the universal attribute group: -->
+  <xsl:template match="@id|@props|@base|@platform|@product|@audience|@otherprops|@deliveryTarget|@importance|@rev|@status|@translate|@xml:lang|@dir" mode="universal-attributes">
+    <xsl:copy-of select="." />
+  </xsl:template>
+
+  <!-- Skip all other attributes, including attributes from a namespace
+       that share their local name with a supported attribute: -->
+  <xsl:template match="@*" mode="universal-attributes" />
+  <xsl:template match="@*[namespace-uri() and name() != 'xml:lang']" mode="universal-attributes" priority="1" />
+
   <!-- Helper: Compose an element with the given name and contents: -->
   <xsl:template name="compose-element">
     <xsl:param name="name" />
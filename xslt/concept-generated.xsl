@@ -36,7 +36,7 @@
   OTHER DEALINGS IN THE SOFTWARE.
 -->
 
-<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform" xmlns:set="http://exslt.org/sets" exclude-result-prefixes="set">
   <!-- Compose the XML and DOCTYPE declarations: -->
   <xsl:output encoding="utf-8" method="xml" doctype-system="concept.dtd" doctype-public="-//OASIS//DTD DITA Concept//EN" />
 
@@ -54,6 +54,21 @@
   <!-- Prevent duplication of the abstract paragraph (used for shortdesc): -->
   <xsl:template match="//body/p[@outputclass='abstract'][1]" />
 
+  <!-- Index the Additional resources titles by their parent element; the
+       document node is indexed under an empty value so that the key is
+       never empty, as libxslt would otherwise build it again each time it
+       is used while the related-links key is being built: -->
+  <xsl:key name="additional-resources" match="/|p[@outputclass='title'][b='Additional resources']" use="generate-id(..)" />
+
+  <!-- Index the Additional resources titles and the elements that follow
+       them; an element is indexed when the first of its sibling titles
+       precedes it in document order, which avoids scanning the preceding
+       siblings of every element: -->
+  <xsl:key name="related-links" match="*" use="(key('additional-resources', generate-id(..)) | .)[1][self::p[@outputclass='title']]/b[. = 'Additional resources']" />
+
+  <!-- Index the sections by their title: -->
+  <xsl:key name="sections" match="section" use="title" />
+
   <!-- Perform identity transformation: -->
   <xsl:template match="@*|node()">
     <xsl:copy>
@@ -71,7 +86,7 @@
   <!-- Transform the section element: -->
   <xsl:template match="//section">
     <xsl:element name="section">
-      <xsl:apply-templates select="@*|*[not(self::p[@outputclass='title'][b='Additional resources'] or preceding-sibling::p[@outputclass='title'][b='Additional resources'])]" />
+      <xsl:apply-templates select="@*|set:leading(*, key('additional-resources', generate-id()))" />
     </xsl:element>
   </xsl:template>
 
@@ -91,11 +106,11 @@
     </xsl:call-template>
     <!-- Compose the conbody element: -->
     <xsl:element name="conbody">
-      <xsl:apply-templates select="@*|*[not(self::p[@outputclass='title'][b='Additional resources'] or preceding-sibling::p[@outputclass='title'][b='Additional resources'])]" />
+      <xsl:apply-templates select="@*|set:leading(*, key('additional-resources', generate-id()))" />
     </xsl:element>
     <!-- Compose the related-links element: -->
     <xsl:call-template name="related-links">
-      <xsl:with-param name="contents" select="//p[@outputclass='title'][b='Additional resources']/following-sibling::*|//section[title='Additional resources']/*[not(self::title)]" />
+      <xsl:with-param name="contents" select="key('related-links', 'Additional resources')[generate-id() != generate-id(key('additional-resources', generate-id(..)))]|key('sections', 'Additional resources')/*[not(self::title)]" />
     </xsl:call-template>
   </xsl:template>
 
@@ -59,8 +59,20 @@
   <!-- Prevent duplication of the abstract paragraph (used for shortdesc): -->
   <xsl:template match="//body/p[@outputclass='abstract'][1]" />
 
+  <!-- Index the Additional resources titles by their parent element; the
+       document node is indexed under an empty value so that the key is
+       never empty, as libxslt would otherwise build it again each time it
+       is used while the related-links key is being built: -->
+  <xsl:key name="additional-resources" match="/|p[@outputclass='title'][b='Additional resources']" use="generate-id(..)" />
+
+  <!-- Index the Additional resources titles and the elements that follow
+       them; an element is indexed when the first of its sibling titles
+       precedes it in document order, which avoids scanning the preceding
+       siblings of every element: -->
+  <xsl:key name="related-links" match="*" use="(key('additional-resources', generate-id(..)) | .)[1][self::p[@outputclass='title']]/b[. = 'Additional resources']" />
+
   <!-- Process the related links at a later stage: -->
-  <xsl:template match="*[self::p[@outputclass='title'][b='Additional resources'] or preceding-sibling::p[@outputclass='title'][b='Additional resources']]" />
+  <xsl:template match="key('related-links', 'Additional resources')" />
 
   <!-- Perform identity transformation: -->
   <xsl:template match="@*|node()">
@@ -93,7 +105,7 @@
     </xsl:element>
     <!-- Compose the related-links element: -->
     <xsl:call-template name="related-links">
-      <xsl:with-param name="contents" select="//p[@outputclass='title'][b='Additional resources']/following-sibling::*" />
+      <xsl:with-param name="contents" select="key('related-links', 'Additional resources')[generate-id() != generate-id(key('additional-resources', generate-id(..)))]" />
     </xsl:call-template>
   </xsl:template>
 
@@ -36,7 +36,7 @@
   OTHER DEALINGS IN THE SOFTWARE.
 -->
 
-<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform" xmlns:set="http://exslt.org/sets" xmlns:func="http://exslt.org/functions" xmlns:conv="https://github.com/jhradilek/dita-custom-xslt" extension-element-prefixes="func" exclude-result-prefixes="set conv">
   <!-- Compose the XML and DOCTYPE declarations: -->
   <xsl:output encoding="utf-8" method="xml" doctype-system="task.dtd" doctype-public="-//OASIS//DTD DITA Task//EN" />
 
@@ -86,9 +86,9 @@
     </xsl:call-template>
     <xsl:element name="taskbody">
       <!-- Compose the prereq element: -->
-      <xsl:call-template name="compose-element">
+      <xsl:call-template name="title-contents">
         <xsl:with-param name="name" select="'prereq'" />
-        <xsl:with-param name="contents" select="*[not(@outputclass='title') and preceding-sibling::p[@outputclass='title'][1][b='Prerequisite' or b='Prerequisites']]" />
+        <xsl:with-param name="titles" select="p[@outputclass='title'][b='Prerequisite' or b='Prerequisites']" />
       </xsl:call-template>
       <!-- Compose the context element: -->
       <xsl:choose>
@@ -118,18 +118,19 @@
         </xsl:otherwise>
       </xsl:choose>
       <!-- Compose the steps element: -->
-      <xsl:call-template name="steps">
-        <xsl:with-param name="contents" select="*[not(@outputclass='title') and preceding-sibling::p[@outputclass='title'][1][b='Procedure']]" />
+      <xsl:call-template name="title-contents">
+        <xsl:with-param name="name" select="'steps'" />
+        <xsl:with-param name="titles" select="p[@outputclass='title'][b='Procedure']" />
       </xsl:call-template>
       <!-- Compose the result element: -->
-      <xsl:call-template name="compose-element">
+      <xsl:call-template name="title-contents">
         <xsl:with-param name="name" select="'result'" />
-        <xsl:with-param name="contents" select="*[not(@outputclass='title') and preceding-sibling::p[@outputclass='title'][1][b='Verification' or b='Result' or b='Results']]" />
+        <xsl:with-param name="titles" select="p[@outputclass='title'][b='Verification' or b='Result' or b='Results']" />
       </xsl:call-template>
       <!-- Compose the tasktroubleshooting element: -->
-      <xsl:call-template name="compose-element">
+      <xsl:call-template name="title-contents">
         <xsl:with-param name="name" select="'tasktroubleshooting'" />
-        <xsl:with-param name="contents" select="*[not(@outputclass='title') and preceding-sibling::p[@outputclass='title'][1][b='Troubleshooting' or b='Troubleshooting step' or b='Troubleshooting steps']]" />
+        <xsl:with-param name="titles" select="p[@outputclass='title'][b='Troubleshooting' or b='Troubleshooting step' or b='Troubleshooting steps']" />
       </xsl:call-template>
       <!-- Compose the example element: -->
       <xsl:call-template name="compose-element">
@@ -137,14 +138,15 @@
         <xsl:with-param name="contents" select="//body/example[1]/*|//body/example[1]/@*" />
       </xsl:call-template>
       <!-- Compose the postreq element: -->
-      <xsl:call-template name="compose-element">
+      <xsl:call-template name="title-contents">
         <xsl:with-param name="name" select="'postreq'" />
-        <xsl:with-param name="contents" select="*[not(@outputclass='title') and preceding-sibling::p[@outputclass='title'][1][b='Next step' or b='Next steps']]" />
+        <xsl:with-param name="titles" select="p[@outputclass='title'][b='Next step' or b='Next steps']" />
       </xsl:call-template>
     </xsl:element>
     <!-- Compose the related-links element: -->
-    <xsl:call-template name="related-links">
-        <xsl:with-param name="contents" select="*[not(@outputclass='title') and preceding-sibling::p[@outputclass='title'][1][b='Additional resources']]" />
+    <xsl:call-template name="title-contents">
+      <xsl:with-param name="name" select="'related-links'" />
+      <xsl:with-param name="titles" select="p[@outputclass='title'][b='Additional resources']" />
     </xsl:call-template>
 
     <!-- Issue a warning if the converted file contains an unsupported title: -->
@@ -156,6 +158,57 @@
     </xsl:for-each>
   </xsl:template>
 
+  <!-- Compose the element with the given name from the content that
+       follows the given titles up to the next title: -->
+  <xsl:template name="title-contents">
+    <xsl:param name="name" />
+    <xsl:param name="titles" />
+    <xsl:variable name="contents" select="conv:title-contents(*, $titles)" />
+    <xsl:choose>
+      <xsl:when test="$name = 'steps'">
+        <xsl:call-template name="steps">
+          <xsl:with-param name="contents" select="$contents" />
+        </xsl:call-template>
+      </xsl:when>
+      <xsl:when test="$name = 'related-links'">
+        <xsl:call-template name="related-links">
+          <xsl:with-param name="contents" select="$contents" />
+        </xsl:call-template>
+      </xsl:when>
+      <xsl:otherwise>
+        <xsl:call-template name="compose-element">
+          <xsl:with-param name="name" select="$name" />
+          <xsl:with-param name="contents" select="$contents" />
+        </xsl:call-template>
+      </xsl:otherwise>
+    </xsl:choose>
+  </xsl:template>
+
+  <!-- Helper: Return the body children from the given run that follow the
+       given titles up to the next title; the run is split at the middle
+       title instead of following each title to the next one, so that the
+       depth of the recursion only grows with the logarithm of the number of
+       titles; owned is true when the run directly follows one of the given
+       titles: -->
+  <func:function name="conv:title-contents">
+    <xsl:param name="children" />
+    <xsl:param name="titles" />
+    <xsl:param name="owned" select="false()" />
+    <xsl:choose>
+      <xsl:when test="$titles">
+        <xsl:variable name="middle" select="floor(count($titles) div 2) + 1" />
+        <xsl:variable name="title" select="$titles[$middle]" />
+        <func:result select="conv:title-contents(set:leading($children, $title), set:leading($titles, $title), $owned)|conv:title-contents(set:trailing($children, $title), set:trailing($titles, $title), true())" />
+      </xsl:when>
+      <xsl:when test="$owned">
+        <func:result select="set:leading($children, $children[self::p[@outputclass='title']][1])" />
+      </xsl:when>
+      <xsl:otherwise>
+        <func:result select="/.." />
+      </xsl:otherwise>
+    </xsl:choose>
+  </func:function>
+
   <!-- Compose the steps element: -->
   <xsl:template name="steps">
     <xsl:param name="contents" />
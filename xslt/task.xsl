@@ -42,7 +42,7 @@
   OTHER DEALINGS IN THE SOFTWARE.
 -->
 
-<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform">
+<xsl:stylesheet version="1.0" xmlns:xsl="http://www.w3.org/1999/XSL/Transform" xmlns:set="http://exslt.org/sets" exclude-result-prefixes="set">
   <!-- Compose the XML and DOCTYPE declarations: -->
   <xsl:output encoding="utf-8" method="xml" doctype-system="task.dtd" doctype-public="-//OASIS//DTD DITA Task//EN" />
 
@@ -156,10 +156,16 @@
     <xsl:if test="$steps">
       <xsl:choose>
         <xsl:when test="$example">
-          <xsl:call-template name="compose-element">
-            <xsl:with-param name="name" select="'result'" />
-            <xsl:with-param name="contents" select="*[not(self::example) and preceding-sibling::ol[1] and following-sibling::example[1]]" />
-          </xsl:call-template>
+          <!-- Select the content between the steps and the last example
+               at once instead of looking for a preceding list and a
+               following example from each element of the body: -->
+          <xsl:variable name="last-example" select="$steps/following-sibling::example[last()]" />
+          <xsl:if test="$last-example">
+            <xsl:call-template name="compose-element">
+              <xsl:with-param name="name" select="'result'" />
+              <xsl:with-param name="contents" select="set:leading($steps/following-sibling::*, $last-example)[not(self::example)]" />
+            </xsl:call-template>
+          </xsl:if>
         </xsl:when>
         <xsl:otherwise>
           <xsl:call-template name="compose-element">